@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import gc
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+from typing import Any, Optional
+
+
+class CacheData:
+    """ Cache on the disk of the data read by ReaderData.
+        The data of a file is saved with pickle (protocol 5, the NumPy arrays are saved in binary)
+        and is found with a key made with :
+            - the absolute path, the size and the date of modification of the file
+            - the options of the reading (separator, engine, sheet, format)
+        When the file is modified, the key changes and the file is read again.
+        When the size of the cache is too big, the least recently used files are removed
+    """
+
+    # Version of the format of the cache. Change it when the format of the data changes
+    __version = 1
+
+    # Extension of the files in the cache
+    __extension = ".pkl"
+
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = 512 * 1024 * 1024) -> None:
+        """ Initialise the cache
+
+        Args:
+            directory (str, optional): Directory of the cache. Defaults to None (cache directory of the user).
+            max_size (int, optional): Maximum size of the cache in bytes. Defaults to 512 Mo.
+        """
+        if directory is None:
+            directory = self.__default_directory()
+        self.__directory = directory
+        self.__max_size = max_size
+
+
+    def __default_directory(self) -> str:
+        """ Get the cache directory of the user, depending on the OS
+
+        Returns:
+            str: Path to the directory
+        """
+        if sys.platform == "win32":
+            root = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+        elif sys.platform == "darwin":
+            root = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+        else:
+            root = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+        return os.path.join(root, "GESAnalysis")
+
+
+#######################################################################################################
+#  Get and save data                                                                                  #
+#######################################################################################################
+    def get(self, filename: str, **options: Any) -> Optional[Any]:
+        """ Get the data of the file 'filename' read with 'options'
+
+        Args:
+            filename (str): Path to file
+            options: Options of the reading (sep, engine, ...)
+
+        Returns:
+            Any: Data of the file, None if the file is not in the cache
+        """
+        key = self.__key(filename, options)
+        if key is None:
+            return None
+
+        path = os.path.join(self.__directory, key + self.__extension)
+        # The dictionaries have millions of small lists without cycles :
+        # the garbage collector is paused during the loading
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, "rb") as file:
+                data = pickle.load(file)
+            # The file is used : it becomes the most recent one
+            os.utime(path)
+            return data
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError):
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+
+    def put(self, filename: str, data: Any, **options: Any) -> None:
+        """ Save the data of the file 'filename' read with 'options'.
+            A problem with the cache doesn't stop the application : the data is just not saved
+
+        Args:
+            filename (str): Path to file
+            data (Any): Data of the file
+            options: Options of the reading (sep, engine, ...)
+        """
+        key = self.__key(filename, options)
+        if key is None:
+            return
+
+        try:
+            os.makedirs(self.__directory, exist_ok=True)
+            # Write in a temporary file, then rename it : an other process never reads a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(data, file, protocol=5)
+                os.replace(tmp_path, os.path.join(self.__directory, key + self.__extension))
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            self.__evict()
+        except (OSError, pickle.PicklingError):
+            pass
+
+
+    def clear(self) -> None:
+        """ Remove all the files of the cache
+        """
+        for entry in self.__entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+    def __key(self, filename: str, options: dict) -> Optional[str]:
+        """ Create the key of the file 'filename' read with 'options'
+
+        Args:
+            filename (str): Path to file
+            options (dict): Options of the reading
+
+        Returns:
+            str: Key, None if the file doesn't exist
+        """
+        try:
+            path = os.path.abspath(filename)
+            stat = os.stat(path)
+        except (OSError, TypeError, ValueError):
+            return None
+
+        description = repr((self.__version, path, stat.st_size, stat.st_mtime_ns, sorted(options.items())))
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+#######################################################################################################
+#  Size of the cache                                                                                  #
+#######################################################################################################
+    def __entries(self) -> list:
+        """ Get the files of the cache
+
+        Returns:
+            list: Entries (os.DirEntry) of the files
+        """
+        try:
+            with os.scandir(self.__directory) as it:
+                return [entry for entry in it if entry.is_file() and entry.name.endswith(self.__extension)]
+        except OSError:
+            return []
+
+
+    def __evict(self) -> None:
+        """ Remove the least recently used files until the size of the cache is lower than the maximum size
+        """
+        entries = []
+        for entry in self.__entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.__max_size:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+            except OSError:
+                pass
+
+
+    def get_size(self) -> int:
+        """ Get the size of the cache
+
+        Returns:
+            int: Size in bytes
+        """
+        size = 0
+        for entry in self.__entries():
+            try:
+                size += entry.stat().st_size
+            except OSError:
+                pass
+        return size
+
+
+#######################################################################################################
+#  Getters                                                                                            #
+#######################################################################################################
+    def get_directory(self) -> str:
+        """ Get the directory of the cache
+
+        Returns:
+            str: Path to the directory
+        """
+        return self.__directory
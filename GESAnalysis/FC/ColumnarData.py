@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import numpy
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+
+class ColumnView(Sequence):
+    """ Read-only view of a column stored in a NumPy array.
+        A row is returned as a list, like in the dictionary of ReaderData,
+        so the code who read 'data[i][0]' or 'sum(data[i])' works with both formats
+
+        Exemple : values = [d1, d2, d3, d4] and offsets = [0, 1, 3, 4]
+            -> rows : [[d1], [d2, d3], [d4]]
+    """
+
+    def __init__(self, values: numpy.ndarray, offsets: Optional[numpy.ndarray] = None) -> None:
+        """ Initialise the view
+
+        Args:
+            values (numpy.ndarray): Values of the column (flat)
+            offsets (numpy.ndarray, optional): Index of the first value of each row, plus the number of values.
+            None if each row has only one value. Defaults to None.
+        """
+        self.__values = values
+        self.__offsets = offsets
+
+
+    def __len__(self) -> int:
+        """ Number of rows
+        """
+        if self.__offsets is None:
+            return len(self.__values)
+        return len(self.__offsets) - 1
+
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[List[Any], List[List[Any]]]:
+        """ Return the values of the row 'index' in a list
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Index de ligne invalide")
+
+        if self.__offsets is None:
+            return self.__values[index:index+1].tolist()
+        return self.__values[self.__offsets[index]:self.__offsets[index+1]].tolist()
+
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        """ Iterate over the rows
+        """
+        if self.__offsets is None:
+            for val in self.__values.tolist():
+                yield [val]
+            return
+
+        values = self.__values.tolist()
+        offsets = self.__offsets.tolist()
+        for i in range(len(offsets) - 1):
+            yield values[offsets[i]:offsets[i+1]]
+
+
+    def __eq__(self, other: object) -> bool:
+        """ Compare the rows with another sequence of rows
+        """
+        if isinstance(other, (ColumnView, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+    @property
+    def values(self) -> numpy.ndarray:
+        """ Flat values of the column
+        """
+        return self.__values
+
+
+    @property
+    def offsets(self) -> Optional[numpy.ndarray]:
+        """ Offsets of the rows (None if each row has one value)
+        """
+        return self.__offsets
+
+
+class ColumnarData(Mapping):
+    """ Columnar version of the dictionary returned by ReaderData.
+        Each column is stored in a typed NumPy array with, if needed, an array of offsets
+        for the rows with several values (values separated by ',').
+
+        The class behaves like the dictionary of ReaderData :
+        {
+            "nom_col1": { "name": ["nom_col1"], "unit": [], "data": ColumnView, "type": type(data)},
+            ...
+        }
+    """
+
+    # NumPy type used to store each type of column
+    __dtypes = {
+        int: numpy.int64,
+        float: numpy.float64,
+        bool: numpy.bool_
+    }
+
+
+    def __init__(self) -> None:
+        """ Initialise an empty structure
+        """
+        self.__columns: Dict[str, Dict[str, Any]] = {}
+
+
+#######################################################################################################
+#  Construction                                                                                       #
+#######################################################################################################
+    def add_column(
+        self,
+        column: str,
+        name: List[str],
+        unit: List[str],
+        type_column: type,
+        values: Union[numpy.ndarray, List[Any]],
+        offsets: Optional[Union[numpy.ndarray, List[int]]] = None
+    ) -> None:
+        """ Add a column to the structure
+
+        Args:
+            column (str): Column (full name)
+            name (List[str]): Name of the column
+            unit (List[str]): Unit of the column
+            type_column (type): Type of the values
+            values (numpy.ndarray | list): Flat values of the column
+            offsets (numpy.ndarray | list, optional): Offsets of the rows. Defaults to None.
+        """
+        if not isinstance(values, numpy.ndarray):
+            values = self.__to_array(values, type_column)
+        if offsets is not None and not isinstance(offsets, numpy.ndarray):
+            offsets = numpy.asarray(offsets, dtype=numpy.int64)
+
+        self.__columns[column] = {
+            "name": name,
+            "unit": unit,
+            "data": ColumnView(values, offsets),
+            "type": type_column
+        }
+
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]) -> "ColumnarData":
+        """ Create the structure from a dictionary of ReaderData
+
+        Args:
+            data (dict): Dictionary of data
+
+        Returns:
+            ColumnarData: Columnar structure
+        """
+        columnar = cls()
+        for column, data_column in data.items():
+            rows = data_column["data"]
+            type_column = data_column.get("type", str)
+
+            # Only one value per row : no need of offsets
+            if all(len(row) == 1 for row in rows):
+                columnar.add_column(column, data_column["name"], data_column["unit"], type_column, [row[0] for row in rows])
+                continue
+
+            values = []
+            offsets = [0]
+            for row in rows:
+                values.extend(row)
+                offsets.append(len(values))
+            columnar.add_column(column, data_column["name"], data_column["unit"], type_column, values, offsets)
+        return columnar
+
+
+    @classmethod
+    def concat(cls, blocks: Iterable["ColumnarData"]) -> "ColumnarData":
+        """ Put the rows of blocks with the same columns (ex: ReaderData.iter_chunks) one after the other.
+            The type of a column is the type in the last block (an int column can become a float column)
+
+        Args:
+            blocks (Iterable[ColumnarData]): Blocks of data
+
+        Raises:
+            ValueError: A block has other columns than the 1st block
+
+        Returns:
+            ColumnarData: Rows of all the blocks
+        """
+        columns = None
+        values = {}
+        offsets = {}
+        names = {}
+        types = {}
+        for block in blocks:
+            if columns is None:
+                columns = list(block.keys())
+                values = {column: [] for column in columns}
+                offsets = {column: [] for column in columns}
+                names = {column: (block[column]["name"], block[column]["unit"]) for column in columns}
+            elif list(block.keys()) != columns:
+                raise ValueError(f"Les colonnes d'un bloc sont différentes : {', '.join(block.keys())} au lieu de {', '.join(columns)}")
+            
+            for column in columns:
+                values[column].append(block.get_values(column))
+                offsets[column].append(block.get_offsets(column))
+                types[column] = block[column]["type"]
+        
+        columnar = cls()
+        if columns is None:
+            return columnar
+        for column in columns:
+            offsets_column = None
+            # Offsets of each block shifted by the number of values of the previous blocks
+            if any(off is not None for off in offsets[column]):
+                shifted = [numpy.zeros(1, dtype=numpy.int64)]
+                start = 0
+                for vals, off in zip(values[column], offsets[column]):
+                    if off is None:
+                        off = numpy.arange(len(vals) + 1, dtype=numpy.int64)
+                    shifted.append(off[1:] + start)
+                    start += len(vals)
+                offsets_column = numpy.concatenate(shifted)
+            name, unit = names[column]
+            columnar.add_column(column, name, unit, types[column], numpy.concatenate(values[column]), offsets_column)
+        return columnar
+
+
+    def get_rows(self, start: int, stop: int) -> "ColumnarData":
+        """ Get the rows 'start' to 'stop' (excluded) in a new structure. The arrays are views of the arrays of the structure
+
+        Args:
+            start (int): First row
+            stop (int): Row after the last row
+
+        Returns:
+            ColumnarData: Rows
+        """
+        columnar = ColumnarData()
+        for column, data_column in self.__columns.items():
+            view = data_column["data"]
+            if view.offsets is None:
+                values = view.values[start:stop]
+                offsets = None
+            else:
+                first = view.offsets[start]
+                values = view.values[first:view.offsets[stop]]
+                offsets = view.offsets[start:stop+1] - first
+            columnar.add_column(column, data_column["name"], data_column["unit"], data_column["type"], values, offsets)
+        return columnar
+
+
+    def to_dict(self) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+        """ Transform the structure to a dictionary of ReaderData
+
+        Returns:
+            dict: Dictionary of data
+        """
+        data = {}
+        for column, data_column in self.__columns.items():
+            data[column] = {
+                "name": data_column["name"],
+                "unit": data_column["unit"],
+                "data": list(data_column["data"]),
+                "type": data_column["type"]
+            }
+        return data
+
+
+    def __to_array(self, values: List[Any], type_column: type) -> numpy.ndarray:
+        """ Transform a list of values to a NumPy array.
+            If the values can't be stored with the type of the column (None, NaN, ...), use an array of objects
+
+        Args:
+            values (List[Any]): Values
+            type_column (type): Type of the column
+
+        Returns:
+            numpy.ndarray: Array
+        """
+        dtype = self.__dtypes.get(type_column)
+        if dtype is not None and all(type(v) in (bool, int, float) for v in values):
+            try:
+                return numpy.asarray(values, dtype=dtype)
+            except (ValueError, TypeError, OverflowError):
+                pass
+        array = numpy.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+
+
+#######################################################################################################
+#  Mapping                                                                                            #
+#######################################################################################################
+    def __getitem__(self, column: str) -> Dict[str, Any]:
+        return self.__columns[column]
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__columns)
+
+
+    def __len__(self) -> int:
+        return len(self.__columns)
+
+
+    def __repr__(self) -> str:
+        return f"ColumnarData({self.__columns!r})"
+
+
+#######################################################################################################
+#  Getters                                                                                            #
+#######################################################################################################
+    def get_values(self, column: str) -> numpy.ndarray:
+        """ Get the flat values of a column
+
+        Args:
+            column (str): Column
+
+        Returns:
+            numpy.ndarray: Values
+        """
+        return self.__columns[column]["data"].values
+
+
+    def get_offsets(self, column: str) -> Optional[numpy.ndarray]:
+        """ Get the offsets of a column
+
+        Args:
+            column (str): Column
+
+        Returns:
+            Optional[numpy.ndarray]: Offsets, None if each row has one value
+        """
+        return self.__columns[column]["data"].offsets
+
+
+    def nbytes(self) -> int:
+        """ Number of bytes used by the arrays of the structure
+
+        Returns:
+            int: Number of bytes
+        """
+        total = 0
+        for data_column in self.__columns.values():
+            view = data_column["data"]
+            total += view.values.nbytes
+            if view.offsets is not None:
+                total += view.offsets.nbytes
+        return total
@@ -6,7 +6,7 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
-from typing import List
+from typing import Any, Callable, List, Optional, Tuple
 
 from GESAnalysis.FC.GESAnalysis import GESAnalysis
 
@@ -35,11 +35,12 @@ class Controleur:
         if not len(list_file):
             return
         
-        # Close each file in the model
-        for file in list_file:
-            self.__gesanalysis.close_file(file)
-        
-        self.__gesanalysis.update(category)
+        # Close each file in the model, the category is updated once
+        with self.__gesanalysis.batch():
+            for file in list_file:
+                self.__gesanalysis.close_file(file)
+            
+            self.__gesanalysis.update(category)
 
 
     def open_file(self, file: str, year: str, category: str) -> None:
@@ -54,6 +55,86 @@ class Controleur:
         self.__gesanalysis.update(category)
         
     
+    def load_file(
+        self,
+        file: str,
+        year: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> Any:
+        """ Read a file without opening it in the model. Can be called in another thread than the UI
+
+        Args:
+            file (str): Path to file
+            year (str): Year
+            progress (Callable[[int, int], None], optional): Function called with the quantity read and the total. Defaults to None.
+            is_cancelled (Callable[[], bool], optional): Returns True if the reading must stop. Defaults to None.
+
+        Returns:
+            Any: Data of the file, None if the reading was cancelled (give it to add_file)
+        """
+        return self.__gesanalysis.load_file(file, year, progress=progress, is_cancelled=is_cancelled)
+    
+    
+    def add_file(self, file: str, year: str, category: str, data: Any) -> None:
+        """ Open a file read by load_file and associated a year and a category
+
+        Args:
+            file (str): Path to file
+            year (str): Year
+            category (str): Category
+            data (Any): Data of the file
+        """
+        self.__gesanalysis.add_file(file, year, category, data)
+        self.__gesanalysis.update(category)
+        
+    
+    def open_files(self, files: List[Tuple[str, str, str]]) -> None:
+        """ Open/read several files at once. Each category is updated once
+
+        Args:
+            files (List[Tuple[str, str, str]]): Path, year and category of each file
+        """
+        # if the list is empty, no need to update the model
+        if not len(files):
+            return
+        
+        with self.__gesanalysis.batch():
+            for category in self.__gesanalysis.read_files(files):
+                self.__gesanalysis.update(category)
+        
+    
+    def load_files(
+        self,
+        files: List[Tuple[str, str, str]],
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> Optional[List[Any]]:
+        """ Read several files at once without opening them in the model. Can be called in another thread than the UI
+
+        Args:
+            files (List[Tuple[str, str, str]]): Path, year and category of each file
+            progress (Callable[[int, int], None], optional): Function called with the number of files read and the number of files. Defaults to None.
+            is_cancelled (Callable[[], bool], optional): Returns True if the reading must stop. Defaults to None.
+
+        Returns:
+            Optional[List[Any]]: Data of each file, None if the reading was cancelled (give it to add_files)
+        """
+        return self.__gesanalysis.load_files(files, progress=progress, is_cancelled=is_cancelled)
+    
+    
+    def add_files(self, files: List[Tuple[str, str, str]], data_files: List[Any]) -> None:
+        """ Open several files read by load_files. Each category is updated once
+
+        Args:
+            files (List[Tuple[str, str, str]]): Path, year and category of each file
+            data_files (List[Any]): Data of each file
+        """
+        with self.__gesanalysis.batch():
+            for category in self.__gesanalysis.add_files(files, data_files):
+                self.__gesanalysis.update(category)
+        
+    
     def open_file_agent(self, file: str) -> dict:
         """ Open/read a file and return his data
 
@@ -97,7 +178,9 @@ class Controleur:
             category (str): New category
             old_category (str): Old category
         """
-        self.__gesanalysis.set_year(filename, year)
-        self.__gesanalysis.set_category(filename, category)
-        self.__gesanalysis.update(old_category)
-        self.__gesanalysis.update(category)
+        # If the category doesn't change, it's updated once
+        with self.__gesanalysis.batch():
+            self.__gesanalysis.set_year(filename, year)
+            self.__gesanalysis.set_category(filename, category)
+            self.__gesanalysis.update(old_category)
+            self.__gesanalysis.update(category)
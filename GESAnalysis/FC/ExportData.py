@@ -7,14 +7,50 @@
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
 import os
+import io
 import platform
-from typing import Optional, Union, Dict, List
+import json
+import gzip
+import bz2
+import lzma
+import contextlib
+import numpy
+import stat
+import threading
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, TextIO, Union, Dict, List
+from GESAnalysis.FC.ColumnarData import ColumnarData
 
 
 class ExportData:
-    """ Class to export data into a CSV, TSV and TXT file
+    """ Class to export data into a CSV, TSV, TXT and NPZ file.
+        The rows are written by blocks : each column of a block is transformed to strings at once,
+        then the lines of the block are written in one call to a buffered file.
+        The data is written in a temporary file next to the file, who replaces the file only when all is written :
+        if the exportation fails, the previous file is kept.
+
+        A NPZ file (NumPy) keeps the columns in binary : each column is an array 'values_i' (and 'offsets_i' for the rows
+        with several values), and the array 'metadata' is a JSON with the column, name, unit and type of each column.
+        It is read again by ReaderData without parsing text.
+
+        A CSV, TSV or TXT file can be compressed during the writing : 'fichier.csv.gz' (also .bz2, .xz, and .zst with the module zstandard)
     """
-    __accepted_extension = [".csv", ".tsv", ".txt"]
+    __accepted_extension = [".csv", ".tsv", ".txt", ".npz"]
+    
+    # Extensions of the compressed files
+    __compressions = [".gz", ".bz2", ".xz", ".zst"]
+    
+    # Level of compression of a gzip file (6 : default of gzip, faster than the maximum 9)
+    gzip_level = 6
+    
+    # Name of the types in the metadata of a NPZ file
+    __npz_types = {int: "int", float: "float", bool: "bool", str: "str"}
+    
+    # Number of rows transformed and written at once
+    block_rows = 65536
+    
+    # Size of the buffer of the file
+    buffer_size = 1 << 20
+
     
     def __init__(self) -> None:
         """ Initialisation of the class
@@ -45,15 +81,35 @@ class ExportData:
         if data_dict is None:
             raise TypeError("Accès impossible au données car le dictionnaire est invalide")
         
+        return self.export_chunks([data_dict], fileout)
+    
+    
+    def export_chunks(
+        self,
+        chunks: Iterable[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]],
+        fileout: str
+    ) -> bool:
+        """ Export blocks of data (ex: ReaderData.iter_chunks) into the file 'fileout', one after the other.
+            Only one block is in memory at a time, except for a NPZ file where the columns are concatenated
+
+        Args:
+            chunks (Iterable[dict | ColumnarData]): Blocks of data, with the same columns
+            fileout (str): Path to the file to write the data
+
+        Returns:
+            bool: True if all the data has been written in the file
+        """
         # Check the name of file
         self.__verif_fileout(fileout)
         
         if self.__file_ext == ".csv":
-            return self.__write_in_file(data_dict, fileout, ';')
+            return self.__write_in_file(chunks, fileout, ';')
         elif self.__file_ext == ".tsv":
-            return self.__write_in_file(data_dict, fileout, '\t')
+            return self.__write_in_file(chunks, fileout, '\t')
+        elif self.__file_ext == ".npz":
+            return self.__write_in_file(chunks, fileout, None)
         else:
-            return self.__write_in_file(data_dict, fileout, ';')
+            return self.__write_in_file(chunks, fileout, ';')
         
     
     def export_stat(self, data: List[List[str]], header_column: List[str], header_row: List[str], fileout: str):
@@ -88,22 +144,28 @@ class ExportData:
             return self.__write_stat(data, header_column, header_row, fileout, ";")
         elif self.__file_ext == ".tsv":
             return self.__write_stat(data, header_column, header_row, fileout, '\t')
+        elif self.__file_ext == ".npz":
+            return self.__write_in_file([self.__stat_to_columnar(data, header_column, header_row)], fileout, None)
         else:
             return self.__write_stat(data, header_column, header_row, fileout, ";")
         
 
 
     def __verif_fileout(self, fileout: str) -> None:
-        """ Check 'fileout' if it's a CSV, TSV or TXT file
+        """ Check 'fileout' if it's a CSV, TSV, TXT or NPZ file, or a compressed CSV, TSV or TXT file
 
         Args:
             fileout (str): Path to the file to write the data
 
         Raises:
-            Exception: 'fileout' is not a CSV, TSV or TXT file
+            Exception: 'fileout' is not a CSV, TSV, TXT or NPZ file, or a NPZ file is compressed
         """
-        # Get the extension of the file
+        # Get the extension of the file, and of the compression
         root_filename, self.__file_ext = os.path.splitext(fileout)
+        self.__compression = None
+        if self.__file_ext in self.__compressions:
+            self.__compression = self.__file_ext
+            root_filename, self.__file_ext = os.path.splitext(root_filename)
         
         # Get the name of the file, remove the path
         # The path is different between OS
@@ -115,7 +177,9 @@ class ExportData:
         file = path_to_file[len(path_to_file) - 1]
         
         if not self.__file_ext in self.__accepted_extension:
-            raise Exception(f"Exportation impossible de '{file+self.__file_ext}'. Le fichier doit être de type CSV, TSV ou TXT")
+            raise Exception(f"Exportation impossible de '{file+self.__file_ext}'. Le fichier doit être de type CSV, TSV, TXT ou NPZ")
+        if self.__compression is not None and self.__file_ext == ".npz":
+            raise Exception(f"Exportation impossible de '{file+self.__file_ext+self.__compression}'. Seul un fichier CSV, TSV ou TXT peut être compressé")
     
 
 #######################################################################################################
@@ -123,62 +187,188 @@ class ExportData:
 #######################################################################################################
     def __write_in_file(
         self,
-        data: Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]],
+        chunks: Iterable[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]],
         fileout: str,
         sep: str
     ) -> bool:
-        """ Write the dictionary of data into the file 'fileout' where separator between values is 'sep'
+        """ Write the blocks of data into the file 'fileout' where separator between values is 'sep'
 
         Args:
-            data (dict): Dictionary of data
+            chunks (Iterable[dict | ColumnarData]): Blocks of data
             fileout (str): Path to the file to write the data
-            sep (str): Separator between values
+            sep (str | None): Separator between values. None for a NPZ file
 
         Raises:
             IOError: A problem occur when trying to open the file or writing into it
-            ValueError: Number of elements between rows is different
+            ValueError: Number of elements between rows is different, or a block has other columns
 
         Returns:
             bool: True if all the data was written into the file
         """
+        tmp_fileout = self.__get_tmp_fileout(fileout)
         try:
-            with open(fileout, "w") as file_out:
-                # Write columns
-                columns = list(data.keys())
-                nb_columns = len(columns)
-                name_columns = sep.join(columns) + '\n'
-                
-                file_out.write(name_columns)
-                
-                # Write row
-                elems_columns = self.__get_data(data)
-                
-                # Check number of elements in the line
-                self.__verif_number_lines(elems_columns)
-                
-                nb_lines = len(elems_columns[0])
-                for l in range(nb_lines):
-                    ph = ""
-                    for c in range(nb_columns):
-                        # Transform all elements into string
-                        elem_col_str = [str(x) for x in elems_columns[c][l]]
-                        # Add separator depending on which column
-                        if c == nb_columns-1:
-                            ph += ','.join(elem_col_str) + '\n'
-                        else:
-                            ph += ','.join(elem_col_str) + sep
-                    
-                    file_out.write(ph)
-        # if we catch an error, we remove the file
+            if sep is None:
+                with self.__open_tmp_fileout(tmp_fileout, fileout, binary=True) as file_out:
+                    self.__write_npz(chunks, file_out)
+            else:
+                with self.__open_tmp_fileout(tmp_fileout, fileout) as file_out:
+                    self.__write_text(chunks, file_out, sep)
+            self.__replace_file(tmp_fileout, fileout)
+        # if we catch an error, we remove the temporary file and the file is unchanged
         except IOError:
-            os.remove(fileout)
+            self.__remove_tmp_fileout(tmp_fileout)
             raise IOError(f"Problème rencontré pendant l'écriture du fichier '{fileout}'")
         except ValueError as v:
-            os.remove(fileout)
+            self.__remove_tmp_fileout(tmp_fileout)
             raise ValueError(str(v))
+        # Error during the reading of a block
+        except Exception:
+            self.__remove_tmp_fileout(tmp_fileout)
+            raise
         return True
     
     
+    def __write_text(
+        self,
+        chunks: Iterable[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]],
+        file_out: TextIO,
+        sep: str
+    ) -> None:
+        """ Write the blocks of data in a CSV, TSV or TXT file, where separator between values is 'sep'
+
+        Args:
+            chunks (Iterable[dict | ColumnarData]): Blocks of data
+            file_out (TextIO): Opened file
+            sep (str): Separator between values
+
+        Raises:
+            ValueError: Number of elements between rows is different, or a block has other columns
+        """
+        columns = None
+        for data in chunks:
+            # Write columns with the 1st block
+            if columns is None:
+                columns = list(data.keys())
+                file_out.write(sep.join(columns) + '\n')
+            elif list(data.keys()) != columns:
+                raise ValueError(f"Les colonnes d'un bloc sont différentes : {', '.join(data.keys())} au lieu de {', '.join(columns)}")
+            
+            # Check number of elements in the line
+            self.__verif_number_lines(self.__get_data(data))
+            
+            # Write the rows by blocks
+            nb_lines = len(data[columns[0]]["data"]) if len(columns) > 0 else 0
+            for start in range(0, nb_lines, self.block_rows):
+                stop = min(start + self.block_rows, nb_lines)
+                elems_columns = [self.__format_column(data, column, start, stop) for column in columns]
+                file_out.write('\n'.join(map(sep.join, zip(*elems_columns))) + '\n')
+    
+    
+    def __write_npz(
+        self,
+        chunks: Iterable[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]],
+        file_out: BinaryIO
+    ) -> None:
+        """ Write the blocks of data in a NPZ file : the blocks are concatenated in a ColumnarData,
+            then each array is saved without compression (the reading is faster).
+            The strings are saved in an array of unicode, and the columns with other values (None, NaN in a column of int, ...)
+            are saved in a JSON, so the file can be read without pickle.
+            A name or a unit None is found from the column at the reading
+
+        Args:
+            chunks (Iterable[dict | ColumnarData]): Blocks of data
+            file_out (BinaryIO): Opened file
+
+        Raises:
+            ValueError: Number of elements between rows is different, or a block has other columns
+        """
+        blocks = []
+        for data in chunks:
+            # Check number of elements in the line
+            self.__verif_number_lines(self.__get_data(data))
+            blocks.append(data if isinstance(data, ColumnarData) else ColumnarData.from_dict(data))
+        columnar = ColumnarData.concat(blocks)
+        
+        arrays = {}
+        metadata = []
+        for index, column in enumerate(columnar):
+            values = columnar.get_values(column)
+            offsets = columnar.get_offsets(column)
+            type_column = columnar[column]["type"]
+            
+            is_json = False
+            if values.dtype == object:
+                values_list = values.tolist()
+                if type_column is str and all(type(val) is str for val in values_list):
+                    values = numpy.array(values_list, dtype=str)
+                else:
+                    values = self.__to_bytes(values_list)
+                    is_json = True
+            
+            arrays[f"values_{index}"] = values
+            if offsets is not None:
+                arrays[f"offsets_{index}"] = offsets
+            metadata.append({
+                "column": column,
+                "name": columnar[column]["name"],
+                "unit": columnar[column]["unit"],
+                "type": self.__npz_types.get(type_column, "str"),
+                "offsets": offsets is not None,
+                "json": is_json
+            })
+        arrays["metadata"] = self.__to_bytes({"columns": metadata})
+        numpy.savez(file_out, **arrays)
+    
+    
+    def __to_bytes(self, obj: Any) -> numpy.ndarray:
+        """ Transform an object to a JSON in an array of bytes. A value who is not in JSON (date, ...) is written as a string
+
+        Args:
+            obj (Any): Object
+
+        Returns:
+            numpy.ndarray: Bytes of the JSON (UTF-8)
+        """
+        return numpy.frombuffer(json.dumps(obj, default=str).encode("utf-8"), dtype=numpy.uint8)
+    
+    
+    def __format_column(
+        self,
+        data: Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData],
+        column: str,
+        start: int,
+        stop: int
+    ) -> List[str]:
+        """ Transform the rows 'start' to 'stop' of a column to strings, where the values of a row are separated by ','.
+            With a ColumnarData, the values are read from the NumPy array of the column
+
+        Args:
+            data (dict | ColumnarData): Data
+            column (str): Column
+            start (int): First row
+            stop (int): Row after the last row
+
+        Returns:
+            List[str]: String of each row
+        """
+        if isinstance(data, ColumnarData):
+            values = data.get_values(column)
+            offsets = data.get_offsets(column)
+            # One value for each row
+            if offsets is None:
+                return list(map(str, values[start:stop].tolist()))
+            
+            # Values of the rows, then cut them with the offsets
+            first = offsets[start]
+            values_str = list(map(str, values[first:offsets[stop]].tolist()))
+            bounds = (offsets[start:stop+1] - first).tolist()
+            return [','.join(values_str[bounds[i]:bounds[i+1]]) for i in range(stop - start)]
+        
+        # Most of the rows have only one value : no join for them
+        rows = data[column]["data"][start:stop]
+        return [str(row[0]) if len(row) == 1 else ','.join(map(str, row)) for row in rows]
+    
+    
     def __write_stat(self, data: List[List[str]], header_column: List[str], header_row: List[str], fileout: str, sep: str):
         """ Write data and headers in the file fileout. The elements are separated by sep
 
@@ -195,8 +385,9 @@ class ExportData:
         Returns:
             bool: True if the export is a success
         """
+        tmp_fileout = self.__get_tmp_fileout(fileout)
         try:
-            with open(fileout, "w") as write_fileout:
+            with self.__open_tmp_fileout(tmp_fileout, fileout) as write_fileout:
                 write_column = "header_row" + sep + sep.join(header_column) + "\n"
                 write_fileout.write(write_column)
                 
@@ -207,12 +398,41 @@ class ExportData:
                     ph += join_list + '\n'
                     
                     write_fileout.write(ph)
+            self.__replace_file(tmp_fileout, fileout)
         except:
-            os.remove(fileout)
+            self.__remove_tmp_fileout(tmp_fileout)
             raise ValueError("Problème rencontré lors de l'exportation des statistiques")
         return True
     
     
+    def __stat_to_columnar(self, data: List[List[str]], header_column: List[str], header_row: List[str]) -> ColumnarData:
+        """ Put the stats in a ColumnarData, like a CSV file of the stats once read :
+            a column 'header_row' with the header of rows, then a column for each header of columns.
+            The stats of a column are converted to int or float if it's possible
+
+        Args:
+            data (List[List[str]]): Stats
+            header_column (List[str]): Header of columns
+            header_row (List[str]): Header of rows
+
+        Returns:
+            ColumnarData: Stats
+        """
+        columnar = ColumnarData()
+        columnar.add_column("header_row", None, None, str, header_row)
+        for index_column, column in enumerate(header_column):
+            cells = [row[index_column] for row in data]
+            values, type_column = cells, str
+            for constructor in (int, float):
+                try:
+                    values, type_column = list(map(constructor, cells)), constructor
+                    break
+                except ValueError:
+                    pass
+            columnar.add_column(column, None, None, type_column, values)
+        return columnar
+    
+    
     def __verif_number_lines(self, elems_col: List[List[Union[bool, str, float, int]]]) -> None:
         """ Check the number of elements of each row is the same
 
@@ -229,6 +449,129 @@ class ExportData:
                 raise ValueError(f"La ligne {i+1} a {nb_elements_line} éléments au lieu de {nb_elements} éléments")
 
 
+#######################################################################################################
+#  Temporary file                                                                                     #
+#######################################################################################################
+    def __get_tmp_fileout(self, fileout: str) -> str:
+        """ Get the path of the temporary file where the data is written before replacing 'fileout'.
+            It is in the same directory than 'fileout' (the rename is atomic only inside a file system),
+            and it depends on the process and the thread to export several files at the same time
+
+        Args:
+            fileout (str): Path to the file to write the data
+
+        Returns:
+            str: Path to the temporary file
+        """
+        directory, file = os.path.split(fileout)
+        return os.path.join(directory, f".{file}.{os.getpid()}.{threading.get_ident()}.tmp")
+    
+    
+    @contextlib.contextmanager
+    def __open_tmp_fileout(self, tmp_fileout: str, fileout: str, binary: bool = False) -> Iterator[Union[TextIO, BinaryIO]]:
+        """ Open the temporary file to write, with the compression of 'fileout'.
+            At the end, the compressed data is completed, then the file is synchronized on the disk
+
+        Args:
+            tmp_fileout (str): Path to the temporary file
+            fileout (str): Path to the file to write the data
+            binary (bool, optional): Give a binary file instead of a text file. Defaults to False.
+
+        Raises:
+            ImportError: The module zstandard is not installed to write a .zst file
+
+        Returns:
+            Iterator[TextIO | BinaryIO]: File opened
+        """
+        with open(tmp_fileout, "wb", buffering=self.buffer_size) as file_raw:
+            file_bin = self.__compress(file_raw, fileout)
+            if binary:
+                yield file_bin
+            else:
+                # Same encoding and end of lines as open(fileout, "w")
+                file_text = io.TextIOWrapper(file_bin)
+                yield file_text
+                file_text.flush()
+                file_text.detach()
+            
+            # Write the end of the compressed data, without closing the file
+            if file_bin is not file_raw:
+                file_bin.close()
+            self.__sync_file(file_raw)
+    
+    
+    def __compress(self, file_raw: BinaryIO, fileout: str) -> BinaryIO:
+        """ Get the file who compresses the data written into 'file_raw', depending on the compression of 'fileout'
+
+        Args:
+            file_raw (BinaryIO): Opened file
+            fileout (str): Path to the file to write the data
+
+        Raises:
+            ImportError: The module zstandard is not installed to write a .zst file
+
+        Returns:
+            BinaryIO: File who compresses the data ('file_raw' without compression)
+        """
+        match self.__compression:
+            case ".gz":
+                # The name in the header is the name of the file once decompressed
+                name = os.path.basename(fileout)[:-len(".gz")]
+                return gzip.GzipFile(filename=name, mode="wb", compresslevel=self.gzip_level, fileobj=file_raw)
+            case ".bz2":
+                return bz2.BZ2File(file_raw, "wb")
+            case ".xz":
+                return lzma.LZMAFile(file_raw, "wb")
+            case ".zst":
+                try:
+                    import zstandard
+                except ImportError:
+                    raise ImportError(f"Le module 'zstandard' est nécessaire pour écrire '{os.path.basename(fileout)}'")
+                return zstandard.ZstdCompressor().stream_writer(file_raw, closefd=False)
+            case _:
+                return file_raw
+    
+    
+    def __sync_file(self, file_out) -> None:
+        """ Write the buffer of the file and wait that the data is on the disk
+
+        Args:
+            file_out: Opened file
+        """
+        file_out.flush()
+        os.fsync(file_out.fileno())
+    
+    
+    def __replace_file(self, tmp_fileout: str, fileout: str) -> None:
+        """ Replace 'fileout' by the temporary file in one operation : a reader sees the previous file or the new file,
+            never a part of the new file. The permissions of the previous file are kept.
+            Then the directory is synchronized to keep the rename after a crash (not on Windows)
+
+        Args:
+            tmp_fileout (str): Path to the temporary file
+            fileout (str): Path to the file to write the data
+        """
+        if os.path.exists(fileout):
+            os.chmod(tmp_fileout, stat.S_IMODE(os.stat(fileout).st_mode))
+        os.replace(tmp_fileout, fileout)
+        if platform.system() != "Windows":
+            fd_directory = os.open(os.path.dirname(fileout) or '.', os.O_RDONLY)
+            try:
+                os.fsync(fd_directory)
+            finally:
+                os.close(fd_directory)
+    
+    
+    def __remove_tmp_fileout(self, tmp_fileout: str) -> None:
+        """ Remove the temporary file if it was created
+
+        Args:
+            tmp_fileout (str): Path to the temporary file
+        """
+        if os.path.exists(tmp_fileout):
+            os.remove(tmp_fileout)
+
+
 #######################################################################################################
 #  Getters                                                                                            #
 #######################################################################################################
@@ -7,8 +7,13 @@
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
 import os, platform
+import multiprocessing
 
-from typing import Dict, List, Union
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from GESAnalysis.FC.CacheData import CacheData
+from GESAnalysis.FC.ColumnarData import ColumnarData
 from GESAnalysis.FC.ExportData import ExportData
 from GESAnalysis.FC.PATTERNS.Observable import Observable
 from GESAnalysis.FC.ReaderData import ReaderData
@@ -18,15 +23,21 @@ class GESAnalysis(Observable):
     """ Class to manipulate data (Read file, write data)
     """
     
-    __reader = ReaderData()
     __export = ExportData()
     
     
-    def __init__(self) -> None:
+    def __init__(self, columnar: bool = False, cache: Optional[CacheData] = None) -> None:
         """ Initialise the class
+
+        Args:
+            columnar (bool, optional): Keep the data of the files in a ColumnarData (NumPy arrays). Defaults to False.
+            cache (CacheData, optional): Cache on the disk of the files already read. Defaults to None.
         """
         super().__init__()
-        self.__file_open = {} # Dictionary to associate the name of file and his data
+        self.__reader = ReaderData(cache)
+        self.__file_open = {}        # Dictionary to associate the name of file and his data
+        self.__index_open = {}       # Dictionary to associate the name of file and the index of his columns
+        self.__columnar = columnar   # Format of the data of the files
         
 
 #######################################################################################################
@@ -40,21 +51,231 @@ class GESAnalysis(Observable):
             sep (str, optional): Separator between values in 'filename'. Defaults to None.
             engine (str, optional): Reading engine for XLSX files. Defaults to "pandas".
         """
+        data_file = self.load_file(filename, year, sep, engine)
+        self.add_file(filename, year, category, data_file)
+        
+    
+    def load_file(
+        self,
+        filename: str,
+        year: str,
+        sep: str = None,
+        engine: str = "pandas",
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> Optional[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]:
+        """ Read the file 'filename' without adding it to the dictionary of file open (see add_file).
+            The model is not modified : the reading can be done in another thread than the UI
+
+        Args:
+            filename (str): Path to file
+            year (str): Year of the file
+            sep (str, optional): Separator between values in 'filename'. Defaults to None.
+            engine (str, optional): Reading engine for XLSX files. Defaults to "pandas".
+            progress (Callable[[int, int], None], optional): Function called with the quantity read and the total (see ReaderData.read_file). Defaults to None.
+            is_cancelled (Callable[[], bool], optional): Returns True if the reading must stop. Defaults to None.
+
+        Returns:
+            dict | ColumnarData | None: Data of the file. None if the reading was cancelled
+        """
         if filename is None:
             raise Exception("Impossible de lire le fichier car le chemin est invalide")
         
         self.__check_year(year)
         
-        data_file = self.__reader.read_file(filename, sep, engine)
+        return self.__reader.read_file(filename, sep, engine, self.__columnar, progress=progress, is_cancelled=is_cancelled)
+    
+    
+    def add_file(
+        self,
+        filename: str,
+        year: str,
+        category: str,
+        data_file: Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]
+    ) -> None:
+        """ Add the data of a file read by load_file to the dictionary of file open
+
+        Args:
+            filename (str): Path to file
+            year (str): Year
+            category (str): Category
+            data_file (dict | ColumnarData): Data of the file
+        """
+        self.__check_year(year)
+        
         name_file = self.get_filename(filename)
         self.__file_open[name_file] = {}
         self.__file_open[name_file]["data"] = data_file
         self.__file_open[name_file]["year"] = year
         self.__file_open[name_file]["category"] = category
         self.__file_open[name_file]["path"] = filename
+        self.__index_open[name_file] = self.__build_index(data_file)
         self.__sort_by_year()
         
     
+    def read_files(
+        self,
+        files: List[Tuple[str, str, str]],
+        sep: str = None,
+        engine: str = "pandas",
+        max_workers: Optional[int] = None
+    ) -> List[str]:
+        """ Read several files at once and add them to the dictionary of file open.
+            The files are read in parallel in processes (the reading uses the CPU).
+            If the reading of one file fails, no file is added
+
+        Args:
+            files (List[Tuple[str, str, str]]): Path, year and category of each file
+            sep (str, optional): Separator between values in the files. Defaults to None.
+            engine (str, optional): Reading engine for XLSX files. Defaults to "pandas".
+            max_workers (int, optional): Maximum number of processes. Defaults to None (number of processors).
+
+        Returns:
+            List[str]: Categories of the files read (without duplicates)
+        """
+        data_files = self.load_files(files, sep, engine, max_workers)
+        return self.add_files(files, data_files)
+    
+    
+    def load_files(
+        self,
+        files: List[Tuple[str, str, str]],
+        sep: str = None,
+        engine: str = "pandas",
+        max_workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> Optional[List[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]]:
+        """ Read several files in parallel in processes without adding them to the dictionary of file open (see add_files).
+            The model is not modified : the reading can be done in another thread than the UI
+
+        Args:
+            files (List[Tuple[str, str, str]]): Path, year and category of each file
+            sep (str, optional): Separator between values in the files. Defaults to None.
+            engine (str, optional): Reading engine for XLSX files. Defaults to "pandas".
+            max_workers (int, optional): Maximum number of processes. Defaults to None (number of processors).
+            progress (Callable[[int, int], None], optional): Function called with the number of files read and the number of files. Defaults to None.
+            is_cancelled (Callable[[], bool], optional): Returns True if the reading must stop. Defaults to None.
+
+        Returns:
+            list | None: Data of each file, in the same order. None if the reading was cancelled
+        """
+        for filename, year, _ in files:
+            if filename is None:
+                raise Exception("Impossible de lire le fichier car le chemin est invalide")
+            self.__check_year(year)
+        
+        filenames = [filename for filename, _, _ in files]
+        return self.__read_in_parallel(
+            filenames,
+            sep,
+            engine,
+            max_workers,
+            progress if progress is not None else lambda done, total: None,
+            is_cancelled if is_cancelled is not None else lambda: False
+        )
+    
+    
+    def add_files(
+        self,
+        files: List[Tuple[str, str, str]],
+        data_files: List[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]
+    ) -> List[str]:
+        """ Add the data of the files read by load_files to the dictionary of file open, and sort it once
+
+        Args:
+            files (List[Tuple[str, str, str]]): Path, year and category of each file
+            data_files (list): Data of each file, in the same order
+
+        Returns:
+            List[str]: Categories of the files (without duplicates)
+        """
+        for _, year, _ in files:
+            self.__check_year(year)
+        
+        categories = []
+        for (filename, year, category), data_file in zip(files, data_files):
+            name_file = self.get_filename(filename)
+            self.__file_open[name_file] = {
+                "data": data_file,
+                "year": year,
+                "category": category,
+                "path": filename
+            }
+            self.__index_open[name_file] = self.__build_index(data_file)
+            if category not in categories:
+                categories.append(category)
+        self.__sort_by_year()
+        return categories
+    
+    
+    def __read_in_parallel(
+        self,
+        filenames: List[str],
+        sep: str,
+        engine: str,
+        max_workers: Optional[int],
+        progress: Callable[[int, int], None],
+        is_cancelled: Callable[[], bool]
+    ) -> Optional[List[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]]:
+        """ Read the files in a pool of processes.
+            The processes are started with 'spawn' : a 'fork' would copy the threads of the UI (QThreadPool) and their locks.
+            If there is one file or the processes can't be created, the files are read one after the other
+
+        Args:
+            filenames (List[str]): Path to files
+            sep (str): Separator between values in the files
+            engine (str): Reading engine for XLSX files
+            max_workers (Optional[int]): Maximum number of processes (None for the number of processors)
+            progress (Callable[[int, int], None]): Function called with the number of files read and the number of files
+            is_cancelled (Callable[[], bool]): Returns True if the reading must stop
+
+        Returns:
+            list | None: Data of each file, in the same order. None if the reading was cancelled
+        """
+        nb_files = len(filenames)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, nb_files)
+        
+        executor = None
+        if max_workers > 1:
+            try:
+                executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError):
+                executor = None
+        
+        if executor is not None:
+            futures = [executor.submit(self.__reader.read_file, filename, sep, engine, self.__columnar) for filename in filenames]
+            data_files = []
+            try:
+                # The errors of the reading are given in the order of the files
+                for future in futures:
+                    while not future.done():
+                        if is_cancelled():
+                            return None
+                        wait([future], timeout=0.1)
+                    data_files.append(future.result())
+                    progress(len(data_files), nb_files)
+                return data_files
+            except BrokenProcessPool:
+                pass
+            finally:
+                # The files not read are not needed after an error or a cancel
+                executor.shutdown(wait=False, cancel_futures=True)
+        
+        data_files = []
+        for filename in filenames:
+            if is_cancelled():
+                return None
+            data_file = self.__reader.read_file(filename, sep, engine, self.__columnar, is_cancelled=is_cancelled)
+            if data_file is None:
+                return None
+            data_files.append(data_file)
+            progress(len(data_files), nb_files)
+        return data_files
+        
+    
     def read_file_agent(self, filename: str, sep: str = None, engine: str = "pandas") -> dict:
         """ Read the file 'filename'
 
@@ -72,6 +293,23 @@ class GESAnalysis(Observable):
         return self.__reader.read_file(filename, sep, engine)
         
         
+    def __build_index(self, data_file: Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]) -> Dict[str, str]:
+        """ Build the index of the columns of a file : name of the column (without unit) -> column.
+            The names are joined with a space, like in the categories
+
+        Args:
+            data_file (dict | ColumnarData): Data of the file
+
+        Returns:
+            Dict[str, str]: Index of the columns
+        """
+        index = {}
+        for column, data_column in data_file.items():
+            # Keep the 1st column if 2 columns have the same name
+            index.setdefault(" ".join(data_column["name"]), column)
+        return index
+        
+        
     def __sort_by_year(self) -> None:
         """ Sort the dictionary by year
         """
@@ -109,9 +347,8 @@ class GESAnalysis(Observable):
             self.__export.export_data(self.__file_open[file]["data"], fileout)
             return
             
-        # Else, we read the data and export it
-        data_file = self.__reader.read_file(filein)
-        self.__export.export_data(data_file, fileout)
+        # Else, we read the data by blocks and export each block, without keeping the whole file in memory
+        self.__export.export_chunks(self.__reader.iter_chunks(filein), fileout)
         
         
     def export_stat(self, data: List[List[str]], header_column: List[str], header_row: List[str], fileout: str):
@@ -143,6 +380,7 @@ class GESAnalysis(Observable):
             del self.__file_open[file]
         except:
             raise Exception(f"Le fichier '{file}' n'est pas ouvert")
+        self.__index_open.pop(file, None)
 
 
 #######################################################################################################
@@ -222,6 +460,22 @@ class GESAnalysis(Observable):
             raise Exception(f"Le fichier '{file}' n'est pas ouvert")
     
 
+    def get_index_from_file(self, filename: str) -> Dict[str, str]:
+        """ Return the index of the columns of the file 'filename' : name of the column (without unit) -> column
+
+        Raises:
+            Exception: File is not opened
+            
+        Returns:
+            Dict[str, str]: Index of the columns
+        """
+        file = self.get_filename(filename)
+        try:
+            return self.__index_open[file]
+        except:
+            raise Exception(f"Le fichier '{file}' n'est pas ouvert")
+    
+
     def get_filename(self, path_file: str) -> str:
         """ Return the name of the file of 'path_file'
 
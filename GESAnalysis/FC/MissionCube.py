@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import numpy
+from typing import Dict, List, Tuple, Union
+
+
+class MissionCube:
+    """ Totals of the missions in a cube mode x position x year, with one layer for each measure :
+            - "distance" : Distance of the missions
+            - "emission" : Emission of the missions
+            - "emission_contrails" : Emission with contrails of the missions
+            - "mission" : Number of missions
+        The missions are added with their index of mode, position and year (see add),
+        then each layer is computed with one grouped sum (numpy.bincount).
+        The layers of another cube can also be added and removed (see add_cube and remove_cube),
+        so a cube of several files is updated with the cube of the file who changed.
+        The totals and the percentages are reductions along the axes of the cube
+    """
+
+    # Measures of the cube
+    measures = ["distance", "emission", "emission_contrails", "mission"]
+
+    # Axes of the cube
+    axis_mode = 0
+    axis_position = 1
+    axis_year = 2
+
+
+    def __init__(self, modes: List[str], positions: List[str], years: List[str]) -> None:
+        """ Initialise an empty cube
+
+        Args:
+            modes (List[str]): Modes of transport
+            positions (List[str]): Positions
+            years (List[str]): Years
+        """
+        self.__labels = [list(modes), list(positions), list(years)]
+        self.__index = [{label: ind for ind, label in enumerate(labels)} for labels in self.__labels]
+
+        # Missions added, kept in blocks until the cube is computed.
+        # A block of another cube keeps the index of its labels in this cube (see add_cube)
+        self.__blocks = []
+        self.__missions = None
+        self.__layers = None
+        
+        # Cubes added with add_cube : cube, index of its labels in this cube and its blocks
+        self.__cubes = []
+
+
+#######################################################################################################
+#  Add missions                                                                                       #
+#######################################################################################################
+    def add(
+        self,
+        mode: numpy.ndarray,
+        position: numpy.ndarray,
+        year: Union[int, numpy.ndarray],
+        distance: numpy.ndarray,
+        emission: numpy.ndarray,
+        emission_contrails: numpy.ndarray
+    ) -> None:
+        """ Add missions to the cube. Each argument has one value by mission
+
+        Args:
+            mode (numpy.ndarray): Index of the mode of each mission
+            position (numpy.ndarray): Index of the position of each mission
+            year (Union[int, numpy.ndarray]): Index of the year of each mission (or of all the missions)
+            distance (numpy.ndarray): Distance of each mission
+            emission (numpy.ndarray): Emission of each mission
+            emission_contrails (numpy.ndarray): Emission with contrails of each mission
+
+        Raises:
+            ValueError: The arguments don't have the same number of missions
+        """
+        mode = numpy.asarray(mode, dtype=numpy.int64)
+        nb_missions = len(mode)
+        block = {
+            "mode": mode,
+            "position": numpy.asarray(position, dtype=numpy.int64),
+            "year": numpy.broadcast_to(numpy.asarray(year, dtype=numpy.int64), (nb_missions,)),
+            "distance": numpy.asarray(distance),
+            "emission": numpy.asarray(emission),
+            "emission_contrails": numpy.asarray(emission_contrails),
+            "index": None
+        }
+        for key, values in block.items():
+            if key != "index" and len(values) != nb_missions:
+                raise ValueError(f"'{key}' a {len(values)} missions au lieu de {nb_missions}")
+
+        self.__blocks.append(block)
+        self.__missions = None
+        self.__layers = None
+
+
+    def add_cube(self, cube: "MissionCube") -> None:
+        """ Add the missions of another cube. The labels of the other cube who are not in this cube
+            are added at the end of the axes. The cost depends on the size of the cubes, not on the number of missions.
+            The other cube must not change until it's removed (see remove_cube)
+
+        Args:
+            cube (MissionCube): Cube to add
+        """
+        layers = self.__compute_layers()
+        index = self.__add_labels(cube.__labels)
+        cells = numpy.ix_(*index)
+        
+        # Add the layers of the other cube on the cells of its labels
+        self.__layers = {}
+        for measure, layer in layers.items():
+            other = cube.get_layer(measure)
+            layer = layer.astype(numpy.result_type(layer, other))
+            layer[cells] += other
+            self.__layers[measure] = layer
+        
+        # The missions are moved to the labels of this cube when they are needed (see __get_missions)
+        blocks = [self.__move_block(block, index) for block in cube.__blocks]
+        self.__blocks = self.__blocks + blocks
+        self.__cubes.append((cube, index, blocks))
+        self.__missions = None
+
+
+    def remove_cube(self, cube: "MissionCube") -> None:
+        """ Remove the missions of a cube added with add_cube.
+            The labels of the cube stay in this cube, without missions
+
+        Args:
+            cube (MissionCube): Cube to remove
+
+        Raises:
+            KeyError: The cube was not added
+        """
+        position = next((position for position, (cube_added, _, _) in enumerate(self.__cubes) if cube_added is cube), None)
+        if position is None:
+            raise KeyError("Le cube n'a pas été ajouté")
+        _, index, blocks = self.__cubes.pop(position)
+        cells = numpy.ix_(*index)
+        
+        # Layers with the missions of the cube, then without its blocks
+        layers = self.__compute_layers()
+        self.__blocks = [block for block in self.__blocks if not any(block is removed for removed in blocks)]
+        self.__missions = None
+        
+        self.__layers = {"mission": layers["mission"].copy()}
+        self.__layers["mission"][cells] -= cube.get_layer("mission")
+        empty = self.__layers["mission"] == 0
+        for measure in ["distance", "emission", "emission_contrails"]:
+            layer = layers[measure].copy()
+            layer[cells] -= cube.get_layer(measure)
+            # No rounding error in the cells without missions
+            layer[empty] = 0
+            # The sum of integers stays an integer when the float values are removed
+            if layer.dtype.kind == "f" and all(block[measure].dtype.kind in "biu" for block in self.__blocks):
+                layer = numpy.rint(layer).astype(numpy.int64)
+            self.__layers[measure] = layer
+
+
+    def regroup(
+        self,
+        modes: List[str],
+        positions: List[str],
+        years: List[str],
+        index_mode: List[int],
+        index_position: List[int],
+        index_year: List[int]
+    ) -> "MissionCube":
+        """ Create a cube with other labels. Each label of this cube goes to the label of the new cube given by its index,
+            so several labels can be grouped in one label. A label with the index -1 is removed with its missions
+
+        Args:
+            modes (List[str]): Modes of the new cube
+            positions (List[str]): Positions of the new cube
+            years (List[str]): Years of the new cube
+            index_mode (List[int]): Index in the new cube of each mode of this cube, -1 to remove it
+            index_position (List[int]): Same with the positions
+            index_year (List[int]): Same with the years
+
+        Returns:
+            MissionCube: New cube
+        """
+        index = [numpy.asarray(values, dtype=numpy.int64).reshape(-1) for values in (index_mode, index_position, index_year)]
+        kept = [numpy.flatnonzero(values >= 0) for values in index]
+        cells_kept = numpy.ix_(*kept)
+        cells_new = numpy.ix_(*(values[kept_axis] for values, kept_axis in zip(index, kept)))
+        
+        cube = MissionCube(modes, positions, years)
+        shape = tuple(len(labels) for labels in cube.__labels)
+        cube.__layers = {}
+        for measure, layer in self.__compute_layers().items():
+            new_layer = numpy.zeros(shape, dtype=layer.dtype)
+            # The labels grouped in one label are summed
+            numpy.add.at(new_layer, cells_new, layer[cells_kept])
+            cube.__layers[measure] = new_layer
+        cube.__blocks = [self.__move_block(block, index) for block in self.__blocks]
+        return cube
+
+
+    def __add_labels(self, labels: List[List[str]]) -> List[numpy.ndarray]:
+        """ Add the labels who are not in the cube at the end of the axes, and the empty cells of the layers
+
+        Args:
+            labels (List[List[str]]): Labels of each axis
+
+        Returns:
+            List[numpy.ndarray]: Index of the labels in the cube, for each axis
+        """
+        index = []
+        for axis, labels_axis in enumerate(labels):
+            for label in labels_axis:
+                if label not in self.__index[axis]:
+                    self.__index[axis][label] = len(self.__labels[axis])
+                    self.__labels[axis].append(label)
+            index.append(numpy.array([self.__index[axis][label] for label in labels_axis], dtype=numpy.int64))
+        
+        shape = tuple(len(labels_axis) for labels_axis in self.__labels)
+        for measure, layer in self.__layers.items():
+            if layer.shape != shape:
+                new_layer = numpy.zeros(shape, dtype=layer.dtype)
+                new_layer[:layer.shape[0], :layer.shape[1], :layer.shape[2]] = layer
+                self.__layers[measure] = new_layer
+        return index
+
+
+    @staticmethod
+    def __move_block(block: dict, index: List[numpy.ndarray]) -> dict:
+        """ Move a block of missions to other labels. The index of the labels are applied when the missions are needed
+
+        Args:
+            block (dict): Block of missions
+            index (List[numpy.ndarray]): New index of the labels for each axis (mode, position, year), -1 to remove the missions
+
+        Returns:
+            dict: Block with the new index
+        """
+        block = dict(block)
+        if block["index"] is not None:
+            # Index of the index of the block, -1 stays -1
+            index = [numpy.where(previous >= 0, values[numpy.maximum(previous, 0)], -1) if len(values) else numpy.full(len(previous), -1, dtype=numpy.int64)
+                     for values, previous in zip(index, block["index"])]
+        block["index"] = index
+        return block
+
+
+    def __get_missions(self) -> Dict[str, numpy.ndarray]:
+        """ Get all the missions added, in the order of the calls to add (and add_cube)
+
+        Returns:
+            Dict[str, numpy.ndarray]: Arrays of the missions (mode, position, year and the measures)
+        """
+        if self.__missions is None:
+            keys = ["mode", "position", "year", "distance", "emission", "emission_contrails"]
+            blocks = []
+            for block in self.__blocks:
+                if block["index"] is not None:
+                    # Index of the labels in this cube, the missions of a removed label are removed
+                    index_mode, index_position, index_year = block["index"]
+                    block = dict(block, mode=index_mode[block["mode"]], position=index_position[block["position"]], year=index_year[block["year"]])
+                    kept = (block["mode"] >= 0) & (block["position"] >= 0) & (block["year"] >= 0)
+                    if not kept.all():
+                        block = {key: block[key][kept] for key in keys}
+                blocks.append(block)
+            if len(blocks) == 0:
+                self.__missions = {key: numpy.zeros(0, dtype=numpy.int64) for key in keys}
+            else:
+                self.__missions = {key: numpy.concatenate([block[key] for block in blocks]) for key in keys}
+        return self.__missions
+
+
+    def __compute_layers(self) -> Dict[str, numpy.ndarray]:
+        """ Compute each layer of the cube with a grouped sum on the index of the cell of each mission.
+            The values of a cell are added in the order of the missions
+
+        Returns:
+            Dict[str, numpy.ndarray]: Layer (mode x position x year) of each measure
+        """
+        if self.__layers is not None:
+            return self.__layers
+
+        missions = self.__get_missions()
+        shape = tuple(len(labels) for labels in self.__labels)
+        size = shape[0] * shape[1] * shape[2]
+        cell = numpy.ravel_multi_index((missions["mode"], missions["position"], missions["year"]), shape) if size else numpy.zeros(0, dtype=numpy.int64)
+
+        self.__layers = {"mission": numpy.bincount(cell, minlength=size).reshape(shape)}
+        for measure in ["distance", "emission", "emission_contrails"]:
+            values = missions[measure]
+            layer = numpy.bincount(cell, weights=values, minlength=size).reshape(shape)
+            # The sum of integers stays an integer
+            if values.dtype.kind in "biu":
+                layer = layer.astype(numpy.int64)
+            self.__layers[measure] = layer
+        return self.__layers
+
+
+#######################################################################################################
+#  Getters                                                                                            #
+#######################################################################################################
+    def get_layer(self, measure: str) -> numpy.ndarray:
+        """ Get the layer of a measure
+
+        Args:
+            measure (str): Measure (see MissionCube.measures)
+
+        Raises:
+            KeyError: The measure doesn't exist
+
+        Returns:
+            numpy.ndarray: Array mode x position x year
+        """
+        if measure not in self.measures:
+            raise KeyError(f"La mesure '{measure}' n'existe pas")
+        return self.__compute_layers()[measure]
+
+
+    def get_total(self, measure: str, axis: Union[int, Tuple[int, ...]]) -> numpy.ndarray:
+        """ Get the total of a measure along one or several axes
+
+        Args:
+            measure (str): Measure
+            axis (Union[int, Tuple[int, ...]]): Axes to sum (MissionCube.axis_mode, axis_position, axis_year)
+
+        Returns:
+            numpy.ndarray: Totals
+        """
+        return self.get_layer(measure).sum(axis=axis)
+
+
+    def get_percentage(self, measure: str, axis: Union[int, Tuple[int, ...]]) -> numpy.ndarray:
+        """ Get the percentage of each cell in the total along one or several axes.
+            The percentage is 0 when the total is 0
+
+        Args:
+            measure (str): Measure
+            axis (Union[int, Tuple[int, ...]]): Axes of the total
+
+        Returns:
+            numpy.ndarray: Percentages (mode x position x year)
+        """
+        layer = self.get_layer(measure)
+        total = layer.sum(axis=axis, keepdims=True)
+        percentage = numpy.zeros(layer.shape, dtype=numpy.float64)
+        numpy.divide(100 * layer, total, out=percentage, where=total != 0)
+        return percentage
+
+
+    def get_missions_year(self, measure: str, year: str) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ Get the value of a measure for each mission of a year, in descending order.
+            The missions with the same value are sorted by mode, position and in the order they are added
+
+        Args:
+            measure (str): Measure ("distance", "emission" or "emission_contrails")
+            year (str): Year
+
+        Raises:
+            KeyError: The measure doesn't exist
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: Values and index of the mode of each mission
+        """
+        if measure not in self.measures or measure == "mission":
+            raise KeyError(f"La mesure '{measure}' n'existe pas")
+
+        missions = self.__get_missions()
+        selected = missions["year"] == self.get_index_year(year)
+        values = missions[measure][selected]
+        mode = missions["mode"][selected]
+        # numpy.lexsort is stable and the last key is the 1st to be sorted
+        order = numpy.lexsort((missions["position"][selected], mode, -values))
+        return values[order], mode[order]
+
+
+    def get_modes(self) -> List[str]:
+        """ Get the modes of the cube
+
+        Returns:
+            List[str]: Modes, in the order of the axis
+        """
+        return self.__labels[self.axis_mode]
+
+
+    def get_positions(self) -> List[str]:
+        """ Get the positions of the cube
+
+        Returns:
+            List[str]: Positions, in the order of the axis
+        """
+        return self.__labels[self.axis_position]
+
+
+    def get_years(self) -> List[str]:
+        """ Get the years of the cube
+
+        Returns:
+            List[str]: Years, in the order of the axis
+        """
+        return self.__labels[self.axis_year]
+
+
+    def get_index_mode(self, mode: str) -> int:
+        """ Get the index of a mode in the cube
+
+        Args:
+            mode (str): Mode
+
+        Raises:
+            KeyError: The mode is not in the cube
+
+        Returns:
+            int: Index
+        """
+        return self.__get_index(self.axis_mode, mode)
+
+
+    def get_index_position(self, position: str) -> int:
+        """ Get the index of a position in the cube
+
+        Args:
+            position (str): Position
+
+        Raises:
+            KeyError: The position is not in the cube
+
+        Returns:
+            int: Index
+        """
+        return self.__get_index(self.axis_position, position)
+
+
+    def get_index_year(self, year: str) -> int:
+        """ Get the index of a year in the cube
+
+        Args:
+            year (str): Year
+
+        Raises:
+            KeyError: The year is not in the cube
+
+        Returns:
+            int: Index
+        """
+        return self.__get_index(self.axis_year, year)
+
+
+    def __get_index(self, axis: int, label: str) -> int:
+        """ Get the index of a label on an axis
+
+        Args:
+            axis (int): Axis
+            label (str): Label
+
+        Raises:
+            KeyError: The label is not on the axis
+
+        Returns:
+            int: Index
+        """
+        if label not in self.__index[axis]:
+            raise KeyError(f"'{label}' n'est pas dans le cube")
+        return self.__index[axis][label]
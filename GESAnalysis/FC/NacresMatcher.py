@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import re
+from typing import Dict, Iterable, List
+
+
+class NacresMatcher:
+    """ Filter the NACRES keys with a list of codes (ex: "A*;*B2;AB*3"), where a key is accepted if one code accepts it :
+            - "*"   : all the keys
+            - "*Z*" : the keys containing Z
+            - "*Z"  : the keys ending with Z
+            - "Z*"  : the keys starting with Z
+            - "Y*Z" : the keys starting with Y and ending with Z
+            - "Z"   : the key Z
+        The codes are compiled once in one regular expression, and the result of each key is kept (memoized)
+    """
+
+    def __init__(self, codes: List[str]) -> None:
+        """ Compile the codes
+
+        Args:
+            codes (List[str]): Codes, without '.' and ' ' (see ChangeNacresCodeDialog)
+        """
+        self.codes = list(codes)
+        self.__regex = re.compile("|".join(f"(?:{self.__code_to_pattern(code)})" for code in self.codes))
+        self.__matched: Dict[str, bool] = {}   # Result of each key already tested
+
+
+    def __code_to_pattern(self, code: str) -> str:
+        """ Transform a code to a pattern matched from the start of the key (re.match)
+
+        Args:
+            code (str): Code
+
+        Returns:
+            str: Pattern
+        """
+        if code == "*":
+            return ""
+        if code[0] == '*':
+            # "*Z*" -> Z is in the key
+            if code[-1] == '*':
+                return ".*" + re.escape(code[1:-1])
+            # "*Z" -> The key ends with Z
+            return ".*" + re.escape(code[1:]) + r"\Z"
+        # "Z*" -> The key starts with Z
+        if code[-1] == '*':
+            return re.escape(code[:-1])
+        # "Y*Z" -> The key starts with Y and ends with Z
+        if '*' in code:
+            split_code = code.split('*')
+            return f"(?={re.escape(split_code[0])}).*{re.escape(split_code[1])}\\Z"
+        # "Z" -> The key is Z
+        return re.escape(code) + r"\Z"
+
+
+#######################################################################################################
+#  Filter the keys                                                                                    #
+#######################################################################################################
+    def match(self, key: str) -> bool:
+        """ Indicate if the key is accepted by one of the codes
+
+        Args:
+            key (str): NACRES key
+
+        Returns:
+            bool: True if the key is accepted, else False
+        """
+        matched = self.__matched.get(key)
+        if matched is None:
+            matched = self.__regex.match(key) is not None
+            self.__matched[key] = matched
+        return matched
+
+
+    def filter(self, keys: Iterable[str]) -> List[str]:
+        """ Get the keys accepted by the codes, in the same order and without duplicates
+
+        Args:
+            keys (Iterable[str]): NACRES keys
+
+        Returns:
+            List[str]: Keys accepted
+        """
+        return [key for key in dict.fromkeys(keys) if self.match(key)]
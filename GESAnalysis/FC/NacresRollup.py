@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+from typing import Dict, List, Optional, Tuple, Union
+
+
+class NacresRollup:
+    """ Amounts of the NACRES keys summed at each level of the hierarchy :
+            - level 0 : family (2 characters, ex: "AB")
+            - level 1 : 3 characters (ex: "AB1")
+            - level 2 : NACRES key (ex: "AB12")
+        The sums of each level are computed once from the amount of each key, then a graph (top-N, drill-down)
+        is computed from these sums without reading the keys again
+    """
+
+    # Number of characters of the label at each level (None : the key)
+    levels = [2, 3, None]
+
+    # Label of the bar who groups the labels not in the top-N
+    other_label = "Autres"
+
+
+    def __init__(self, amounts: Dict[str, Union[int, float]]) -> None:
+        """ Sum the amounts of the keys at each level
+
+        Args:
+            amounts (Dict[str, Union[int, float]]): Amount of each NACRES key (without '.')
+        """
+        self.__sums: List[Dict[str, Union[int, float]]] = []   # Sum of each label, for each level, in the order of the keys
+        for level in range(len(self.levels)):
+            sums = {}
+            for key, amount in amounts.items():
+                label = self.get_label(key, level)
+                sums[label] = sums.get(label, 0) + amount
+            self.__sums.append(sums)
+
+
+    @classmethod
+    def get_label(cls, key: str, level: int) -> str:
+        """ Get the label of a key at a level
+
+        Args:
+            key (str): NACRES key
+            level (int): Level
+
+        Returns:
+            str: Label (the start of the key)
+        """
+        length = cls.levels[level]
+        return key if length is None else key[:length]
+
+
+    @classmethod
+    def get_parent(cls, label: str, level: int) -> Optional[str]:
+        """ Get the label of the level above, who contains the label
+
+        Args:
+            label (str): Label at the level 'level'
+            level (int): Level
+
+        Returns:
+            Optional[str]: Label of the parent, None for the level 0
+        """
+        if level == 0:
+            return None
+        return cls.get_label(label, level - 1)
+
+
+#######################################################################################################
+#  Sums of a level                                                                                    #
+#######################################################################################################
+    def get_sums(self, level: int, parent: Optional[str] = None) -> Dict[str, Union[int, float]]:
+        """ Get the sum of each label of a level, in the order of the keys
+
+        Args:
+            level (int): Level
+            parent (Optional[str], optional): Keep only the labels starting with parent (drill-down). Defaults to None.
+
+        Returns:
+            Dict[str, Union[int, float]]: Sum of each label
+        """
+        if parent is None:
+            return dict(self.__sums[level])
+        return {label: amount for label, amount in self.__sums[level].items() if label.startswith(parent)}
+
+
+    def get_top(
+        self,
+        level: int,
+        nb_top: Optional[int] = None,
+        parent: Optional[str] = None
+    ) -> List[Tuple[str, Union[int, float]]]:
+        """ Get the labels of a level with the highest sums, and the sum of the others (other_label)
+
+        Args:
+            level (int): Level
+            nb_top (Optional[int], optional): Number of labels. Defaults to None (all the labels, in the order of the keys).
+            parent (Optional[str], optional): Keep only the labels starting with parent (drill-down). Defaults to None.
+
+        Returns:
+            List[Tuple[str, Union[int, float]]]: Label and sum, from the highest sum, then other_label if some labels are not in the top
+        """
+        sums = self.get_sums(level, parent)
+        if nb_top is None or len(sums) <= nb_top:
+            return list(sums.items())
+
+        # sorted is stable : the labels with the same sum stay in the order of the keys
+        labels = sorted(sums.items(), key=lambda label_sum: label_sum[1], reverse=True)
+        top = labels[:nb_top]
+        top.append((self.other_label, sum(amount for label, amount in labels[nb_top:])))
+        return top
@@ -6,18 +6,26 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
+import contextlib
 from GESAnalysis.FC.PATTERNS.Observer import Observer
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class Observable:
-    """ Update the UI when the model change
+    """ Update the UI when the model change.
+        The categories to update are collected, then the observers of each category are updated once :
+            - immediately, or at the end of a batch (see batch)
+            - or later by a scheduler (see set_scheduler), for example the event loop of Qt
     """
-    
+
     def __init__(self) -> None:
         """ Initialise a list of observers
         """
         self.__observer: List[Tuple[Observer, str]] = []
+        self.__dirty: Dict[str, None] = {}                                  # Categories to update, in order and without duplicates
+        self.__batch_depth = 0                                              # Number of batch in progress
+        self.__scheduler: Optional[Callable[[Callable[[], None]], None]] = None
+        self.__flush_scheduled = False
 
 
     def add_observer(self, o: Observer, c: str) -> None:
@@ -42,12 +50,68 @@ class Observable:
             pass
 
 
+    def set_scheduler(self, scheduler: Optional[Callable[[Callable[[], None]], None]]) -> None:
+        """ Set the function who calls the update of the observers later.
+            It receives the function to call (ex: lambda f: QTimer.singleShot(0, f)).
+            With None, the observers are updated immediately
+
+        Args:
+            scheduler (Optional[Callable[[Callable[[], None]], None]]): Scheduler
+        """
+        self.__scheduler = scheduler
+
+
+#######################################################################################################
+#  Update the observers                                                                               #
+#######################################################################################################
     def update(self, c:str) -> None:
-        """ Update the observers from the category c
+        """ Update the observers from the category c.
+            In a batch, the category is updated at the end of the batch
 
         Args:
             c (str): Category
         """
-        for observer, category in self.__observer:
-            if category == c:
-                observer.update()
+        self.__dirty[c] = None
+        if self.__batch_depth == 0:
+            self.__request_flush()
+
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """ Collect the categories to update during the block 'with', and update each of them once at the end.
+            The batches can be nested : the update is done at the end of the 1st batch
+
+        Yields:
+            None
+        """
+        self.__batch_depth += 1
+        try:
+            yield
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__request_flush()
+
+
+    def __request_flush(self) -> None:
+        """ Update the categories collected now, or ask the scheduler to do it
+        """
+        if len(self.__dirty) == 0:
+            return
+        if self.__scheduler is None:
+            self.flush()
+        elif not self.__flush_scheduled:
+            self.__flush_scheduled = True
+            self.__scheduler(self.flush)
+
+
+    def flush(self) -> None:
+        """ Update the observers of each category collected, once for each category
+        """
+        self.__flush_scheduled = False
+        while len(self.__dirty) > 0:
+            c = next(iter(self.__dirty))
+            del self.__dirty[c]
+            for observer, category in list(self.__observer):
+                if category == c:
+                    observer.update()
@@ -7,13 +7,31 @@
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
 import os
+import io
 import platform
 import csv
-from typing import Union, Dict, List, Tuple
+import gc
+import gzip
+import bz2
+import lzma
+import zipfile
+import re
+import itertools
+import contextlib
+import json
+import threading
+import numpy
+from concurrent.futures import CancelledError
+from functools import partial
+from typing import Any, Callable, Union, Dict, List, Tuple, Optional, Iterator, TextIO
+from GESAnalysis.FC.CacheData import CacheData
+from GESAnalysis.FC.ColumnarData import ColumnarData
 
 
 class ReaderData:
-    """ Class to read data from a CSV, TSV, TXT or XLSX file
+    """ Class to read data from a CSV, TSV, TXT, XLSX or NPZ file (exported by ExportData).
+        A CSV, TSV or TXT file can be compressed (.gz, .bz2, .xz, .zst with the module zstandard) and is decompressed during the reading,
+        or be in a ZIP archive : 'archive.zip/fichier.csv' (or 'archive.zip' if the archive has only one file)
     
         Exemple : File format :
             nom_col1,nom_col2.unite,nom_col3.suite_nom.unite,nom_col4.suite_nom.unite.suite_unite
@@ -29,7 +47,19 @@ class ReaderData:
             }
     """
     
-    __accepted_extension = [".csv", ".txt", ".tsv", ".xlsx"]
+    __accepted_extension = [".csv", ".txt", ".tsv", ".xlsx", ".npz"]
+    
+    # Extensions of the files who can be compressed or in a ZIP archive
+    __text_extension = [".csv", ".txt", ".tsv"]
+    
+    # Extensions of the compressed files
+    __compressions = [".gz", ".bz2", ".xz", ".zst"]
+    
+    # Path to a file in a ZIP archive : 'archive.zip/fichier.csv'
+    __archive_path = re.compile(r"(.+?\.zip)[\\/](.+)", re.IGNORECASE)
+    
+    # Types of the columns in the metadata of a NPZ file
+    __npz_types = {"int": int, "float": float, "bool": bool, "str": str}
     
     
     # Units accepted for data
@@ -40,43 +70,202 @@ class ReaderData:
             ]
     
     
-    def __init__(self) -> None:
+    # Values converted to a boolean
+    __bool_values = {"true", "false"}
+    
+    # Strings that can be converted to an int or a float
+    __number = re.compile(r"\s*[+-]?(?:nan|inf(?:inity)?|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:e[+-]?\d[\d_]*)?)\s*", re.IGNORECASE)
+
+    # Number of bytes (CSV, TSV, TXT) or rows (XLSX) read between two reports of the progress
+    progress_step = 1 << 20
+    progress_step_rows = 1000
+    
+    # The garbage collector is paused for the whole process : the readings who run at the same time (threads)
+    # share a counter, and the last one restores the state of the garbage collector before the 1st one (see __gc_paused)
+    __gc_lock = threading.Lock()
+    __gc_pauses = 0
+    __gc_enabled = True
+    
+    
+    def __init__(self, cache: Optional[CacheData] = None) -> None:
         """ Initialisation of the class
+
+        Args:
+            cache (CacheData, optional): Cache of the data already read. Defaults to None (no cache).
         """
-        pass
+        self.__cache = cache
 
 
-    def read_file(self, filename: str, sep: str = None, engine: str ='pandas') -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+    def read_file(
+        self,
+        filename: str,
+        sep: str = None,
+        engine: str ='pandas',
+        columnar: bool = False,
+        sheet: Union[str, int, None] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> Optional[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]:
         """ Read the file 'filename' with or without a separator, for CSV, TSV and TXT files, and
-            a reading engine, for XLSX files
+            a reading engine and a sheet, for XLSX files.
+            During the reading, 'progress' receives the quantity read and the total : bytes for CSV, TSV and TXT files
+            (the file is split, then converted column by column : the total is twice the size of the file),
+            rows for XLSX files (the total is 0 when it is unknown). The reading stops when 'is_cancelled' returns True
+
+        Args:
+            filename (str): Path to file
+            sep (str, optional): Separator between values in a CSV, TSV and TXT files. Defaults to None
+            engine (str, optional): Reading engine for XLSX file (pandas, openpyxl). Defaults to pandas
+            columnar (bool, optional): Return the data in a ColumnarData (NumPy arrays) instead of a dictionary. Defaults to False
+            sheet (str | int, optional): Name or index of the sheet to read in a XLSX file. Defaults to None (active sheet with openpyxl, 1st sheet with pandas)
+            progress (Callable[[int, int], None], optional): Function called with the quantity read and the total. Defaults to None
+            is_cancelled (Callable[[], bool], optional): Returns True if the reading must stop. Defaults to None
+
+        Returns:
+            dict | ColumnarData | None: Dictionary with the name, unit, data and type of each column in the file if the reading is correct.
+            None if the reading was cancelled
+        """
+        report = None
+        if progress is not None or is_cancelled is not None:
+            report = partial(
+                self.__report,
+                progress if progress is not None else lambda done, total: None,
+                is_cancelled if is_cancelled is not None else lambda: False
+            )
+        
+        try:
+            if self.__cache is None:
+                return self.__read(filename, sep, engine, columnar, sheet, report)
+            
+            # The file was already read with the same options and was not modified
+            options = {"sep": sep, "engine": engine, "columnar": columnar, "sheet": sheet}
+            data = self.__cache.get(filename, **options)
+            if data is not None:
+                return data
+            
+            data = self.__read(filename, sep, engine, columnar, sheet, report)
+            self.__cache.put(filename, data, **options)
+            return data
+        except CancelledError:
+            return None
+    
+    
+    def __report(self, progress: Callable[[int, int], None], is_cancelled: Callable[[], bool], done: int, total: int) -> None:
+        """ Give the progress of the reading, or stop it if it is cancelled
+
+        Args:
+            progress (Callable[[int, int], None]): Function called with the quantity read and the total
+            is_cancelled (Callable[[], bool]): Returns True if the reading must stop
+            done (int): Quantity read
+            total (int): Total quantity (0 if unknown)
+
+        Raises:
+            CancelledError: The reading is cancelled
+        """
+        if is_cancelled():
+            raise CancelledError()
+        progress(done, total)
+    
+    
+    def iter_chunks(
+        self,
+        filename: str,
+        chunk_rows: int = 10000,
+        sep: str = None,
+        engine: str = 'pandas',
+        columnar: bool = False,
+        sheet: Union[str, int, None] = None
+    ) -> Iterator[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]:
+        """ Read the file 'filename' by blocks of 'chunk_rows' rows.
+            Each block has the same format as the dictionary of read_file (name, unit, data and type of each column),
+            so the data can be aggregated without keeping the whole file in memory.
+            The type of a column is the same between the blocks (an int column can become a float column),
+            and the errors give the line in the file
+
+        Args:
+            filename (str): Path to file
+            chunk_rows (int, optional): Maximum number of rows in a block. Defaults to 10000
+            sep (str, optional): Separator between values in a CSV, TSV and TXT files. Defaults to None
+            engine (str, optional): Reading engine for XLSX file (pandas, openpyxl). Defaults to pandas.
+            Only 'openpyxl' reads a XLSX file by blocks, 'pandas' reads the whole sheet
+            columnar (bool, optional): Give each block in a ColumnarData instead of a dictionary. Defaults to False
+            sheet (str | int, optional): Name or index of the sheet to read in a XLSX file. Defaults to None
+
+        Raises:
+            ValueError: 'chunk_rows' is not a positive number
+
+        Returns:
+            Iterator[dict | ColumnarData]: Blocks of data
+        """
+        if chunk_rows <= 0:
+            raise ValueError(f"Le nombre de lignes d'un bloc doit être positif. Il est de {chunk_rows}")
+        
+        # Verification of the file
+        ext = self.__verify_file(filename)
+        
+        if ext in [".csv", ".tsv", ".txt"]:
+            delimiter = sep
+            if delimiter is None:
+                delimiter = self.__detect_delimiter(filename)
+            return self.__iter_chunks_csv_tsv_txt(filename, chunk_rows, delimiter, columnar)
+        
+        if ext == ".npz":
+            return self.__iter_chunks_npz(filename, chunk_rows, columnar)
+        
+        return self.__iter_chunks_xlsx(filename, chunk_rows, engine, columnar, sheet)
+
+
+    def __read(
+        self,
+        filename: str,
+        sep: str = None,
+        engine: str ='pandas',
+        columnar: bool = False,
+        sheet: Union[str, int, None] = None,
+        report: Optional[Callable[[int, int], None]] = None
+    ) -> Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]:
+        """ Read the file 'filename' depending on his extension
 
         Args:
             filename (str): Path to file
             sep (str, optional): Separator between values in a CSV, TSV and TXT files. Defaults to None
             engine (str, optional): Reading engine for XLSX file (pandas, openpyxl). Defaults to pandas
+            columnar (bool, optional): Return a ColumnarData instead of a dictionary. Defaults to False
+            sheet (str | int, optional): Name or index of the sheet to read in a XLSX file. Defaults to None
+            report (Callable[[int, int], None], optional): Function called with the progress of the reading (see __report). Defaults to None
 
         Returns:
-            dict: Dictionary with the name, unit, data and type of each column in the file if the reading is correct
+            dict | ColumnarData: Data of the file
         """
         # Verification of the file
-        self.__verify_file(filename)
+        ext = self.__verify_file(filename)
         
         # Reading of the CSV, TSV or TXT file with a separator
-        if self.__ext in [".csv", ".tsv", ".txt"]:
+        if ext in [".csv", ".tsv", ".txt"]:
             # If it's a TSV file, then the separator is '\t'
-            if self.__ext == ".tsv":
+            if ext == ".tsv":
                 delimiter = "\t"
             delimiter = sep
             # If the separator is not given, then it automatically detects
             if delimiter is None:
                 delimiter = self.__detect_delimiter(filename)
-            return self.__read_csv_tsv_txt(filename, delimiter)
+            return self.__read_csv_tsv_txt(filename, delimiter, columnar, report)
+        
+        # NPZ file : the columns are already converted
+        if ext == ".npz":
+            data = self.__read_npz(filename)
+            if columnar:
+                return data
+            return self.__columnar_to_dict(data)
         
         # If it's not a CSV, TSV or TXT file, then it's a XLSX file
-        return self.__read_xlsx(filename, engine)
+        data = self.__read_xlsx(filename, engine, sheet, report)
+        if columnar:
+            return ColumnarData.from_dict(data)
+        return data
         
     
-    def __verify_file(self, filename: str) -> None:        
+    def __verify_file(self, filename: str) -> str:        
         """ Check if the file 'filename' exists and it can be read
 
         Args:
@@ -84,9 +273,13 @@ class ReaderData:
 
         Raises:
             FileNotFoundError: 'filename' was not found
-            TypeError: 'filename' is not a CSV, TSV, TXT or XLSX file
+            TypeError: 'filename' is not a CSV, TSV, TXT, XLSX or NPZ file,
+            or it's compressed or in an archive without being a CSV, TSV or TXT file
+        
+        Returns:
+            str: Extension of the file (without the extension of the compression)
         """
-        root_filename, self.__ext = os.path.splitext(filename)
+        root_filename, ext = os.path.splitext(filename)
         
         # Get the name of file and remove the path
         # The path is different between OS
@@ -98,12 +291,134 @@ class ReaderData:
         file = path_to_file[len(path_to_file) - 1]
         
         # Check if the file exists
-        if not os.path.isfile(filename):
-            raise FileNotFoundError(f"Le fichier '{file+self.__ext}' n'existe pas")
+        path, member, compression, ext_file = self.__locate(filename)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Le fichier '{file+ext}' n'existe pas")
+        if member is not None:
+            with zipfile.ZipFile(path) as archive:
+                if member not in archive.namelist():
+                    raise FileNotFoundError(f"Le fichier '{member}' n'existe pas dans l'archive '{os.path.basename(path)}'")
         
         # Check if the file is supported by the application
-        if not self.__ext in self.__accepted_extension:
-            raise TypeError(f"Exportation impossible de '{file+self.__ext}'. Le fichier doit être de type CSV, TSV, TXT ou XLSX")
+        if not ext_file in self.__accepted_extension:
+            raise TypeError(f"Exportation impossible de '{file+ext}'. Le fichier doit être de type CSV, TSV, TXT, XLSX ou NPZ")
+        if (member is not None or compression is not None) and not ext_file in self.__text_extension:
+            raise TypeError(f"Lecture impossible de '{file+ext}'. Seul un fichier CSV, TSV ou TXT peut être compressé ou dans une archive")
+        return ext_file
+    
+    
+    def __locate(self, filename: str) -> Tuple[str, Optional[str], Optional[str], str]:
+        """ Find where is the file 'filename' : the file on the disk, the file in the ZIP archive and the compression.
+            An archive with only one CSV, TSV or TXT file gives this file
+
+        Args:
+            filename (str): Path to file
+
+        Raises:
+            ValueError: The archive has several CSV, TSV or TXT files, or none
+
+        Returns:
+            tuple: Path to the file on the disk, path to the file in the archive (None if it's not an archive),
+            extension of the compression (None if it's not compressed) and extension of the file
+        """
+        path, member = filename, None
+        archive_path = self.__archive_path.fullmatch(filename)
+        if archive_path is not None and not os.path.isfile(filename) and os.path.isfile(archive_path.group(1)):
+            path, member = archive_path.group(1), archive_path.group(2).replace('\\', '/')
+        
+        root_filename, ext = os.path.splitext(path if member is None else member)
+        if ext.lower() == ".zip" and member is None and os.path.isfile(path):
+            members = self.list_archive(path)
+            if len(members) != 1:
+                archive = os.path.basename(path)
+                if len(members) == 0:
+                    raise ValueError(f"L'archive '{archive}' ne contient aucun fichier CSV, TSV ou TXT")
+                raise ValueError(f"L'archive '{archive}' contient plusieurs fichiers ({', '.join(members)}). Choisissez un fichier avec '{archive}/{members[0]}'")
+            member = members[0]
+            root_filename, ext = os.path.splitext(member)
+        
+        compression = None
+        if ext.lower() in self.__compressions:
+            compression = ext.lower()
+            root_filename, ext = os.path.splitext(root_filename)
+        return path, member, compression, ext
+    
+    
+    def list_archive(self, filename: str) -> List[str]:
+        """ Get the CSV, TSV and TXT files in the ZIP archive 'filename'.
+            A file is read with the path 'filename/fichier'
+
+        Args:
+            filename (str): Path to the archive
+
+        Returns:
+            List[str]: Path of the files in the archive
+        """
+        with zipfile.ZipFile(filename) as archive:
+            return [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and os.path.splitext(info.filename)[1] in self.__text_extension
+            ]
+    
+    
+    def __open_text(self, filename: str, newline: Optional[str] = "") -> TextIO:
+        """ Open a CSV, TSV or TXT file to read it, with the decompression of the file or from the archive.
+            The file is decompressed during the reading, without writing it on the disk
+
+        Args:
+            filename (str): Path to file
+            newline (str, optional): Argument newline of open(). Defaults to "".
+
+        Raises:
+            ImportError: The module zstandard is not installed to read a .zst file
+
+        Returns:
+            TextIO: File opened
+        """
+        path, member, compression, _ = self.__locate(filename)
+        if member is not None:
+            # The file in the archive stays readable after closing the archive
+            with zipfile.ZipFile(path) as archive:
+                return io.TextIOWrapper(archive.open(member), newline=newline)
+        
+        match compression:
+            case ".gz":
+                return gzip.open(path, "rt", newline=newline)
+            case ".bz2":
+                return bz2.open(path, "rt", newline=newline)
+            case ".xz":
+                return lzma.open(path, "rt", newline=newline)
+            case ".zst":
+                try:
+                    import zstandard
+                except ImportError:
+                    raise ImportError(f"Le module 'zstandard' est nécessaire pour lire '{os.path.basename(path)}'")
+                return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")), newline=newline)
+            case _:
+                return open(path, "r", newline=newline)
+    
+    
+    def __get_text_size(self, filename: str) -> int:
+        """ Get the size of a CSV, TSV or TXT file once decompressed, to report the progress of the reading
+
+        Args:
+            filename (str): Path to file
+
+        Returns:
+            int: Size of the file in bytes, 0 if it's unknown (.bz2, .xz, .zst)
+        """
+        path, member, compression, _ = self.__locate(filename)
+        if member is not None:
+            with zipfile.ZipFile(path) as archive:
+                return archive.getinfo(member).file_size
+        if compression is None:
+            return os.path.getsize(path)
+        if compression == ".gz" and os.path.getsize(path) >= 4:
+            # The last 4 bytes of a gzip file are the size of the data (modulo 2^32)
+            with open(path, "rb") as file:
+                file.seek(-4, os.SEEK_END)
+                return int.from_bytes(file.read(4), "little")
+        return 0
     
     
     def __detect_delimiter(self, filename: str) -> str:
@@ -119,89 +434,384 @@ class ReaderData:
         
         # Get the 1st line (column names) to found the separator
         head_line = None
-        with open(filename, "r") as f:
+        with self.__open_text(filename, newline=None) as f:
             head_line = f.readline()
         
         dialect = sniffer.sniff(head_line)
         return dialect.delimiter
     
 
-    def __read_csv_tsv_txt(self, filename: str, sep:str = ',') -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
-        """ Reading the data from a CSV, TSV or TXT file and the separator between values
+    def __read_csv_tsv_txt(
+        self,
+        filename: str,
+        sep: str = ',',
+        columnar: bool = False,
+        report: Optional[Callable[[int, int], None]] = None
+    ) -> Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]:
+        """ Reading the data from a CSV, TSV or TXT file and the separator between values.
+            The rows are split in bulk by the module csv, then each column is converted at once
 
         Args:
             filename (str): Path to file
             sep (str, optional): Separator between values in the file. Defaults to ','
+            columnar (bool, optional): Return a ColumnarData instead of a dictionary. Defaults to False
+            report (Callable[[int, int], None], optional): Function called with the number of bytes split and converted. Defaults to None
 
         Raises:
             ValueError: Number of elements in a row is different from the number of columns
             TypeError: the type of an element is different from the element of his column
 
         Returns:
-            dict: Dictionary with the data of file if the reading is correct
+            dict | ColumnarData: Dictionary with the data of file if the reading is correct
         """
-        data = {}
-        with open(filename, "r") as file:
-            # Read the 1st line (column names)
-            column = file.readline()
+        with self.__gc_paused():
+            with self.__open_text(filename) as file:
+                # Read the 1st line (column names)
+                name_column = self.__read_header(file, sep)
+                
+                # Read the rest of the file until the first empty line
+                if report is None:
+                    rows = list(itertools.takewhile(bool, self.__split_rows(file, sep)))
+                else:
+                    size = self.__get_text_size(filename)
+                    lines = self.__track_lines(file, 2 * size, report)
+                    rows = list(itertools.takewhile(bool, self.__split_rows(lines, sep)))
             
-            # Remove useless caracters (encoding + end of line)
-            column = column.strip("\ufeff")
-            column = column.strip("ï»¿")
-            column = column.strip("\n")
-            name_column = column.split(sep)
-            nb_column = len(name_column) # Number of columns
-
-            # Add into data (dictionary)
-            # Each key correspond to a column
-            for i in range(nb_column):
-                data[name_column[i]] = {}
-                n, u = self.__parser_name_unit(name_column[i])
-                data[name_column[i]]["name"] = n
-                data[name_column[i]]["unit"] = u
-                data[name_column[i]]["data"] = []
+            report_column = None
+            if report is not None:
+                # Each column converted is a part of the size of the file
+                report_column = lambda nb_done, nb_column: report(size + size * nb_done // nb_column, 2 * size)
+                report_column(0, 1)
+            columns, _ = self.__convert_rows(name_column, rows, 2, report=report_column)
+            del rows # The rows are no longer needed : free the memory before building the data
+            return self.__build_data(name_column, columns, columnar)
+    
+    
+    def __iter_chunks_csv_tsv_txt(
+        self,
+        filename: str,
+        chunk_rows: int,
+        sep: str,
+        columnar: bool = False
+    ) -> Iterator[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]:
+        """ Read a CSV, TSV or TXT file by blocks of 'chunk_rows' rows
+
+        Args:
+            filename (str): Path to file
+            chunk_rows (int): Maximum number of rows in a block
+            sep (str): Separator between values in the file
+            columnar (bool, optional): Give each block in a ColumnarData instead of a dictionary. Defaults to False
+
+        Returns:
+            Iterator[dict | ColumnarData]: Blocks of data
+        """
+        with self.__open_text(filename) as file:
+            name_column = self.__read_header(file, sep)
+            rows_iter = itertools.takewhile(bool, self.__split_rows(file, sep))
             
-            # Read the rest of the file
-            lines = file.readline()
-            lines = lines.strip('\n')
-            lines_iter = 1
-            while lines != "":
-                list_lines = lines.split(sep)
-                
-                nb_elems_line = len(list_lines)
-                # Check that the number of elements of a row is equal to the number of columns
-                if nb_elems_line != nb_column:
-                    raise ValueError(f"La ligne {lines_iter+1} a {nb_elems_line} éléments mais il y a {nb_column} colonnes")
-                
-                # Add the row elements into data
-                # The elements are in a list where the key is the name of the column
-                for elem_index in range(len(list_lines)):
-                    elem, type_elem = self.__convert_element(list_lines[elem_index])
-                    # If it's the first element, we add his type to the dictionary
-                    if lines_iter == 1:
-                        data[name_column[elem_index]]["type"] = type_elem
-                    # Else, we compare if it's the same type
-                    else:
-                        correct_type = data[name_column[elem_index]]["type"]
-                        # If it's an int or a float, we accept both of them
-                        if correct_type == int and type_elem == float:
-                            correct_type = float
-                            data[name_column[elem_index]]["type"] = correct_type
-                        elif correct_type == float and type_elem == int:
-                            for i in range(len(elem)):
-                                elem[i] = float(elem[i])
-                            type_elem = float
-                        if type_elem != correct_type:
-                            raise TypeError(f"L'élément à la ligne {lines_iter+1} et colonne {'.'.join(data[name_column[elem_index]]['name'])} est du type {self.__type_to_str(type_elem)} au lieu du type {self.__type_to_str(correct_type)}")
-                    
-                    # Add into data
-                    data[name_column[elem_index]]["data"].append(elem)
-                    
-                # Next line
-                lines = file.readline()
-                lines = lines.strip('\n')
-                lines_iter += 1
-                
+            types = None
+            first_line = 2
+            while True:
+                rows = list(itertools.islice(rows_iter, chunk_rows))
+                if len(rows) == 0:
+                    return
+                # The garbage collector is paused only during the conversion, not between the blocks
+                with self.__gc_paused():
+                    columns, types = self.__convert_rows(name_column, rows, first_line, types)
+                    chunk = self.__build_data(name_column, columns, columnar)
+                first_line += len(rows)
+                yield chunk
+    
+    
+    def __track_lines(self, file: TextIO, total: int, report: Callable[[int, int], None]) -> Iterator[str]:
+        """ Give the lines of the file and report the number of bytes read, every 'progress_step' bytes.
+            The caracters are counted instead of the bytes : the number is never greater than the size of the file
+
+        Args:
+            file (TextIO): File opened
+            total (int): Total given to 'report'
+            report (Callable[[int, int], None]): Function called with the number of bytes read and the total
+
+        Returns:
+            Iterator[str]: Lines of the file
+        """
+        done = 0
+        next_report = 0
+        for line in file:
+            done += len(line)
+            if done >= next_report:
+                report(done, total)
+                next_report = done + self.progress_step
+            yield line
+    
+    
+    @contextlib.contextmanager
+    def __gc_paused(self) -> Iterator[None]:
+        """ Pause the garbage collector.
+            The reading creates millions of small lists without cycles :
+            the garbage collector doesn't need to scan them again and again.
+            It is enabled again at the end of the last reading in progress, if it was enabled before the 1st one
+        """
+        with ReaderData.__gc_lock:
+            if ReaderData.__gc_pauses == 0:
+                ReaderData.__gc_enabled = gc.isenabled()
+                gc.disable()
+            ReaderData.__gc_pauses += 1
+        try:
+            yield
+        finally:
+            with ReaderData.__gc_lock:
+                ReaderData.__gc_pauses -= 1
+                if ReaderData.__gc_pauses == 0 and ReaderData.__gc_enabled:
+                    gc.enable()
+    
+    
+    def __read_header(self, file: TextIO, sep: str) -> List[str]:
+        """ Read the 1st line of the file (column names)
+
+        Args:
+            file (TextIO): File opened
+            sep (str): Separator between values in the file
+
+        Returns:
+            List[str]: Name of the columns
+        """
+        column = file.readline()
+        
+        # Remove useless caracters (encoding + end of line)
+        column = column.strip("\ufeff")
+        column = column.strip("ï»¿")
+        column = column.strip("\r\n")
+        return column.split(sep)
+    
+    
+    def __split_rows(self, file: Union[TextIO, Iterator[str]], sep: str) -> Iterator[List[str]]:
+        """ Split the rows of the file with the separator. An empty line gives an empty list
+
+        Args:
+            file (TextIO | Iterator[str]): File opened (with newline=''), or his lines
+            sep (str): Separator between values in the file
+
+        Returns:
+            Iterator[List[str]]: Elements of each row
+        """
+        # The C reader of csv accepts only a separator of 1 caracter
+        if len(sep) == 1:
+            return csv.reader(file, delimiter=sep, quoting=csv.QUOTE_NONE)
+        return ([] if line == "" else line.split(sep) for line in (l.rstrip("\r\n") for l in file))
+    
+    
+    def __convert_rows(
+        self,
+        name_column: List[str],
+        rows: List[List[str]],
+        first_line: int,
+        types: Optional[List[Optional[type]]] = None,
+        report: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[List[Optional[Tuple[List[Union[int, float, bool, str]], Optional[List[int]], type]]], List[Optional[type]]]:
+        """ Convert the rows of the file column by column
+
+        Args:
+            name_column (List[str]): Name of the columns
+            rows (List[List[str]]): Elements of each row
+            first_line (int): Number of the line of the 1st row in the file
+            types (List[Optional[type]], optional): Type of each column in the previous rows of the file. Defaults to None
+            report (Callable[[int, int], None], optional): Function called with the number of columns converted and the number of columns. Defaults to None
+
+        Raises:
+            ValueError: Number of elements in a row is different from the number of columns
+            TypeError: the type of an element is different from the element of his column
+
+        Returns:
+            tuple: For each column, the flat values, the offsets (None if each row has one value)
+            and the type (None if there are no rows). Then the type of each column
+        """
+        nb_column = len(name_column)
+        if types is None:
+            types = [None] * nb_column
+        
+        # Search the 1st row where the number of elements is different from the number of columns
+        nb_rows = len(rows)
+        if set(map(len, rows)) - {nb_column}:
+            nb_rows = next(i for i, row in enumerate(rows) if len(row) != nb_column)
+        
+        cells_column = list(zip(*rows[:nb_rows])) if nb_rows > 0 else [()] * nb_column
+        columns = []
+        type_error = None
+        for index_column, cells in enumerate(cells_column):
+            values, offsets, type_column, error = self.__convert_column(cells, types[index_column])
+            columns.append(None if type_column is None else (values, offsets, type_column))
+            # Keep the 1st error of the file (1st row, then 1st column)
+            if error is not None and (type_error is None or error[0] < type_error[0]):
+                type_error = (error[0], index_column, error[1], error[2])
+            if report is not None:
+                report(index_column + 1, nb_column)
+        
+        # The errors are reported in the order of the file
+        if type_error is not None:
+            row, index_column, type_elem, correct_type = type_error
+            name, _ = self.__parser_name_unit(name_column[index_column])
+            raise TypeError(f"L'élément à la ligne {row+first_line} et colonne {'.'.join(name)} est du type {self.__type_to_str(type_elem)} au lieu du type {self.__type_to_str(correct_type)}")
+        if nb_rows < len(rows):
+            raise ValueError(f"La ligne {nb_rows+first_line} a {len(rows[nb_rows])} éléments mais il y a {nb_column} colonnes")
+        
+        return columns, [types[i] if columns[i] is None else columns[i][2] for i in range(nb_column)]
+    
+    
+    def __convert_column(
+        self,
+        cells: Tuple[str, ...],
+        expected_type: Optional[type] = None
+    ) -> Tuple[List[Union[int, float, bool, str]], Optional[List[int]], Optional[type], Optional[Tuple[int, type, type]]]:
+        """ Convert the elements of a column to their type.
+            If the column has only one value per row, the type is searched for the whole column,
+            else each element is converted like before
+
+        Args:
+            cells (Tuple[str, ...]): Elements of the column
+            expected_type (type, optional): Type of the column in the previous rows of the file. Defaults to None
+
+        Returns:
+            tuple: Flat values, offsets (None if each row has one value), type of the column (None if there are no elements)
+            and the error (index of the row, type of the element, type of the column) or None
+        """
+        if len(cells) == 0:
+            return [], None, expected_type, None
+        
+        # Only one value per row
+        if "," not in "".join(cells):
+            values = None
+            for constructor in (int, float):
+                try:
+                    values = list(map(constructor, cells))
+                    type_column = constructor
+                    break
+                except ValueError:
+                    pass
+            
+            # Like the conversion element by element, the int before the 1st float of the column stay int
+            if values is not None and type_column == float and expected_type != float:
+                nb_int = self.__count_int(cells)
+                values[:nb_int] = map(int, cells[:nb_int])
+            
+            if values is None:
+                lowered = set(map(str.lower, cells))
+                if lowered <= self.__bool_values:
+                    values = [val == "true" for val in map(str.lower, cells)]
+                    type_column = bool
+                elif lowered.isdisjoint(self.__bool_values) and not any(map(self.__number.fullmatch, cells)):
+                    values = list(cells)
+                    type_column = str
+            
+            if values is not None:
+                # All the elements have the same type : compare it with the type of the previous rows
+                if expected_type is None or expected_type == type_column or (expected_type == int and type_column == float):
+                    return values, None, type_column, None
+                if expected_type == float and type_column == int:
+                    return list(map(float, values)), None, float, None
+                return [], None, expected_type, (0, type_column, expected_type)
+        
+        return self.__convert_column_by_element(cells, expected_type)
+    
+    
+    def __count_int(self, cells: Tuple[str, ...]) -> int:
+        """ Count the elements converted to an int at the start of a column
+
+        Args:
+            cells (Tuple[str, ...]): Elements of the column
+
+        Returns:
+            int: Number of elements before the 1st element who is not an int
+        """
+        for index_row, cell in enumerate(cells):
+            try:
+                int(cell)
+            except ValueError:
+                return index_row
+        return len(cells)
+    
+    
+    def __convert_column_by_element(
+        self,
+        cells: Tuple[str, ...],
+        expected_type: Optional[type] = None
+    ) -> Tuple[List[Union[int, float, bool, str]], Optional[List[int]], type, Optional[Tuple[int, type, type]]]:
+        """ Convert the elements of a column one by one (several values per row or different types)
+
+        Args:
+            cells (Tuple[str, ...]): Elements of the column
+            expected_type (type, optional): Type of the column in the previous rows of the file. Defaults to None
+
+        Returns:
+            tuple: Flat values, offsets (None if each row has one value), type of the column
+            and the error (index of the row, type of the element, type of the column) or None
+        """
+        values = []
+        offsets = [0]
+        correct_type = expected_type
+        for index_row, cell in enumerate(cells):
+            elem, type_elem = self.__convert_element(cell)
+            # If it's the first element, it gives the type of the column
+            if correct_type is None:
+                correct_type = type_elem
+            # Else, we compare if it's the same type
+            else:
+                # If it's an int or a float, we accept both of them
+                if correct_type == int and type_elem == float:
+                    correct_type = float
+                elif correct_type == float and type_elem == int:
+                    elem = [float(val) for val in elem]
+                    type_elem = float
+                if type_elem != correct_type:
+                    return values, offsets, correct_type, (index_row, type_elem, correct_type)
+            
+            values.extend(elem)
+            offsets.append(len(values))
+        
+        if len(values) == len(cells):
+            offsets = None
+        return values, offsets, correct_type, None
+    
+    
+    def __build_data(
+        self,
+        name_column: List[str],
+        columns: List[Optional[Tuple[List[Union[int, float, bool, str]], Optional[List[int]], type]]],
+        columnar: bool = False
+    ) -> Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]:
+        """ Create the dictionary (or the ColumnarData) from the converted columns
+
+        Args:
+            name_column (List[str]): Name of the columns
+            columns (list): For each column, the flat values, the offsets and the type. None if there are no rows
+            columnar (bool, optional): Return a ColumnarData instead of a dictionary. Defaults to False
+
+        Returns:
+            dict | ColumnarData: Data of the file
+        """
+        if columnar:
+            data = ColumnarData()
+            for column, converted in zip(name_column, columns):
+                n, u = self.__parser_name_unit(column)
+                values, offsets, type_column = converted if converted is not None else ([], None, str)
+                data.add_column(column, n, u, type_column, values, offsets)
+            return data
+        
+        # Add into data (dictionary)
+        # Each key correspond to a column
+        data = {}
+        for column, converted in zip(name_column, columns):
+            n, u = self.__parser_name_unit(column)
+            data[column] = {"name": n, "unit": u, "data": []}
+            if converted is None:
+                continue
+            
+            values, offsets, type_column = converted
+            if offsets is None:
+                data[column]["data"] = [[val] for val in values]
+            else:
+                data[column]["data"] = [values[offsets[i]:offsets[i+1]] for i in range(len(offsets) - 1)]
+            data[column]["type"] = type_column
         return data
     
 
@@ -276,13 +886,145 @@ class ReaderData:
         return (name_list[0:index_spe_name_unit], name_list[index_spe_name_unit:len(name_list)])
 
 
-    def __read_xlsx(self, filename: str, engine: str = 'pandas') -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+    def __read_npz(self, filename: str) -> ColumnarData:
+        """ Read a NPZ file written by ExportData : the array of each column is given to the ColumnarData without conversion.
+            The strings are transformed to Python strings, like in a column read from a CSV file.
+            If the name and the unit of a column are not in the file (stats), they are found from the column
+
+        Args:
+            filename (str): Path to file
+
+        Raises:
+            ValueError: The file was not written by ExportData
+
+        Returns:
+            ColumnarData: Data of the file
+        """
+        data = ColumnarData()
+        with numpy.load(filename, allow_pickle=False) as npz:
+            if "metadata" not in npz.files:
+                raise ValueError(f"Le fichier '{os.path.basename(filename)}' n'a pas été exporté par GESAnalysis")
+            metadata = json.loads(npz["metadata"].tobytes().decode("utf-8"))
+            
+            for index, meta_column in enumerate(metadata["columns"]):
+                column = meta_column["column"]
+                n, u = meta_column["name"], meta_column["unit"]
+                if n is None or u is None:
+                    n, u = self.__parser_name_unit(column)
+                
+                values = npz[f"values_{index}"]
+                if meta_column["json"]:
+                    values = json.loads(values.tobytes().decode("utf-8"))
+                elif values.dtype.kind == 'U':
+                    values = values.astype(object)
+                offsets = npz[f"offsets_{index}"] if meta_column["offsets"] else None
+                data.add_column(column, n, u, self.__npz_types.get(meta_column["type"], str), values, offsets)
+        return data
+    
+    
+    def __iter_chunks_npz(
+        self,
+        filename: str,
+        chunk_rows: int,
+        columnar: bool = False
+    ) -> Iterator[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]:
+        """ Read a NPZ file by blocks of 'chunk_rows' rows. The arrays are read at once (they are compact),
+            then each block is a view of the arrays
+
+        Args:
+            filename (str): Path to file
+            chunk_rows (int): Maximum number of rows in a block
+            columnar (bool, optional): Give each block in a ColumnarData instead of a dictionary. Defaults to False
+
+        Returns:
+            Iterator[dict | ColumnarData]: Blocks of data
+        """
+        data = self.__read_npz(filename)
+        nb_rows = len(next(iter(data.values()))["data"]) if len(data) > 0 else 0
+        for start in range(0, nb_rows, chunk_rows):
+            chunk = data.get_rows(start, min(start + chunk_rows, nb_rows))
+            yield chunk if columnar else self.__columnar_to_dict(chunk)
+    
+    
+    def __columnar_to_dict(self, data: ColumnarData) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+        """ Transform a ColumnarData to the dictionary of data.
+            Like for the other files, a column without rows has no type.
+            The garbage collector is paused during the creation of the rows (see __gc_paused)
+
+        Args:
+            data (ColumnarData): Data
+
+        Returns:
+            dict: Dictionary with the data
+        """
+        with self.__gc_paused():
+            data_dict = data.to_dict()
+        for data_column in data_dict.values():
+            if len(data_column["data"]) == 0:
+                del data_column["type"]
+        return data_dict
+    
+    
+    def __iter_chunks_xlsx(
+        self,
+        filename: str,
+        chunk_rows: int,
+        engine: str = 'pandas',
+        columnar: bool = False,
+        sheet: Union[str, int, None] = None
+    ) -> Iterator[Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData]]:
+        """ Read a XLSX file by blocks of 'chunk_rows' rows.
+            With openpyxl, the rows are read one by one in the read-only mode.
+            With pandas, the whole sheet is read and then cut into blocks
+
+        Args:
+            filename (str): Path to file
+            chunk_rows (int): Maximum number of rows in a block
+            engine (str, optional): Reading engine ('pandas', 'openpyxl'). Defaults to 'pandas'
+            columnar (bool, optional): Give each block in a ColumnarData instead of a dictionary. Defaults to False
+            sheet (str | int, optional): Name or index of the sheet. Defaults to None
+
+        Returns:
+            Iterator[dict | ColumnarData]: Blocks of data
+        """
+        if engine == 'openpyxl':
+            rows_iter = self.__iter_rows_openpyxl(filename, sheet)
+            name_column = next(rows_iter)
+            types = None
+            while True:
+                rows = list(itertools.islice(rows_iter, chunk_rows))
+                if len(rows) == 0:
+                    return
+                # The type of a column is given by his 1st value in the file
+                if types is None:
+                    types = [type(val) for val in rows[0]]
+                chunk = self.__build_data_xlsx(name_column, rows, types)
+                yield ColumnarData.from_dict(chunk) if columnar else chunk
+        
+        data = self.__read_xlsx(filename, engine, sheet)
+        nb_rows = max((len(data_column["data"]) for data_column in data.values()), default=0)
+        for start in range(0, nb_rows, chunk_rows):
+            chunk = {}
+            for column, data_column in data.items():
+                chunk[column] = dict(data_column, data=data_column["data"][start:start+chunk_rows])
+            yield ColumnarData.from_dict(chunk) if columnar else chunk
+    
+    
+    def __read_xlsx(
+        self,
+        filename: str,
+        engine: str = 'pandas',
+        sheet: Union[str, int, None] = None,
+        report: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
         """ Read a XLSX file with the engine 'pandas' or 'openpyxl'
         Lecture d'un fichier excel avec comme moteur pandas ou openpyxl
 
         Args:
             filename (str): Path to file
             engine (str, optional): Reading engine ('pandas', 'openpyxl'). Defaults to 'pandas'.
+            sheet (str | int, optional): Name or index of the sheet. Defaults to None.
+            report (Callable[[int, int], None], optional): Function called with the number of rows read. Defaults to None.
 
         Raises:
             ValueError: A reading engine different from 'pandas' and 'openpyxl'
@@ -293,23 +1035,35 @@ class ReaderData:
         match engine:
             case 'pandas':
                 try:
-                    return self.__read_xlsx_pandas(filename)
+                    return self.__read_xlsx_pandas(filename, sheet, report)
+                except CancelledError:
+                    raise
                 except:
-                    return self.__read_xlsx_openpyxl(filename)
+                    return self.__read_xlsx_openpyxl(filename, sheet, report)
             case 'openpyxl':
                 try:
-                    return self.__read_xlsx_openpyxl(filename)
+                    return self.__read_xlsx_openpyxl(filename, sheet, report)
+                except CancelledError:
+                    raise
                 except:
-                    return self.__read_xlsx_pandas(filename)
+                    return self.__read_xlsx_pandas(filename, sheet, report)
             case _:
                 raise ValueError(f"'{engine}' n'est pas un moteur de lecture. Utilisez 'pandas' ou 'openpyxl'")
             
        
-    def __read_xlsx_pandas(self, filename: str) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
-        """ Read a XLSX file with pandas
+    def __read_xlsx_pandas(
+        self,
+        filename: str,
+        sheet: Union[str, int, None] = None,
+        report: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+        """ Read a XLSX file with pandas.
+            read_excel() can't be interrupted : the progress is reported before and after it
 
         Args:
             filename (str): Path to file
+            sheet (str | int, optional): Name or index of the sheet. Defaults to None (1st sheet).
+            report (Callable[[int, int], None], optional): Function called with the number of rows read. Defaults to None.
 
         Raises:
             IOError: A problem occur with read_excel() of pandas
@@ -320,17 +1074,31 @@ class ReaderData:
         try:
             import pandas
             # Read the file
-            data = pandas.read_excel(filename)
-            return self.__transform_data_pandas(data.to_dict('split'))       
+            if report is not None:
+                report(0, 0)
+            data = pandas.read_excel(filename, sheet_name=0 if sheet is None else sheet)
+            if report is not None:
+                report(len(data), len(data))
+            with self.__gc_paused():
+                return self.__transform_data_pandas(data)
+        except CancelledError:
+            raise
         except:
             raise IOError("Problème rencontré. Lecture impossible avec 'pandas'. Essayez avec 'openpyxl'")
     
     
-    def __read_xlsx_openpyxl(self, filename: str) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+    def __read_xlsx_openpyxl(
+        self,
+        filename: str,
+        sheet: Union[str, int, None] = None,
+        report: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
         """ Read a XLSX file with openpyxl
 
         Args:
             filename (str): Path to file
+            sheet (str | int, optional): Name or index of the sheet. Defaults to None (active sheet).
+            report (Callable[[int, int], None], optional): Function called with the number of rows read. Defaults to None.
 
         Raises:
             IOError: A problem occur with the functions used with openpyxl
@@ -339,73 +1107,160 @@ class ReaderData:
             dict: Dictionary with the data of the file if the reading is correct
         """
         try:
-            import openpyxl
-            # Open the file and activate the sheet
-            wb = openpyxl.load_workbook(filename=filename)
-            sheet = wb.active
-            
-            # Get the number of rows and columns
-            nb_columns = sheet.max_column
-            nb_rows = sheet.max_row
-            
-            data = {}
-            name_column = []
+            rows_iter = self.__iter_rows_openpyxl(filename, sheet, report)
             # Read the 1st line to get the name of columns
-            for col in range(1, nb_columns+1):
-                # Get the value in the cell of row 1 and column col
-                cell = sheet.cell(row=1, column=col)
-                data[str(cell.value)] = {}
-                n, u = self.__parser_name_unit(str(cell.value))
-                data[str(cell.value)]["name"] = n
-                data[str(cell.value)]["unit"] = u
-                data[str(cell.value)]["data"] = []
-                name_column.append(str(cell.value))
-                
+            name_column = next(rows_iter)
             # Read data
-            for row in range(2, nb_rows+1):
-                # Get the value in the cell of row row and column col
-                for col in range(1, nb_columns+1):
-                    cell = sheet.cell(row=row, column=col)
-                    if row == 2:
-                        data[name_column[col-1]]["type"] = type(cell.value)
-                    data[name_column[col-1]]["data"].append([cell.value])
-            return data
+            rows = list(rows_iter)
+            if report is not None:
+                report(len(rows), len(rows))
+            
+            # The type of a column is given by his 1st value
+            types = [type(val) for val in rows[0]] if len(rows) > 0 else None
+            return self.__build_data_xlsx(name_column, rows, types)
+        except CancelledError:
+            raise
         except:
             raise IOError("Problème rencontré. Lecture impossible avec 'openpyxl'. Essayez avec 'pandas'")
+    
+    
+    def __iter_rows_openpyxl(
+        self,
+        filename: str,
+        sheet: Union[str, int, None] = None,
+        report: Optional[Callable[[int, int], None]] = None
+    ) -> Iterator[Union[List[str], Tuple[Any, ...]]]:
+        """ Read the rows of a XLSX file with openpyxl in the read-only mode.
+            The cells are read row by row without loading the whole workbook.
+            The 1st value given is the list of the column names, then the values of each row
+
+        Args:
+            filename (str): Path to file
+            sheet (str | int, optional): Name or index of the sheet. Defaults to None (active sheet).
+            report (Callable[[int, int], None], optional): Function called with the number of rows read,
+            every 'progress_step_rows' rows. Defaults to None.
+
+        Returns:
+            Iterator[list | tuple]: Name of the columns, then the values of each row
+        """
+        import openpyxl
+        # Open the file and activate the sheet
+        wb = openpyxl.load_workbook(filename=filename, read_only=True, data_only=True)
+        try:
+            if sheet is None:
+                ws = wb.active
+            elif isinstance(sheet, int):
+                ws = wb.worksheets[sheet]
+            else:
+                ws = wb[sheet]
+            
+            rows_iter = ws.iter_rows(values_only=True)
+            header = next(rows_iter, (None,))
+            nb_columns = len(header)
+            yield [str(val) for val in header]
+            
+            # The number of rows is given by the dimension of the sheet, if the file has it
+            total = max(ws.max_row - 1, 0) if report is not None and ws.max_row is not None else 0
+            
+            # The rows can have less cells than the header when the last cells are empty
+            for nb_rows, row in enumerate(rows_iter):
+                if report is not None and nb_rows % self.progress_step_rows == 0:
+                    report(nb_rows, total)
+                if len(row) != nb_columns:
+                    row = (tuple(row) + (None,) * nb_columns)[:nb_columns]
+                yield row
+        finally:
+            wb.close()
+    
+    
+    def __build_data_xlsx(self, name_column: List[str], rows: List[Tuple[Any, ...]], types: Optional[List[type]]) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+        """ Create the dictionary of data from the rows of a XLSX file
+
+        Args:
+            name_column (List[str]): Name of the columns
+            rows (List[Tuple[Any, ...]]): Values of each row
+            types (List[type], optional): Type of each column. None if there are no rows
+
+        Returns:
+            dict: Dictionary with the data
+        """
+        values_columns = list(zip(*rows)) if len(rows) > 0 else [()] * len(name_column)
+        data = {}
+        for i, column in enumerate(name_column):
+            n, u = self.__parser_name_unit(column)
+            data[column] = {
+                "name": n,
+                "unit": u,
+                "data": [[val] for val in values_columns[i]]
+            }
+            if types is not None:
+                data[column]["type"] = types[i]
+        return data
         
         
-    def __transform_data_pandas(self, data: Dict[str, List[Union[str, bool, int, float]]]) -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
-        """ Transorm a dictionary from pandas to our corresponding dictionary
-        Pandas dictionary:
-        {
-            'index': [rows name],
-            'columns: [columns name],
-            'data': [list of elements for each row]
-        }
+    def __transform_data_pandas(self, data: "pandas.DataFrame") -> Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]]:
+        """ Transform a DataFrame of pandas to our corresponding dictionary.
+            Each column is converted at once from his array
 
         Args:
-            data (dict): Pandas dictionary
+            data (pandas.DataFrame): Data read by pandas
 
         Returns:
             dict: Dictionary with the corresponding format
         """
-        columns = data['columns']
-        values_columns = data['data']
         data_transform = {}
-        for c in range(len(columns)):
-            data_transform[str(columns[c])] = {}
-            n, u = self.__parser_name_unit(str(columns[c]))
-            data_transform[str(columns[c])]["name"] = n
-            data_transform[str(columns[c])]["unit"] = u
-            data_transform[str(columns[c])]["data"] = []
-            for l in range(len(values_columns)):
-                val = values_columns[l][c]
-                # Add type if it's the first value
-                if l == 0:
-                    data_transform[str(columns[c])]['type'] = type(val)
-                data_transform[str(columns[c])]["data"].append([val])
+        for c in range(data.shape[1]):
+            column = str(data.columns[c])
+            values, type_column = self.__convert_series(data.iloc[:, c])
+            
+            n, u = self.__parser_name_unit(column)
+            data_transform[column] = {
+                "name": n,
+                "unit": u,
+                "data": [[val] for val in values]
+            }
+            # Add type if there is at least one value
+            if len(values) > 0:
+                data_transform[column]["type"] = type_column
                 
         return data_transform
+    
+    
+    def __convert_series(self, series: "pandas.Series") -> Tuple[List[Any], type]:
+        """ Convert a column of pandas to a list of Python values and search the type of the whole column.
+            The missing values (NaN, NaT) are kept and are not used to search the type.
+            If there are int and float in a column, the type is float and the int are converted
+
+        Args:
+            series (pandas.Series): Column
+
+        Returns:
+            tuple: Values of the column and his type
+        """
+        from pandas.api import types as ptypes
+        
+        # Columns with a NumPy type : the type is known without reading the values
+        if ptypes.is_float_dtype(series.dtype):
+            return series.tolist(), float
+        if not series.hasnans:
+            if ptypes.is_bool_dtype(series.dtype):
+                return series.tolist(), bool
+            if ptypes.is_integer_dtype(series.dtype):
+                return series.tolist(), int
+        
+        # Column of objects : search the types of the values who are not missing
+        values = series.tolist()
+        missing = series.isna().tolist()
+        types = {type(val) for val, is_missing in zip(values, missing) if not is_missing}
+        
+        if len(types) == 0:
+            return values, float
+        if len(types) == 1:
+            return values, types.pop()
+        if types == {int, float}:
+            return [float(val) if type(val) is int else val for val in values], float
+        # Different types : keep the type of the 1st value
+        return values, next(type(val) for val, is_missing in zip(values, missing) if not is_missing)
 
 
     def __type_to_str(self, type: type) -> str:
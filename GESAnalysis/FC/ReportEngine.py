@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import os
+import multiprocessing
+import numpy
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple, Union
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from GESAnalysis.FC.GESAnalysis import GESAnalysis
+from GESAnalysis.FC.MissionCube import MissionCube
+from GESAnalysis.FC.NacresRollup import NacresRollup
+from GESAnalysis.UI.categories.achats.AchatsData import AchatsData
+from GESAnalysis.UI.categories.missions.MissionsData import MissionsData
+from GESAnalysis.UI.categories.total.TotalData import TotalData
+import GESAnalysis.UI.categories.common as common
+
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11
+    import tomli as tomllib
+
+
+class ReportEngine:
+    """ Produce the stats and the graphs of labs without the interface (no Qt).
+        A job is described in a TOML file :
+
+            output = "rapports"          # Folder of the reports (a sub-folder for each lab)
+            workers = 4                  # Optional : number of processes
+
+            [[lab]]
+            name = "Labo A"
+            output = "labo_a"            # Optional : folder of the lab. Defaults to output/name
+
+            [[lab.files]]
+            path = "missions_2019.csv"
+            year = 2019
+            category = "Missions"        # Missions, Achats or Total
+            sep = ";"                    # Optional
+
+        The paths are relative to the folder of the TOML file. Each lab is computed in a process :
+        the files are read with GESAnalysis, the data of the categories are computed like in the interface
+        (MissionsData, AchatsData, TotalData), the stats are written by ExportData.export_stat
+        and the graphs are drawn with the backend Agg of matplotlib
+    """
+
+    # Categories with a report
+    categories = ["Missions", "Achats", "Total"]
+
+    # Measures of the cube of missions with a table of stats (like in MissionStatWidget)
+    measures_missions = ["mission", "distance", "emission", "emission_contrails"]
+
+    # Number of NACRES families in the graph of Achats, the others are grouped (see NacresRollup)
+    nb_top_achats = 10
+
+    # Format of the graphs
+    figure_format = "png"
+
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        """ Initialise the class
+
+        Args:
+            workers (int, optional): Maximum number of processes. Defaults to None (value of the job or number of processors).
+        """
+        self.__workers = workers
+
+
+#######################################################################################################
+#  Job                                                                                                #
+#######################################################################################################
+    def load_config(self, filename: str) -> Dict[str, Any]:
+        """ Read and check the TOML file of a job.
+            The paths of the files and of the folders are made absolute from the folder of the TOML file
+
+        Args:
+            filename (str): Path to the TOML file
+
+        Raises:
+            FileNotFoundError: The file doesn't exist
+            ValueError: The file is not a valid TOML or a key is missing / incorrect
+
+        Returns:
+            Dict[str, Any]: Job with the keys "output", "workers" and "lab" (name, output and files of each lab)
+        """
+        if not os.path.isfile(filename):
+            raise FileNotFoundError(f"Le fichier '{filename}' n'existe pas")
+
+        try:
+            with open(filename, "rb") as file:
+                config = tomllib.load(file)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Le fichier '{filename}' n'est pas un fichier TOML valide : {e}")
+
+        directory = os.path.dirname(os.path.abspath(filename))
+        output = self.__get_path(directory, config.get("output", "."))
+
+        workers = config.get("workers")
+        if workers is not None and (not isinstance(workers, int) or isinstance(workers, bool) or workers < 1):
+            raise ValueError(f"'workers' doit être un entier positif au lieu de '{workers}'")
+
+        labs = config.get("lab")
+        if not isinstance(labs, list) or len(labs) == 0:
+            raise ValueError(f"Le fichier '{filename}' ne contient aucun laboratoire ([[lab]])")
+
+        job_labs = []
+        names = set()
+        for lab_ind, lab in enumerate(labs):
+            name = lab.get("name")
+            if not isinstance(name, str) or name == "":
+                raise ValueError(f"Le laboratoire n°{lab_ind+1} n'a pas de nom")
+            if name in names:
+                raise ValueError(f"Le laboratoire '{name}' est présent plusieurs fois")
+            names.add(name)
+
+            files = lab.get("files")
+            if not isinstance(files, list) or len(files) == 0:
+                raise ValueError(f"Le laboratoire '{name}' n'a aucun fichier ([[lab.files]])")
+
+            job_files = []
+            for file_ind, file in enumerate(files):
+                for key in ["path", "year", "category"]:
+                    if key not in file:
+                        raise ValueError(f"Le fichier n°{file_ind+1} du laboratoire '{name}' n'a pas de clé '{key}'")
+                if file["category"] not in self.categories:
+                    raise ValueError(f"La catégorie '{file['category']}' du laboratoire '{name}' n'est pas une catégorie parmi : {', '.join(self.categories)}")
+                job_files.append({
+                    "path": self.__get_path(directory, str(file["path"])),
+                    "year": str(file["year"]),
+                    "category": file["category"],
+                    "sep": file.get("sep")
+                })
+
+            job_labs.append({
+                "name": name,
+                "output": self.__get_path(output, lab.get("output", name)),
+                "files": job_files
+            })
+
+        return {"output": output, "workers": workers, "lab": job_labs}
+
+
+    def __get_path(self, directory: str, path: str) -> str:
+        """ Get the absolute path of 'path', relative to 'directory'
+
+        Args:
+            directory (str): Folder
+            path (str): Path (absolute or relative)
+
+        Returns:
+            str: Absolute path
+        """
+        return os.path.normpath(os.path.join(directory, os.path.expanduser(path)))
+
+
+    def run(self, filename: str) -> Dict[str, Dict[str, Any]]:
+        """ Execute the job of the TOML file 'filename'.
+            The labs are computed in a pool of processes (one lab per process at a time).
+            An error in a lab doesn't stop the other labs
+
+        Args:
+            filename (str): Path to the TOML file
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each lab, the files written ("files"), the warnings of the files ("warning")
+                                       and the error who stopped the report ("error", None if there is no error)
+        """
+        config = self.load_config(filename)
+        labs = config["lab"]
+
+        max_workers = self.__workers if self.__workers is not None else config["workers"]
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(labs))
+
+        executor = None
+        if max_workers > 1:
+            try:
+                # 'spawn' : a 'fork' would copy the threads of the caller and their locks
+                executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError):
+                executor = None
+
+        results = None
+        if executor is not None:
+            with executor:
+                try:
+                    results = list(executor.map(self.report_lab, labs))
+                except BrokenProcessPool:
+                    results = None
+
+        if results is None:
+            results = [self.report_lab(lab) for lab in labs]
+
+        return {lab["name"]: result for lab, result in zip(labs, results)}
+
+
+#######################################################################################################
+#  Report of a lab                                                                                    #
+#######################################################################################################
+    def report_lab(self, lab: Dict[str, Any]) -> Dict[str, Any]:
+        """ Make the report of a lab (see __make_report). The error who stops the report is kept instead of being raised
+
+        Args:
+            lab (Dict[str, Any]): Name, output and files of the lab (see load_config)
+
+        Returns:
+            Dict[str, Any]: Files written ("files"), warnings of the files ("warning") and error ("error", None if there is no error)
+        """
+        try:
+            report = self.__make_report(lab)
+            report["error"] = None
+        except Exception as e:
+            report = {"files": [], "warning": [], "error": str(e)}
+        return report
+
+
+    def __make_report(self, lab: Dict[str, Any]) -> Dict[str, List[str]]:
+        """ Read the files of a lab, then write the stats and the graphs of each category in the folder of the lab
+
+        Args:
+            lab (Dict[str, Any]): Name, output and files of the lab (see load_config)
+
+        Returns:
+            Dict[str, List[str]]: Files written ("files") and warnings of the files of the lab ("warning")
+        """
+        model = GESAnalysis(columnar=True)
+        for file in lab["files"]:
+            model.read_file(file["path"], file["year"], file["category"], file["sep"])
+
+        os.makedirs(lab["output"], exist_ok=True)
+        report = {"files": [], "warning": []}
+
+        files_missions = common.get_files_category(model, "Missions")
+        if len(files_missions) > 0:
+            data_missions = MissionsData().configure(files_missions)
+            self.__add_warning(report, data_missions["files"])
+            report["files"] += self.__report_missions(model, data_missions, lab["output"])
+
+        files_achats = common.get_files_category(model, "Achats")
+        if len(files_achats) > 0:
+            data_achats = AchatsData().configure(files_achats)
+            self.__add_warning(report, data_achats["files"])
+            report["files"] += self.__report_achats(model, data_achats, lab["output"])
+
+        files_total = common.get_files_category(model, "Total")
+        if len(files_total) > 0:
+            data_total = TotalData().configure(files_total)
+            self.__add_warning(report, data_total["files"])
+            report["files"] += self.__report_total(model, data_total, lab["output"])
+
+        return report
+
+
+    def __add_warning(self, report: Dict[str, List[str]], files: Dict[str, dict]) -> None:
+        """ Add the warnings of the files of a category to the report
+
+        Args:
+            report (Dict[str, List[str]]): Report of the lab
+            files (Dict[str, dict]): Files of the category with their warnings (see MissionsData.configure)
+        """
+        for file, data_file in files.items():
+            for warning in data_file["warning"]:
+                report["warning"].append(f"{file} : {warning}")
+
+
+    def __report_missions(self, model: GESAnalysis, data_missions: Dict[str, dict], output: str) -> List[str]:
+        """ Write the stats of each measure and year, and the graphs of the distance and of the emission
+
+        Args:
+            model (GESAnalysis): Model with the files of the lab
+            data_missions (Dict[str, dict]): Data of the category (see MissionsData.configure)
+            output (str): Folder of the lab
+
+        Returns:
+            List[str]: Files written
+        """
+        cube = data_missions["data"]["data"]
+        files = []
+        for year in cube.get_years():
+            for measure in self.measures_missions:
+                data, header_columns, header_rows = self.get_stat_missions(cube, measure, year)
+                if len(data) == 0:
+                    continue
+                fileout = os.path.join(output, f"missions_{measure}_{year}.csv")
+                model.export_stat(data, header_columns, header_rows, fileout)
+                files.append(fileout)
+
+        if len(cube.get_years()) == 0:
+            return files
+
+        units = {
+            "distance": f"Distance ({data_missions['data']['unit_distance']})",
+            "emission": f"Nombre d'émissions ({data_missions['data']['unit_emission']})"
+        }
+        for measure, label_y in units.items():
+            fileout = os.path.join(output, f"missions_{measure}.{self.figure_format}")
+            self.__draw_missions(cube, measure, label_y, fileout)
+            files.append(fileout)
+        return files
+
+
+    def __report_achats(self, model: GESAnalysis, data_achats: Dict[str, dict], output: str) -> List[str]:
+        """ Write the stats of each year and the graph of the amount of the NACRES families
+
+        Args:
+            model (GESAnalysis): Model with the files of the lab
+            data_achats (Dict[str, dict]): Data of the category (see AchatsData.configure)
+            output (str): Folder of the lab
+
+        Returns:
+            List[str]: Files written
+        """
+        data_year = data_achats["data"]["data"]
+        files = []
+        for year in data_achats["years_ind"].keys():
+            data, header_columns, header_rows = self.get_stat_achats(data_year[year])
+            fileout = os.path.join(output, f"achats_{year}.csv")
+            model.export_stat(data, header_columns, header_rows, fileout)
+            files.append(fileout)
+
+        if len(data_achats["years_ind"]) == 0:
+            return files
+
+        # Amount of each NACRES family (level 0) for each year
+        sums = {}
+        for year in data_achats["years_ind"].keys():
+            rollup = NacresRollup({key: data_key["amount"] for key, data_key in data_year[year].items()})
+            sums[year] = rollup.get_sums(0)
+        labels = self.__get_top_labels(sums, self.nb_top_achats)
+
+        values = {}
+        for year, sums_year in sums.items():
+            values[year] = [sums_year.get(label, 0) for label in labels]
+            if len(labels) > 0 and labels[-1] == NacresRollup.other_label:
+                values[year][-1] = sum(sums_year.values()) - sum(values[year][:-1])
+
+        fileout = os.path.join(output, f"achats.{self.figure_format}")
+        self.__draw_bars(labels, values, f"Montant ({data_achats['data']['unit']})", fileout)
+        files.append(fileout)
+        return files
+
+
+    def __report_total(self, model: GESAnalysis, data_total: Dict[str, dict], output: str) -> List[str]:
+        """ Write the stats of each year and the graph of the carbon footprint of the categories
+
+        Args:
+            model (GESAnalysis): Model with the files of the lab
+            data_total (Dict[str, dict]): Data of the category (see TotalData.configure)
+            output (str): Folder of the lab
+
+        Returns:
+            List[str]: Files written
+        """
+        files = []
+        for year in data_total["years_ind"].keys():
+            data, header_columns, header_rows = self.get_stat_total(data_total["data"]["data"], data_total["years_ind"][year]["index"])
+            if len(data) == 0:
+                continue
+            fileout = os.path.join(output, f"total_{year}.csv")
+            model.export_stat(data, header_columns, header_rows, fileout)
+            files.append(fileout)
+
+        if len(data_total["years_ind"]) == 0:
+            return files
+
+        values = {}
+        for year, year_ind in data_total["years_ind"].items():
+            values[year] = [data_name["data"][year_ind["index"]] for data_name in data_total["data"]["data"].values()]
+
+        fileout = os.path.join(output, f"total.{self.figure_format}")
+        self.__draw_bars(list(data_total["name_ind"].keys()), values, f"Empreinte carbonne ({data_total['data']['unit']})", fileout)
+        files.append(fileout)
+        return files
+
+
+#######################################################################################################
+#  Tables of stats (same values as the tables of the interface)                                       #
+#######################################################################################################
+    @staticmethod
+    def get_stat_missions(cube: MissionCube, measure: str, year: str) -> Tuple[List[List[str]], List[str], List[str]]:
+        """ Table of a measure of the missions for a year : modes x positions, with the totals (see MissionStatWidget)
+
+        Args:
+            cube (MissionCube): Cube of the missions
+            measure (str): Measure (mission, distance, emission or emission_contrails)
+            year (str): Year
+
+        Returns:
+            Tuple[List[List[str]], List[str], List[str]]: Stats, header of the columns and header of the rows
+        """
+        if len(cube.get_modes()) == 0:
+            return [], [], []
+
+        header_rows = cube.get_modes() + ["total"]
+        header_columns = cube.get_positions() + ["total"]
+
+        table = cube.get_layer(measure)[:, :, cube.get_index_year(year)]
+        total_mode = table.sum(axis=1)
+        total_position = table.sum(axis=0)
+
+        data = []
+        for mode_ind, data_mode in enumerate(table.tolist()):
+            data.append([str(value) for value in data_mode] + [str(total_mode[mode_ind].item())])
+
+        data_all_mode = total_mode.sum()
+        data_all_position = total_position.sum()
+        data.append(
+            [str(value) for value in total_position.tolist()] +
+            ["ERROR" if data_all_position != data_all_mode else str(data_all_mode.item())]
+        )
+        return data, header_columns, header_rows
+
+
+    @staticmethod
+    def get_stat_achats(data_year: Dict[str, Dict[str, Any]]) -> Tuple[List[List[str]], List[str], List[str]]:
+        """ Table of the amount of each NACRES key of a year, with the total (see AchatsStatWidget)
+
+        Args:
+            data_year (Dict[str, Dict[str, Any]]): Amount, count and description of each NACRES key of the year (see AchatsData.configure)
+
+        Returns:
+            Tuple[List[List[str]], List[str], List[str]]: Stats, header of the columns and header of the rows
+        """
+        header_rows = []
+        data = []
+        total = 0
+        for nacres_key, data_key in data_year.items():
+            header_rows.append(nacres_key)
+            data.append([str(round(data_key["amount"], 2))])
+            total += data_key["amount"]
+
+        header_rows.append("total")
+        data.append([str(round(total, 2))])
+        return data, ["Montant"], header_rows
+
+
+    @staticmethod
+    def get_stat_total(data_total: Dict[str, Dict[str, List[Union[int, float]]]], index_year: int) -> Tuple[List[List[str]], List[str], List[str]]:
+        """ Table of the carbon footprint of each category of a year, with the total (see TotalStatWidget)
+
+        Args:
+            data_total (Dict[str, Dict[str, List[Union[int, float]]]]): Carbon footprint of each category for each year (see TotalData.configure)
+            index_year (int): Index of the year
+
+        Returns:
+            Tuple[List[List[str]], List[str], List[str]]: Stats, header of the columns and header of the rows
+        """
+        if len(data_total) == 0:
+            return [], [], []
+
+        header_rows = list(data_total.keys()) + ["total"]
+        data = []
+        total = 0
+        for name in data_total.keys():
+            value = data_total[name]["data"][index_year]
+            data.append([str(value)])
+            total += value
+        data.append([str(total)])
+        return data, ["Empreinte carbone"], header_rows
+
+
+#######################################################################################################
+#  Graphs                                                                                             #
+#######################################################################################################
+    def __new_figure(self) -> Tuple[Figure, Any]:
+        """ Create a figure drawn by the backend Agg (no pyplot, no window)
+
+        Returns:
+            Tuple[Figure, Any]: Figure and axes
+        """
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        return fig, fig.add_subplot()
+
+
+    def __save_figure(self, fig: Figure, fileout: str) -> None:
+        """ Save the figure in the file fileout
+
+        Args:
+            fig (Figure): Figure
+            fileout (str): Path to the image
+        """
+        fig.tight_layout()
+        fig.savefig(fileout, format=self.figure_format)
+
+
+    def __draw_missions(self, cube: MissionCube, measure: str, label_y: str, fileout: str) -> None:
+        """ Draw a bar for each mode and year, stacked by position (like DistanceMode and EmissionMode)
+
+        Args:
+            cube (MissionCube): Cube of the missions
+            measure (str): Measure (distance or emission)
+            label_y (str): Label of the y-axis
+            fileout (str): Path to the image
+        """
+        fig, axes = self.__new_figure()
+        layer = cube.get_layer(measure)
+        years = cube.get_years()
+        nb_years = len(years)
+        width = 0.8 / max(nb_years, 1)
+
+        # The modes are on the x-axis, each year of a mode has a bar
+        x_modes = numpy.arange(len(cube.get_modes()))
+        bottom = numpy.zeros((len(cube.get_modes()), nb_years))
+        colors = {}
+        for position_ind, position in enumerate(cube.get_positions()):
+            values = layer[:, position_ind, :]
+            if not values.any():
+                continue
+            for year_ind in range(nb_years):
+                x = x_modes + (year_ind - (nb_years - 1) / 2) * width
+                bars = axes.bar(
+                    x, values[:, year_ind], width, bottom=bottom[:, year_ind],
+                    color=colors.get(position), label=None if position in colors else position,
+                    linewidth=0.5, edgecolor='black'
+                )
+                colors.setdefault(position, bars.patches[0].get_facecolor())
+            bottom += values
+
+        # Year above each bar
+        for year_ind, year in enumerate(years):
+            x = x_modes + (year_ind - (nb_years - 1) / 2) * width
+            for mode_ind in range(len(x_modes)):
+                if bottom[mode_ind, year_ind] != 0:
+                    axes.text(x[mode_ind], bottom[mode_ind, year_ind], year, ha='center', va='bottom', fontsize=8)
+
+        axes.set_xticks(x_modes, cube.get_modes())
+        axes.set_ylabel(label_y)
+        if len(colors) > 0:
+            axes.legend()
+        self.__save_figure(fig, fileout)
+
+
+    def __draw_bars(self, labels: List[str], values: Dict[str, List[Union[int, float]]], label_y: str, fileout: str) -> None:
+        """ Draw a bar for each label and year
+
+        Args:
+            labels (List[str]): Labels on the x-axis
+            values (Dict[str, List[Union[int, float]]]): Value of each label, for each year
+            label_y (str): Label of the y-axis
+            fileout (str): Path to the image
+        """
+        fig, axes = self.__new_figure()
+        nb_years = len(values)
+        width = 0.8 / max(nb_years, 1)
+        x_labels = numpy.arange(len(labels))
+        for year_ind, (year, values_year) in enumerate(values.items()):
+            axes.bar(x_labels + (year_ind - (nb_years - 1) / 2) * width, values_year, width, label=year, linewidth=0.5, edgecolor='black')
+
+        axes.set_xticks(x_labels, labels)
+        axes.set_ylabel(label_y)
+        if nb_years > 0 and len(labels) > 0:
+            axes.legend()
+        self.__save_figure(fig, fileout)
+
+
+    def __get_top_labels(self, sums: Dict[str, Dict[str, Union[int, float]]], nb_top: int) -> List[str]:
+        """ Get the labels with the highest sum over all the years, and NacresRollup.other_label if some labels are not kept
+
+        Args:
+            sums (Dict[str, Dict[str, Union[int, float]]]): Sum of each label, for each year
+            nb_top (int): Number of labels
+
+        Returns:
+            List[str]: Labels
+        """
+        total = {}
+        for sums_year in sums.values():
+            for label, amount in sums_year.items():
+                total[label] = total.get(label, 0) + amount
+        if len(total) <= nb_top:
+            return list(total.keys())
+
+        labels = sorted(total.keys(), key=lambda label: total[label], reverse=True)
+        return labels[:nb_top] + [NacresRollup.other_label]
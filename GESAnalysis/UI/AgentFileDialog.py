@@ -93,7 +93,7 @@ class AgentFileDialog(QtWidgets.QDialog):
         self.selected_file = QtWidgets.QFileDialog().getOpenFileName(
             self,
             "Selectionner un fichier",
-            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt);;Excel (*.xlsx)"
+            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt);;Excel (*.xlsx);;NumPy (*.npz);;Compressés, archives (*.gz *.bz2 *.xz *.zst *.zip)"
         )[0]
         # If the user cancel the operation, no need to save into the variable
         if self.selected_file:
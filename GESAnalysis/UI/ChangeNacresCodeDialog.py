@@ -9,6 +9,7 @@
 from typing import Optional
 from PyQt5 import QtWidgets
 from GESAnalysis.UI import common
+from GESAnalysis.FC.NacresMatcher import NacresMatcher
 
 
 class ChangeNacresCodeDialog(QtWidgets.QDialog):
@@ -24,7 +25,8 @@ class ChangeNacresCodeDialog(QtWidgets.QDialog):
         """
         super(ChangeNacresCodeDialog, self).__init__(parent)
         
-        self.selected_code = None # NACRES code
+        self.selected_code = None    # NACRES code
+        self.selected_matcher = None # NACRES code compiled to filter the keys
         self.old_code = old_code
         
         self.__init_UI()
@@ -95,6 +97,9 @@ class ChangeNacresCodeDialog(QtWidgets.QDialog):
         # Remove '/'
         self.selected_code = self.selected_code.rstrip(self.selected_code[-1])
         
+        # Compile the code once, to filter the keys of the graph
+        self.selected_matcher = NacresMatcher(self.selected_code.split(';'))
+        
         # The lexical and semantic analysis are correct, so we can close this dialog
         super().accept()
         
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+from PyQt5 import QtCore
+from typing import Any, Dict, List, Union
+from GESAnalysis.FC.ColumnarData import ColumnarData
+
+
+class DataTableModel(QtCore.QAbstractTableModel):
+    """ Table model on the data of a file (dictionary of ReaderData or ColumnarData).
+        The cells are not copied : a cell is transformed to a string only when the view displays it
+    """
+
+    def __init__(
+        self,
+        data_file: Union[Dict[str, Dict[str, List[Union[List[Union[int, float, bool, str]], str]]]], ColumnarData],
+        parent: QtCore.QObject | None = None
+    ) -> None:
+        """ Initialise the model
+
+        Args:
+            data_file (dict | ColumnarData): Data of the file
+            parent (QtCore.QObject | None, optional): Parent of this model. Defaults to None.
+        """
+        super(DataTableModel, self).__init__(parent)
+
+        self.__data_file = data_file
+        self.__columns = list(data_file.keys())
+        self.__nb_rows = len(data_file[self.__columns[0]]["data"]) if len(self.__columns) > 0 else 0
+
+
+#######################################################################################################
+#  Methods of QAbstractTableModel                                                                     #
+#######################################################################################################
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """ Number of rows of the file
+
+        Args:
+            parent (QtCore.QModelIndex, optional): Parent (the table has no children). Defaults to QtCore.QModelIndex().
+
+        Returns:
+            int: Number of rows
+        """
+        if parent.isValid():
+            return 0
+        return self.__nb_rows
+
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """ Number of columns of the file
+
+        Args:
+            parent (QtCore.QModelIndex, optional): Parent (the table has no children). Defaults to QtCore.QModelIndex().
+
+        Returns:
+            int: Number of columns
+        """
+        if parent.isValid():
+            return 0
+        return len(self.__columns)
+
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        """ Get the string of a cell
+
+        Args:
+            index (QtCore.QModelIndex): Index of the cell
+            role (int, optional): Role of the data. Defaults to QtCore.Qt.DisplayRole.
+
+        Returns:
+            Any: String of the cell, None for the other roles
+        """
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+
+        data_column = self.__data_file[self.__columns[index.column()]]
+        return self.__transform_data_to_str(data_column["data"][index.row()], data_column.get("type"))
+
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole) -> Any:
+        """ Get the name of a column. The rows are numbered from 1
+
+        Args:
+            section (int): Index of the column or the row
+            orientation (QtCore.Qt.Orientation): Horizontal (columns) or vertical (rows)
+            role (int, optional): Role of the data. Defaults to QtCore.Qt.DisplayRole.
+
+        Returns:
+            Any: Name of the column or number of the row
+        """
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.__columns[section]
+        return super().headerData(section, orientation, role)
+
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        """ The user can select a cell but he can't change it
+
+        Args:
+            index (QtCore.QModelIndex): Index of the cell
+
+        Returns:
+            QtCore.Qt.ItemFlags: Flags of the cell
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
+
+
+#######################################################################################################
+#  Transform the data                                                                                 #
+#######################################################################################################
+    def __transform_data_to_str(self, data_list: List[Union[bool, int, float, str]], type_data: type) -> str:
+        """ Transform the elements in data_list to a string
+
+        Args:
+            data_list (List[Union[bool, int, float, str]]): List with elements
+            type_data (type): Type of these elements
+
+        Returns:
+            str: String where the elements are separated by ','
+        """
+        data_list_to_str = data_list
+        if not type_data == str:
+            # Transform all elements to string
+            data_list_to_str = map(str, data_list_to_str)
+        return ",".join(data_list_to_str)
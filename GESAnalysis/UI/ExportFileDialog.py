@@ -106,7 +106,7 @@ class ExportFileDialog(QtWidgets.QDialog):
         select_file = QtWidgets.QFileDialog().getOpenFileName(
             self,
             "Selectionner un fichier",
-            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt);;Excel (*.xlsx)"
+            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt);;Excel (*.xlsx);;NumPy (*.npz);;Compressés, archives (*.gz *.bz2 *.xz *.zst *.zip)"
         )[0]
         # If the user cancel the operation, no need to save into the variable
         if select_file:
@@ -120,7 +120,7 @@ class ExportFileDialog(QtWidgets.QDialog):
         select_file = QtWidgets.QFileDialog.getSaveFileName(
             self,
             "Selectionner un fichier",
-            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt)"
+            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt);;NumPy (*.npz);;Compressés (*.gz *.bz2 *.xz *.zst)"
         )[0]
         if select_file:
             self.__path_file_save = select_file
@@ -93,7 +93,7 @@ class ExportStatDialog(QtWidgets.QDialog):
         select_file = QtWidgets.QFileDialog().getSaveFileName(
             self,
             "Selectionner un fichier",
-            filter="Tous Fichiers (*.*);;CSV, TSV, TXT (*.csv, *.tsv, *.txt);;"
+            filter="Tous Fichiers (*.*);;CSV, TSV, TXT (*.csv, *.tsv, *.txt);;NumPy (*.npz);;Compressés (*.gz, *.bz2, *.xz, *.zst);;"
         )[0]
         if select_file:
             self.__path_file_save = select_file
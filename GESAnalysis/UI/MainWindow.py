@@ -7,7 +7,7 @@
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
 from typing import Any, Union
-from PyQt5 import QtWidgets
+from PyQt5 import QtCore, QtWidgets
 from GESAnalysis.FC.Controleur import Controleur
 from GESAnalysis.FC.GESAnalysis import GESAnalysis
 from GESAnalysis.UI.OpenFileDialog import OpenFileDialog
@@ -51,6 +51,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.__dict_categories = {}
         self.__number_categories = 0
         
+        # The categories changed are updated once by the event loop, after the actions of the user (see Observable)
+        self.__gesanalysis.set_scheduler(lambda flush: QtCore.QTimer.singleShot(0, flush))
+        
         self.__init_UI()
         
 
@@ -6,15 +6,25 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
-from PyQt5 import QtWidgets, QtGui
+import re
+from functools import partial
+from typing import Any, Callable, List, Tuple
+from PyQt5 import QtCore, QtWidgets, QtGui
 from GESAnalysis.FC.Controleur import Controleur
 from GESAnalysis.UI import common
+from GESAnalysis.UI.categories.AggregateRunner import AggregateRunner
 
 
 class OpenFileDialog(QtWidgets.QDialog):
-    """ Dialog to select a file from the user and read it
+    """ Dialog to select a file (or several files) from the user and read it.
+        The file is read in a thread of the pool with a progress dialog, and the reading can be cancelled.
+        Several files are read at once in processes (see Controleur.load_files), with the same year and category
     """
     
+    # Signal emitted by the thread of the reading : percentage read (-1 if unknown)
+    __progress = QtCore.pyqtSignal(int)
+    
+    
     def __init__(self, controller: Controleur, parent: QtWidgets.QWidget | None = ...) -> None:
         """ Initialisation of the dialog
 
@@ -28,10 +38,14 @@ class OpenFileDialog(QtWidgets.QDialog):
         # Set parameter to attribute
         self.__controller = controller
         
-        self.selected_file = None     # Path of the file to read
+        self.selected_file = None     # Path of the file to read (or paths between quotes)
         self.selected_year = None     # Year of the file 
         self.selected_category = None # Category of the file
         
+        self.__runner = AggregateRunner(self) # Read the file in another thread
+        self.__progress_dialog = None         # Dialog displayed during the reading
+        self.__progress.connect(self.__set_progress)
+        
         self.__init_UI()
 
 
@@ -49,6 +63,8 @@ class OpenFileDialog(QtWidgets.QDialog):
         buttons = QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
         button_box = QtWidgets.QDialogButtonBox(buttons)
         button_box.accepted.connect(self.accept)
+        # Disabled during the reading
+        self.__ok_button = button_box.button(QtWidgets.QDialogButtonBox.Ok)
         button_box.rejected.connect(self.reject)
         
         # Create a form widget
@@ -93,23 +109,33 @@ class OpenFileDialog(QtWidgets.QDialog):
 #  Methods connected to an action                                                                     #
 #######################################################################################################
     def open_file_dialog(self) -> None:
-        """ Open a file dialog to navigate between folders to select the file
+        """ Open a file dialog to navigate between folders to select the file (or several files)
         """
-        self.selected_file = QtWidgets.QFileDialog().getOpenFileName(
+        selected_files = QtWidgets.QFileDialog().getOpenFileNames(
             self,
-            "Selectionner un fichier",
-            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt);;Excel (*.xlsx)"
+            "Selectionner un ou plusieurs fichiers",
+            filter="Tous fichiers (*.*);;CSV, TSV, TXT (*.csv *.tsv *.txt);;Excel (*.xlsx);;NumPy (*.npz);;Compressés, archives (*.gz *.bz2 *.xz *.zst *.zip)"
         )[0]
         # If the user cancel the operation, no need to save into the variable
-        if self.selected_file:
-            # Display the file selected by the user in the lineedit
-            self.choose_file.setText(self.selected_file)
+        if len(selected_files) == 1:
+            self.selected_file = selected_files[0]
+        elif len(selected_files) > 1:
+            # Several files are displayed between quotes, like in the file dialog
+            self.selected_file = " ".join(f'"{file}"' for file in selected_files)
+        else:
+            return
+        # Display the file selected by the user in the lineedit
+        self.choose_file.setText(self.selected_file)
 
 
     def accept(self) -> None:
         """ When the user click on the button 'OK', send a notification to the controller
             to read the selected file and associate the year and the category
         """
+        # A file is already being read (2nd click or 'Enter' before the end of the reading)
+        if self.__progress_dialog is not None:
+            return
+        
         # Get the values from the input
         self.selected_file = self.choose_file.text()
         self.selected_year = self.choose_year.text()
@@ -123,15 +149,175 @@ class OpenFileDialog(QtWidgets.QDialog):
             common.message_warning("Vous devez entrer une année", self)
             return
         
-        # Send notification to controller to read file
+        # Read the file in another thread, the file is opened in the model at the end of the reading
+        files = self.__get_files(self.selected_file)
+        if len(files) == 1:
+            self.selected_file = files[0]
+            self.__show_progress(f"Lecture de '{self.selected_file}'")
+            self.__runner.start(
+                self.__load_file(self.selected_file, self.selected_year),
+                partial(self.__finish_reading, partial(self.__controller.add_file, self.selected_file, self.selected_year, self.selected_category)),
+                self.__show_error
+            )
+        else:
+            files = [(file, self.selected_year, self.selected_category) for file in files]
+            self.__show_progress(f"Lecture de {len(files)} fichiers")
+            self.__runner.start(
+                self.__load_files(files),
+                partial(self.__finish_reading, partial(self.__controller.add_files, files)),
+                self.__show_error
+            )
+
+
+    def reject(self) -> None:
+        """ When the user click on the button 'Cancel' (or 'Echap'), stop the reading in progress
+            and close the dialog. The file is not opened
+        """
+        if self.__progress_dialog is not None:
+            self.__cancel_reading()
+        super().reject()
+
+
+    def __load_file(self, file: str, year: str) -> Callable[[Callable[[], bool]], Any]:
+        """ Create the function who reads the file in the thread of the pool
+
+        Args:
+            file (str): Path to file
+            year (str): Year
+
+        Returns:
+            Callable[[Callable[[], bool]], Any]: Reading of the file (see AggregateRunner.start)
+        """
+        def progress(done: int, total: int) -> None:
+            self.__progress.emit(-1 if total <= 0 else min(100, done * 100 // total))
+        
+        return lambda is_cancelled: self.__controller.load_file(file, year, progress, is_cancelled)
+    
+    
+    def __get_files(self, text: str) -> List[str]:
+        """ Get the files of the lineedit : one path, or several paths between quotes ("a.csv" "b.csv")
+
+        Args:
+            text (str): Text of the lineedit
+
+        Returns:
+            List[str]: Path to files
+        """
+        files = re.findall(r'"([^"]+)"', text)
+        if len(files) == 0:
+            return [text]
+        return files
+    
+    
+    def __load_files(self, files: List[Tuple[str, str, str]]) -> Callable[[Callable[[], bool]], Any]:
+        """ Create the function who reads several files in the thread of the pool
+
+        Args:
+            files (List[Tuple[str, str, str]]): Path, year and category of each file
+
+        Returns:
+            Callable[[Callable[[], bool]], Any]: Reading of the files (see AggregateRunner.start)
+        """
+        def progress(done: int, total: int) -> None:
+            self.__progress.emit(done * 100 // total)
+        
+        return lambda is_cancelled: self.__controller.load_files(files, progress, is_cancelled)
+    
+    
+    def __finish_reading(self, add: Callable[[Any], None], data: Any) -> None:
+        """ Open the file (or the files) read in the model and close the dialog
+
+        Args:
+            add (Callable[[Any], None]): Function who opens the data read in the model (see Controleur.add_file and Controleur.add_files)
+            data (Any): Data of the file (or of each file), None if the reading was cancelled
+        """
+        # The reading was cancelled (button 'Annuler' or 'Cancel') before the result arrived
+        if self.__progress_dialog is None:
+            return
+        
+        self.__close_progress()
+        if data is None:
+            return
+        
         try:
-            self.__controller.open_file(self.selected_file, self.selected_year, self.selected_category)
+            add(data)
             # Close dialog if the file was read
             super().accept()
-        # In case of error, display a message with the corresponding error and clear the lineedits
         except Exception as e:
-            common.message_error(str(e), self)
-            self.clear_input()
+            self.__show_error(e)
+    
+    
+    def __show_error(self, error: Exception) -> None:
+        """ In case of error, display a message with the corresponding error and clear the lineedits
+
+        Args:
+            error (Exception): Error
+        """
+        self.__close_progress()
+        common.message_error(str(error), self)
+        self.clear_input()
+
+
+#######################################################################################################
+#  Progress of the reading                                                                            #
+#######################################################################################################
+    def __show_progress(self, label: str) -> None:
+        """ Create the dialog with the progress of the reading and the button 'Annuler'.
+            It is displayed only if the reading is long.
+            The button 'OK' is disabled until the end of the reading
+
+        Args:
+            label (str): Text of the dialog
+        """
+        self.__close_progress()
+        self.__ok_button.setEnabled(False)
+        self.__progress_dialog = QtWidgets.QProgressDialog(label, "Annuler", 0, 100, self)
+        self.__progress_dialog.setWindowTitle("Ouvrir Fichier")
+        self.__progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        self.__progress_dialog.setMinimumDuration(500)
+        self.__progress_dialog.setAutoClose(False)
+        self.__progress_dialog.setAutoReset(False)
+        self.__progress_dialog.canceled.connect(self.__cancel_reading)
+        self.__progress_dialog.setValue(0)
+    
+    
+    def __set_progress(self, percentage: int) -> None:
+        """ Display the progress of the reading
+
+        Args:
+            percentage (int): Percentage of the file read, -1 if unknown
+        """
+        # The reading is finished or cancelled
+        if self.__progress_dialog is None:
+            return
+        
+        if percentage < 0:
+            # Busy indicator
+            self.__progress_dialog.setMaximum(0)
+        else:
+            self.__progress_dialog.setMaximum(100)
+            self.__progress_dialog.setValue(percentage)
+    
+    
+    def __cancel_reading(self) -> None:
+        """ Stop the reading when the user click on 'Annuler'. The file is not opened
+        """
+        self.__runner.cancel()
+        self.__close_progress()
+    
+    
+    def __close_progress(self) -> None:
+        """ Close the dialog with the progress of the reading and enable the button 'OK'
+        """
+        self.__ok_button.setEnabled(True)
+        if self.__progress_dialog is None:
+            return
+        
+        progress_dialog = self.__progress_dialog
+        self.__progress_dialog = None
+        progress_dialog.canceled.disconnect(self.__cancel_reading)
+        progress_dialog.close()
+        progress_dialog.deleteLater()
 
 
     def clear_input(self) -> None:
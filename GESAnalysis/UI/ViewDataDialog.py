@@ -6,9 +6,9 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
-from PyQt5 import QtWidgets, QtCore
-from typing import List, Union
+from PyQt5 import QtWidgets
 from GESAnalysis.FC.GESAnalysis import GESAnalysis
+from GESAnalysis.UI.DataTableModel import DataTableModel
 
 
 class ViewDataDialog(QtWidgets.QDialog):
@@ -46,63 +46,46 @@ class ViewDataDialog(QtWidgets.QDialog):
         principal_layout = QtWidgets.QHBoxLayout(self)
         
         # Get all files who are opened in the model
-        file_open = self.__gesanalysis.get_file_open()
+        self.__file_open = self.__gesanalysis.get_file_open()
         
-        # To display all the data, we create a tab for each file
-        tab_widget = QtWidgets.QTabWidget(self)
-        for file in file_open:
+        # To display all the data, we create a tab for each file.
+        # The table of a tab is created only when the tab is shown for the 1st time
+        self.__tab_widget = QtWidgets.QTabWidget(self)
+        self.__tabs_filled = set()
+        for file in self.__file_open:
             # For each file, create a widget and his layout to display the data from the file
             file_widget = QtWidgets.QWidget()
             file_layout = QtWidgets.QHBoxLayout(file_widget)
             file_widget.setLayout(file_layout)
             
-            # Create the table widget to display the data of the file
-            table_data_widget = QtWidgets.QTableWidget(file_widget)
-
-            # Get the data of the file
-            data_file = self.__gesanalysis.get_data_from_file(file)
-            
-            # Set columns (number and labels)
-            label_col_file = list(data_file.keys())
-            table_data_widget.setColumnCount(len(label_col_file))
-            table_data_widget.setHorizontalHeaderLabels(label_col_file)
-            
-            # Set number of rows
-            table_data_widget.setRowCount(len(data_file[label_col_file[0]]["data"]))
-            
-            # Fill the table with the data
-            for column_ind, column in enumerate(label_col_file):
-                for data_ind, data in enumerate(data_file[column]["data"]):
-                    # Transform the data to string
-                    data_str = self.__transform_data_to_str(data, data_file[column]["type"])
-                    item_data = QtWidgets.QTableWidgetItem(data_str)
-                    # Remove edit flags (User can't change the item)
-                    item_data.setFlags(QtCore.Qt.ItemIsSelectable |  QtCore.Qt.ItemIsEnabled)
-                    table_data_widget.setItem(data_ind, column_ind, item_data)
-                    
-            # Add the table to the widget
-            file_layout.addWidget(table_data_widget)
-            
             # Add this widget because it's the tab
-            tab_widget.addTab(file_widget, file)
+            self.__tab_widget.addTab(file_widget, file)
+        
+        self.__fill_tab(self.__tab_widget.currentIndex())
+        self.__tab_widget.currentChanged.connect(self.__fill_tab)
 
         # Add the principal widget to the dialog
-        principal_layout.addWidget(tab_widget)
+        principal_layout.addWidget(self.__tab_widget)
         self.setLayout(principal_layout)
         
         
-    def __transform_data_to_str(self, data_list: List[Union[bool, int, float, str]], type_data: type) -> str:
-        """ Transform the elements in data_list to a string
+    def __fill_tab(self, index: int) -> None:
+        """ Create the table of the tab 'index' if it doesn't exist.
+            The table is a view on the data of the file (see DataTableModel) : the cells are not copied
 
         Args:
-            data_list (List[Union[bool, int, float, str]]): List with elements
-            type_data (type): Type of these elements
-
-        Returns:
-            str: String where the elements are separated by ','
+            index (int): Index of the tab
         """
-        data_list_to_str = data_list
-        if not type_data == str:
-            # Transform all elements to string
-            data_list_to_str = map(str, data_list_to_str)
-        return ",".join(data_list_to_str)
+        if index < 0 or index in self.__tabs_filled:
+            return
+        self.__tabs_filled.add(index)
+        
+        file = self.__file_open[index]
+        file_widget = self.__tab_widget.widget(index)
+        
+        # Create the table view to display the data of the file
+        table_data_view = QtWidgets.QTableView(file_widget)
+        table_data_view.setModel(DataTableModel(self.__gesanalysis.get_data_from_file(file), table_data_view))
+            
+        # Add the table to the widget
+        file_widget.layout().addWidget(table_data_view)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import threading
+from functools import partial
+from typing import Any, Callable, Optional
+from PyQt5 import QtCore
+
+
+class AggregateRunner(QtCore.QObject):
+    """ Compute the aggregates of a category in a thread of the pool of Qt (QThreadPool),
+        then give the result to the widget in the thread of the UI (with a signal).
+        When a new computation starts, the previous one is cancelled and his result is ignored
+    """
+
+    # Signal emitted by the thread of the pool : generation, result, error
+    __done = QtCore.pyqtSignal(int, object, object)
+
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        """ Initialise the runner
+
+        Args:
+            parent (Optional[QtCore.QObject], optional): Parent of this object. Defaults to None.
+        """
+        super(AggregateRunner, self).__init__(parent)
+
+        self.__generation = 0      # Number of the last computation, the results of the older ones are ignored
+        self.__cancelled = None    # Event to cancel the last computation
+        self.__callback = None     # Function called with the result
+        self.__error_callback = None
+
+        self.__done.connect(self.__finish)
+
+
+    def start(
+        self,
+        function: Callable[[Callable[[], bool]], Optional[Any]],
+        callback: Callable[[Any], None],
+        error_callback: Callable[[Exception], None]
+    ) -> None:
+        """ Cancel the computation in progress and start a new one.
+            'function' receives a function who returns True when the computation is cancelled,
+            and returns None if it stopped before the end
+
+        Args:
+            function (Callable[[Callable[[], bool]], Optional[Any]]): Computation (called in a thread of the pool)
+            callback (Callable[[Any], None]): Function called with the result (in the thread of the UI)
+            error_callback (Callable[[Exception], None]): Function called with the error raised by 'function' (in the thread of the UI)
+        """
+        self.cancel()
+
+        self.__generation += 1
+        self.__cancelled = threading.Event()
+        self.__callback = callback
+        self.__error_callback = error_callback
+        QtCore.QThreadPool.globalInstance().start(partial(self.__run, function, self.__generation, self.__cancelled))
+
+
+    def cancel(self) -> None:
+        """ Cancel the computation in progress. His result will be ignored
+        """
+        if self.__cancelled is not None:
+            self.__cancelled.set()
+            self.__cancelled = None
+
+
+    def __run(self, function: Callable[[Callable[[], bool]], Optional[Any]], generation: int, cancelled: threading.Event) -> None:
+        """ Do the computation (in a thread of the pool)
+
+        Args:
+            function (Callable[[Callable[[], bool]], Optional[Any]]): Computation
+            generation (int): Number of the computation
+            cancelled (threading.Event): Event set when the computation is cancelled
+        """
+        if cancelled.is_set():
+            return
+
+        result = None
+        error = None
+        try:
+            result = function(cancelled.is_set)
+        except Exception as e:
+            error = e
+
+        if cancelled.is_set():
+            return
+        try:
+            self.__done.emit(generation, result, error)
+        except RuntimeError:
+            # The widget was deleted during the computation
+            pass
+
+
+    def __finish(self, generation: int, result: Any, error: Optional[Exception]) -> None:
+        """ Give the result of the computation to the widget (in the thread of the UI)
+
+        Args:
+            generation (int): Number of the computation
+            result (Any): Result
+            error (Optional[Exception]): Error raised by the computation
+        """
+        # A newer computation was started, or this one was cancelled after the end of the thread
+        if generation != self.__generation or self.__cancelled is None:
+            return
+        self.__cancelled = None
+
+        if error is not None:
+            self.__error_callback(error)
+        else:
+            self.__callback(result)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import numpy
+import matplotlib
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Union
+from matplotlib.axes import Axes
+from matplotlib.container import BarContainer
+from matplotlib.transforms import Bbox
+from matplotlib.text import Text
+
+
+class BarArtists:
+    """ Bars and texts of a graph, kept between the draws.
+        Instead of clearing the axes (cla) and creating all the bars again, a draw updates the position,
+        the height, the color and the visibility of the bars already created, and hides the artists not used.
+        A draw is done between begin() and end(), then the canvas is drawn with draw_idle()
+    """
+
+    def __init__(self, axes: Axes) -> None:
+        """ Initialise the artists of the axes
+
+        Args:
+            axes (Axes): Axes of the graph
+        """
+        self.__axes = axes
+        self.__bars: Dict[Hashable, BarContainer] = {}  # Bars of each key
+        self.__texts: Dict[Hashable, List[Text]] = {}   # Texts of each key
+        self.__used_bars = set()                        # Keys of the bars used during the draw
+        self.__used_texts = set()                       # Keys of the texts used during the draw
+        self.__nb_colors = 0                            # Number of colors given during the draw
+        self.__corners = []                             # Corners of the bars visible during the draw
+
+
+    def reset(self) -> None:
+        """ Clear the axes (cla) and forget the artists
+        """
+        self.__axes.cla()
+        self.__bars.clear()
+        self.__texts.clear()
+
+
+#######################################################################################################
+#  Draw                                                                                               #
+#######################################################################################################
+    def begin(self) -> None:
+        """ Start a draw. The colors are given again from the 1st color of the cycle, like after cla()
+        """
+        self.__used_bars = set()
+        self.__used_texts = set()
+        self.__nb_colors = 0
+        self.__corners = []
+
+
+    def next_color(self) -> Any:
+        """ Get the next color of the cycle of matplotlib
+
+        Returns:
+            Any: Color
+        """
+        colors = matplotlib.rcParams["axes.prop_cycle"].by_key()["color"]
+        color = colors[self.__nb_colors % len(colors)]
+        self.__nb_colors += 1
+        return color
+
+
+    def bar(
+        self,
+        key: Hashable,
+        x: Sequence[Union[int, float]],
+        height: Sequence[Union[int, float]],
+        width: float,
+        bottom: Optional[Sequence[Union[int, float]]] = None,
+        visible: Optional[Sequence[bool]] = None,
+        color: Any = None,
+        **kwargs
+    ) -> BarContainer:
+        """ Draw the bars of the key, like Axes.bar. The bars are created only if the key has not the same number of bars,
+            else they are updated in place. The other arguments (edgecolor, linewidth, ...) are used only to create the bars
+
+        Args:
+            key (Hashable): Key of the bars
+            x (Sequence[Union[int, float]]): Center of each bar
+            height (Sequence[Union[int, float]]): Height of each bar
+            width (float): Width of the bars
+            bottom (Optional[Sequence[Union[int, float]]], optional): Bottom of each bar. Defaults to None (0).
+            visible (Optional[Sequence[bool]], optional): Visibility of each bar. Defaults to None (all the bars).
+            color (Any, optional): Color of the bars. Defaults to None (next color of the cycle).
+
+        Returns:
+            BarContainer: Bars
+        """
+        nb_bars = len(x)
+        if bottom is None:
+            bottom = numpy.zeros(nb_bars)
+        if visible is None:
+            visible = numpy.ones(nb_bars, dtype=bool)
+        if color is None:
+            color = self.next_color()
+
+        container = self.__bars.get(key)
+        if container is None or len(container) != nb_bars:
+            if container is not None:
+                container.remove()
+            container = self.__axes.bar(x, height, width=width, bottom=bottom, color=color, **kwargs)
+            self.__bars[key] = container
+
+        for rect, x_bar, height_bar, bottom_bar, visible_bar in zip(container, x, height, bottom, visible):
+            rect.set_x(x_bar - width/2)
+            rect.set_width(width)
+            rect.set_y(bottom_bar)
+            rect.set_height(height_bar)
+            rect.set_facecolor(color)
+            rect.set_visible(bool(visible_bar))
+            # The bottom stops the margin of the autoscale, like in Axes.bar
+            rect.sticky_edges.y[:] = [bottom_bar] if visible_bar else []
+
+        # Corners of the bars visible, to compute the limits of the axes without reading each bar (see end)
+        visible = numpy.asarray(visible, dtype=bool)
+        x_visible = numpy.asarray(x, dtype=float)[visible]
+        y_visible = numpy.asarray(bottom, dtype=float)[visible]
+        top_visible = y_visible + numpy.asarray(height, dtype=float)[visible]
+        self.__corners.append(numpy.column_stack((x_visible - width/2, y_visible)))
+        self.__corners.append(numpy.column_stack((x_visible + width/2, top_visible)))
+
+        self.__used_bars.add(key)
+        return container
+
+
+    def text(
+        self,
+        key: Hashable,
+        x: Sequence[Union[int, float]],
+        y: Sequence[Union[int, float]],
+        texts: Sequence[str],
+        **kwargs
+    ) -> None:
+        """ Draw the texts of the key, like Axes.text. The texts already created are updated in place
+
+        Args:
+            key (Hashable): Key of the texts
+            x (Sequence[Union[int, float]]): X of each text
+            y (Sequence[Union[int, float]]): Y of each text
+            texts (Sequence[str]): Texts
+            kwargs: Properties of the texts (color, fontsize, ...)
+        """
+        artists = self.__texts.setdefault(key, [])
+        for i, (x_text, y_text, text) in enumerate(zip(x, y, texts)):
+            if i < len(artists):
+                artists[i].set_position((x_text, y_text))
+                artists[i].set_text(text)
+                artists[i].set(**kwargs)
+                artists[i].set_visible(True)
+            else:
+                artists.append(self.__axes.text(x_text, y_text, text, **kwargs))
+
+        # The texts not used are hidden
+        for artist in artists[len(texts):]:
+            artist.set_visible(False)
+        self.__used_texts.add(key)
+
+
+    def legend(self, handles: List[Any], labels: List[str]) -> None:
+        """ Display the legend, or remove it if there are no handles
+
+        Args:
+            handles (List[Any]): Artists of the legend
+            labels (List[str]): Label of each artist
+        """
+        if len(handles) > 0:
+            self.__axes.legend(handles, labels)
+        elif self.__axes.get_legend() is not None:
+            self.__axes.get_legend().remove()
+
+
+    def end(self) -> None:
+        """ End the draw : hide the bars and the texts not used, and compute the limits of the axes on the artists visible
+        """
+        for key, container in self.__bars.items():
+            if key not in self.__used_bars:
+                for rect in container:
+                    rect.set_visible(False)
+                    rect.sticky_edges.y[:] = []
+        for key, artists in self.__texts.items():
+            if key not in self.__used_texts:
+                for artist in artists:
+                    artist.set_visible(False)
+
+        # Same limits as relim(visible_only=True), who is slow with many bars
+        self.__axes.set_autoscale_on(True)
+        self.__axes.dataLim.set_points(Bbox.null().get_points())
+        self.__axes.ignore_existing_data_limits = True
+        corners = numpy.concatenate(self.__corners) if len(self.__corners) > 0 else numpy.zeros((0, 2))
+        # Without data, the limits are the same as after cla()
+        if len(corners) == 0:
+            self.__axes.set_xlim(0, 1, auto=True)
+            self.__axes.set_ylim(0, 1, auto=True)
+            return
+        self.__axes.update_datalim(corners)
+        self.__axes.autoscale_view()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import re
+import numpy
+import threading
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from GESAnalysis.FC.ColumnarData import ColumnarData
+from GESAnalysis.UI.categories import common
+
+
+class AchatsData:
+    """ Compute the data of the category "Achats" from the files.
+        It doesn't use Qt, so the computation can be done in another thread than the UI (see AggregateRunner).
+        The purchases are grouped once by year and NACRES key (year -> key -> amount, count, description),
+        and this aggregate is shared by the stats and the graph
+    """
+    
+    # Column to get the data from the files
+    column_nacres_key = ["code", "Code NACRES"]
+    column_amount = ["amount", "Montant"]
+    column_description = ["description"]
+    
+    # NACRES key : 2 letters, then 2 digits (with a '.' before them) or 2 digits and any character
+    regex_nacres_key = re.compile(r"[A-Z]{2}(?:\.[0-9]{2}|[0-9]{2}.?)", re.DOTALL)
+    
+    # Number of invalid rows written in the warning
+    nb_invalid_rows_warning = 10
+    
+    
+    def __init__(self) -> None:
+        """ Initialise the class
+        """
+        self.__invalid_rows = {}   # Dictionary where the key is a file and the value the data of the file and his invalid rows
+        self.__groups = {}         # Same with the lines of the file grouped by NACRES key
+        self.__lock = threading.Lock()
+    
+    
+    def configure(
+        self,
+        files_category: List[Tuple[str, str, Any, Dict[str, str]]],
+        is_cancelled: Callable[[], bool] = lambda: False
+    ) -> Optional[Dict[str, dict]]:
+        """ Configure data
+
+        Args:
+            files_category (List[Tuple[str, str, Any, Dict[str, str]]]): File, year, data and index of each file (see common.get_files_category)
+            is_cancelled (Callable[[], bool], optional): Returns True if the computation must stop. Defaults to lambda: False.
+
+        Returns:
+            Optional[Dict[str, dict]]: Dictionaries "files", "years_ind" and "data". None if the computation was cancelled.
+                                       "data" contains the unit and, for each year and NACRES key (in the order of the lines),
+                                       the sum of the amounts, the number of lines and the description of the 1st line (or None)
+        """
+        # The invalid rows are shared by the computations : only one at a time
+        with self.__lock:
+            return self.__configure(files_category, is_cancelled)
+    
+    
+    def __configure(
+        self,
+        files_category: List[Tuple[str, str, Any, Dict[str, str]]],
+        is_cancelled: Callable[[], bool]
+    ) -> Optional[Dict[str, dict]]:
+        """ Configure data (see configure)
+
+        Args:
+            files_category (List[Tuple[str, str, Any, Dict[str, str]]]): File, year, data and index of each file
+            is_cancelled (Callable[[], bool]): Returns True if the computation must stop
+
+        Returns:
+            Optional[Dict[str, dict]]: Dictionaries "files", "years_ind" and "data". None if the computation was cancelled
+        """
+        files = {}     # Dictionary where the key is the file in 'category' and a bool if it's read or not
+        years_ind = {} # Dictionary containing the year and the index
+        
+        unit_amount = ""
+        ind_year = 0
+        for file, year, data, index in files_category:
+            if is_cancelled():
+                return None
+            
+            # Add file to files and set bool
+            files[file] = {"read": True, "warning": [], "year": year}
+            
+            compare_columns = True
+            
+            # Get the data for the NACRES key 
+            nacres_keys = common.get_data_from_columns(data, self.column_nacres_key, index)
+            if nacres_keys is None:
+                compare_columns = False
+                files[file]["read"] = False
+                files[file]["warning"].append(f"Colonne pour le code NACRES non-trouvée")
+            
+            # Same with the amount
+            amount = common.get_data_from_columns(data, self.column_amount, index)
+            if amount is None:
+                compare_columns = False
+                files[file]["read"] = False
+                files[file]["warning"].append(f"Colonne pour le montant non-trouvée")
+            else:
+                # Check the type of amount
+                if common.get_type_from_columns(data, self.column_amount, index) not in [int, float]:
+                    compare_columns = False
+                    files[file]["read"] = False
+                    files[file]["warning"].append(f"Colonne pour le montant n'a pas de chiffres")
+                
+            # Same with the description
+            description = common.get_data_from_columns(data, self.column_description, index)
+            if description is not None:
+                if compare_columns and len(nacres_keys) != len(description):
+                    files[file]["read"] = False
+                    files[file]["warning"].append("Nombre de lignes différent entre le code NACRES et sa description")
+            
+            # Compare the columns between the NACRES key and the amount
+            if compare_columns and len(nacres_keys) != len(amount):
+                files[file]["read"] = False
+                files[file]["warning"].append("Nombre de lignes différent entre le code NACRES et le montant")
+            
+            # No need to continue if there are problems
+            if not files[file]["read"]:
+                continue
+                
+            # Get the unit of amount
+            unit = common.get_unit_from_columns(data, self.column_amount, index)
+            if len(unit) == 0:
+                files[file]["warning"].append(f"Colonne 'Montant' n'a pas d'unité")
+            else:
+                unit = "/".join(unit)
+                if unit_amount == "":
+                    unit_amount = unit
+                if unit != unit_amount:
+                    files[file]["read"] = False
+                    files[file]["warning"].append(f"Colonne 'Montant' a une unité différente")
+            
+            # No need to continue if there are problems
+            if not files[file]["read"]:
+                continue
+            
+            # Check if all the NACRES key is correct
+            invalid_rows = self.__get_invalid_rows(file, data, index)
+            if len(invalid_rows) > 0:
+                files[file]["read"] = False
+                rows = ", ".join(str(row + 1) for row in invalid_rows[:self.nb_invalid_rows_warning])
+                if len(invalid_rows) > self.nb_invalid_rows_warning:
+                    rows += ", ..."
+                files[file]["warning"].append(f"Des codes NACRES sont incorrectes ({len(invalid_rows)} ligne(s) : {rows})")
+            
+            if year not in years_ind.keys():
+                years_ind[year] = {"index": ind_year}
+                ind_year += 1
+                
+        # Remove the invalid rows and the groups of the files who are closed or in another category
+        for file in list(self.__invalid_rows.keys()):
+            if file not in files:
+                del self.__invalid_rows[file]
+        for file in list(self.__groups.keys()):
+            if file not in files:
+                del self.__groups[file]
+            
+        # Create structure for data
+        data_achats = {}
+        for year in years_ind.keys():
+            data_achats[year] = {}
+            
+        # Fill the structure with the groups of each file
+        for file, year, data, index in files_category:
+            if not files[file]["read"]:
+                continue
+            if is_cancelled():
+                return None
+            
+            data_year = data_achats[year]
+            for key, group in self.__get_group_file(file, data, index).items():
+                data_key = data_year.get(key)
+                if data_key is None:
+                    data_year[key] = dict(group)
+                else:
+                    data_key["amount"] += group["amount"]
+                    data_key["count"] += group["count"]
+        
+        return {
+            "files": files,
+            "years_ind": years_ind,
+            "data": {"data": data_achats, "unit": unit_amount}
+        }
+            
+    
+    def __get_group_file(self, file: str, data: dict, index: dict) -> Dict[str, Dict[str, Any]]:
+        """ Get the lines of a file grouped by NACRES key. They are grouped only when the file is read for the 1st time
+
+        Args:
+            file (str): File
+            data (dict): Data of the file
+            index (dict): Index of the columns of the file
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Groups of the file (see __group_file)
+        """
+        # The groups are kept while the data of the file is the same
+        if file not in self.__groups or self.__groups[file]["data"] is not data:
+            self.__groups[file] = {
+                "data": data,
+                "groups": self.__group_file(data, index)
+            }
+        return self.__groups[file]["groups"]
+    
+    
+    def __group_file(self, data: dict, index: dict) -> Dict[str, Dict[str, Any]]:
+        """ Group the lines of a file by NACRES key (without '.') in one pass over the flat keys.
+            A line with several keys counts for each key, with the amount of the line
+
+        Args:
+            data (dict): Data of the file
+            index (dict): Index of the columns of the file
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each key (in the order of the lines), the sum of the amounts,
+                                       the number of lines and the description of the 1st line (or None)
+        """
+        keys, offsets_keys = self.__get_flat_column(data, common.get_name_from_columns(data, self.column_nacres_key, index))
+        
+        # Amount of each line, repeated for each key of the line
+        column_amount = next(column for column in self.column_amount if common.get_name_column(data, column, index) is not None)
+        amount_row = common.get_sum_data(data, column_amount, index)
+        if offsets_keys is not None:
+            amount_row = numpy.repeat(amount_row, numpy.diff(offsets_keys))
+        amounts = amount_row.tolist()
+        
+        # Sum of the amounts, number of lines and 1st key of each value of the column
+        groups_value = {}
+        for key_ind, (key, amount) in enumerate(zip(keys, amounts)):
+            group = groups_value.get(key)
+            if group is None:
+                groups_value[key] = [amount, 1, key_ind]
+            else:
+                group[0] += amount
+                group[1] += 1
+        
+        # Then the values with and without '.' are the same NACRES key (the values are in the order of the lines)
+        groups = {}
+        first_keys = []
+        for key, (amount, count, key_ind) in groups_value.items():
+            key = str(key).replace(".", "")
+            group = groups.get(key)
+            if group is None:
+                groups[key] = {"amount": amount, "count": count, "description": None}
+                first_keys.append(key_ind)
+            else:
+                group["amount"] += amount
+                group["count"] += count
+        
+        name_description = common.get_name_from_columns(data, self.column_description, index)
+        if name_description is None or len(groups) == 0:
+            return groups
+        
+        # Description of the 1st key : value of the description at the same place in the line (or None)
+        descriptions, offsets_description = self.__get_flat_column(data, name_description)
+        first_keys = numpy.array(first_keys, dtype=numpy.int64)
+        if offsets_keys is None:
+            rows = first_keys
+            place = numpy.zeros(len(first_keys), dtype=numpy.int64)
+        else:
+            rows = numpy.searchsorted(offsets_keys, first_keys, side="right") - 1
+            place = first_keys - offsets_keys[rows]
+        if offsets_description is None:
+            position = rows.tolist()
+            exist = (place == 0).tolist()
+        else:
+            position = offsets_description[rows] + place
+            exist = (position < offsets_description[rows + 1]).tolist()
+            position = position.tolist()
+        
+        for group, description_ind, description_exist in zip(groups.values(), position, exist):
+            if description_exist:
+                group["description"] = str(descriptions[description_ind])
+        return groups
+    
+    
+    def __get_flat_column(self, data: dict, name_col: str) -> Tuple[List[Any], Optional[numpy.ndarray]]:
+        """ Get the values of a column in a flat list, and the index of the 1st value of each row
+
+        Args:
+            data (dict): Data of the file
+            name_col (str): Column (full name)
+
+        Returns:
+            Tuple[List[Any], Optional[numpy.ndarray]]: Values and offsets of the rows (None if each row has one value)
+        """
+        if isinstance(data, ColumnarData):
+            return data.get_values(name_col).tolist(), data.get_offsets(name_col)
+        
+        values_line = data[name_col]["data"]
+        values = list(chain.from_iterable(values_line))
+        nb_values_line = list(map(len, values_line))
+        # Only one value per row : no need of offsets
+        if len(values) == len(values_line) and min(nb_values_line, default=1) == 1:
+            return values, None
+        
+        offsets = numpy.zeros(len(values_line) + 1, dtype=numpy.int64)
+        numpy.cumsum(nb_values_line, out=offsets[1:])
+        return values, offsets
+    
+    
+    def __get_invalid_rows(self, file: str, data: dict, index: dict) -> numpy.ndarray:
+        """ Get the rows of a file with an incorrect NACRES key. They are checked only when the file is read for the 1st time
+
+        Args:
+            file (str): File
+            data (dict): Data of the file
+            index (dict): Index of the columns of the file
+
+        Returns:
+            numpy.ndarray: Index of the rows with an incorrect NACRES key
+        """
+        # The invalid rows are kept while the data of the file is the same
+        if file not in self.__invalid_rows or self.__invalid_rows[file]["data"] is not data:
+            self.__invalid_rows[file] = {
+                "data": data,
+                "invalid_rows": self.__check_NACRES_keys(data, index)
+            }
+        return self.__invalid_rows[file]["invalid_rows"]
+    
+    
+    def __check_NACRES_keys(self, data: dict, index: dict) -> numpy.ndarray:
+        """ Check the NACRES keys of a file in bulk : each different key of the column is checked once
+            with the regular expression (see regex_nacres_key), then the rows of the incorrect keys are searched in an array
+
+        Args:
+            data (dict): Data of the file
+            index (dict): Index of the columns of the file
+
+        Returns:
+            numpy.ndarray: Index of the rows with an incorrect NACRES key
+        """
+        name_col = common.get_name_from_columns(data, self.column_nacres_key, index)
+        
+        # Keys of the column (flat) and the number of keys of each row
+        keys, offsets = self.__get_flat_column(data, name_col)
+        nb_keys_row = None if offsets is None else numpy.diff(offsets)
+        
+        # Check each different key once
+        invalid_keys = {key for key in set(keys) if self.regex_nacres_key.fullmatch(str(key).upper()) is None}
+        if len(invalid_keys) == 0:
+            return numpy.zeros(0, dtype=numpy.int64)
+        
+        # Rows of the incorrect keys
+        invalid = numpy.fromiter((key in invalid_keys for key in keys), dtype=bool, count=len(keys))
+        if nb_keys_row is None:
+            return numpy.flatnonzero(invalid)
+        rows = numpy.repeat(numpy.arange(len(nb_keys_row)), nb_keys_row)
+        return numpy.unique(rows[invalid])
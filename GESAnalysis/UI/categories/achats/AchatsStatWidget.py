@@ -98,16 +98,11 @@ class AchatsStatWidget(QtWidgets.QWidget):
             self.__column_stats = ["Montant"]
             total = 0
             selected_year = self.__combobox_year.currentText()
-            # Row contains all the NACRES key of the year
-            for data in self.__data_dict[selected_year]:
-                nacres_key = data[0]
-                amount = data[1]
-                if nacres_key not in self.__row_name_stats:
-                    self.__row_name_stats.append(nacres_key)
-                    self.__data_table[nacres_key] = {"Montant" : amount}
-                else:
-                    self.__data_table[nacres_key]["Montant"] += amount
-                total += amount
+            # Row contains all the NACRES key of the year (already grouped by AchatsData)
+            for nacres_key, data_key in self.__data_dict[selected_year].items():
+                self.__row_name_stats.append(nacres_key)
+                self.__data_table[nacres_key] = {"Montant" : data_key["amount"]}
+                total += data_key["amount"]
             
             self.__row_name_stats.append("total")
             self.__data_table["total"] = {"Montant": total}
@@ -6,8 +6,9 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
-from typing import Callable, Dict, Tuple, Union
-import math
+from typing import Callable, List, Tuple
+import bisect
+import numpy
 import matplotlib
 
 matplotlib.use('Qt5Agg')
@@ -16,17 +17,25 @@ from PyQt5 import QtWidgets, QtCore
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
 from matplotlib.figure import Figure
 from GESAnalysis.UI.ChangeNacresCodeDialog import ChangeNacresCodeDialog
+from GESAnalysis.FC.NacresMatcher import NacresMatcher
+from GESAnalysis.FC.NacresRollup import NacresRollup
+from GESAnalysis.UI.categories.BarArtists import BarArtists
 from functools import partial
 
 
 class KeyAmount(QtWidgets.QWidget):
-    """ Widget to draw a graph representing the amount for each NACRES key
+    """ Widget to draw a graph representing the amount for each NACRES key.
+        The amounts can be summed by family (2 characters) or by 3 characters (see NacresRollup),
+        with only the highest bars and a bar "Autres". A click on a bar displays the labels inside it (drill-down)
     """
     
     # Values use to draw the graph
     __width = 0.3                                   # Width of bars
     __spacing = 0.7                                 # Spacing between bars of each mode
     
+    # Name of each level in the combobox
+    __levels_name = ["Famille (2 caractères)", "Sous-famille (3 caractères)", "Code NACRES"]
+    
     
     def __init__(self, parent: QtWidgets.QWidget | None = ...) -> None:
         """ Initialize the class by setting the data and draw the graph
@@ -40,20 +49,33 @@ class KeyAmount(QtWidgets.QWidget):
         # Data structure
         self.__years_ind = {}          # Dictionary of year
         self.__nacres_key_code = ['*'] # Nacres key code
+        self.__nacres_matcher = NacresMatcher(self.__nacres_key_code) # Nacres key code compiled
         self.__data_achats = {}        # Dictionary of data
         self.__unit = ""               # Unit
         
+        # Roll-up of the amounts. The sums are computed again only when the data, the years or the code change
+        self.__rollup = None                          # Sums of each level (NacresRollup)
+        self.__descriptions_keys = {}                 # Description of each NACRES key
+        self.__level = len(NacresRollup.levels) - 1   # Level of the graph
+        self.__parent = None                          # Label of the drill-down, None to display all the labels of the level
+        self.__nb_top = None                          # Number of the highest bars (with a bar "Autres"), None for all the bars
+        
         self.__fig = Figure()
         self.__axes = self.__fig.add_subplot(111)
         self.__figCanvas = FigureCanvasQTAgg(self.__fig)
+        self.__bar_artists = BarArtists(self.__axes)
         self.__bars = None
         self.__annotation = None
+        self.__background = None       # Pixels of the canvas without the annotation, to draw the annotation alone (blit)
+        self.__annotation_index = -1   # Index of the key in the annotation, -1 if the annotation is hidden
         
         self.x_labels_code = []
         self.x_position = []
         self.y_amount_code = []
         
         self.cid = self.__fig.canvas.mpl_connect("motion_notify_event", self.hover)
+        self.__fig.canvas.mpl_connect("draw_event", self.__save_background)
+        self.__fig.canvas.mpl_connect("button_press_event", self.__click_bar)
         
         self.__init_UI()
         
@@ -73,11 +95,30 @@ class KeyAmount(QtWidgets.QWidget):
         widget_toolbar_button.setContentsMargins(0, 0, 0, 0)
         widget_toolbar_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         layout_toolbar_button = QtWidgets.QHBoxLayout(widget_toolbar_button)
-        toolbar = NavigationToolbar2QT(self.__figCanvas, widget_toolbar_button)
+        self.__toolbar = NavigationToolbar2QT(self.__figCanvas, widget_toolbar_button)
         button_code = QtWidgets.QPushButton("Code NACRES", widget_toolbar_button)
         button_code.setFixedHeight(20)
         button_code.clicked.connect(self.__change_nacres_key_code)
-        layout_toolbar_button.addWidget(toolbar)
+        
+        # Level of the graph, number of bars and button to go back to the level above
+        self.__combobox_level = QtWidgets.QComboBox(widget_toolbar_button)
+        self.__combobox_level.addItems(self.__levels_name)
+        self.__combobox_level.setCurrentIndex(self.__level)
+        self.__combobox_level.currentIndexChanged.connect(self.__change_level)
+        self.__spinbox_top = QtWidgets.QSpinBox(widget_toolbar_button)
+        self.__spinbox_top.setPrefix("Top ")
+        self.__spinbox_top.setSpecialValueText("Tous")
+        self.__spinbox_top.setRange(0, 999)
+        self.__spinbox_top.valueChanged.connect(self.__change_nb_top)
+        self.__button_back = QtWidgets.QPushButton("Retour", widget_toolbar_button)
+        self.__button_back.setFixedHeight(20)
+        self.__button_back.setEnabled(False)
+        self.__button_back.clicked.connect(self.__drill_up)
+        
+        layout_toolbar_button.addWidget(self.__toolbar)
+        layout_toolbar_button.addWidget(self.__combobox_level)
+        layout_toolbar_button.addWidget(self.__spinbox_top)
+        layout_toolbar_button.addWidget(self.__button_back)
         layout_toolbar_button.addWidget(button_code)
         widget_toolbar_button.setLayout(layout_toolbar_button)
         
@@ -170,43 +211,52 @@ class KeyAmount(QtWidgets.QWidget):
 #  Draw the graph in the canvas                                                                       #
 #######################################################################################################
     def __draw(self) -> None:
-        """ Draw the graph in the canvas
+        """ Draw the graph in the canvas.
+            There is a bar for each key of all the years : the bars are updated in place and the keys not displayed are hidden
         """
-        self.__axes.cla()
-        
-        # Recreate annotation because we clear the axes
-        self.__annotation = self.__axes.annotate(
-            "Hello",
-            xy=(0,0),
-            xytext=(0,10),
-            textcoords="offset points",
-            bbox=dict(boxstyle="round", fc="white", ec="black", lw=2),
-                    arrowprops=dict(arrowstyle="->"))
+        # Create the annotation once, it is kept between the draws
+        if self.__annotation is None:
+            self.__annotation = self.__axes.annotate(
+                "Hello",
+                xy=(0,0),
+                xytext=(0,10),
+                textcoords="offset points",
+                bbox=dict(boxstyle="round", fc="white", ec="black", lw=2),
+                        arrowprops=dict(arrowstyle="->"))
+            self.__annotation.get_bbox_patch().set_alpha(0.4)
+            # The annotation is not drawn with the figure, but alone on the background (see hover)
+            self.__annotation.set_animated(True)
         self.__annotation.set_visible(False)
+        self.__annotation_index = -1
         
-        data_graph_dict = self.__build_dict_graph()
-        
-        # Transform dict to list
-        dict_to_list = []
-        for key, data_key in data_graph_dict.items():
-            dict_to_list.append((key, data_key["position"], data_key["amount"], data_key["description"]))
-        
-        # Sort this list by position
-        dict_to_list.sort(key=lambda a:a[1])
+        if self.__rollup is None:
+            self.__build_rollup()
         
-        # Separate this list into 4 lists
+        # Labels of the graph with their amount, from the sums of the level
         self.x_labels_code = []
         self.x_position = []
         self.y_amount_code = []
         self.descriptions = []
-        for key, pos, amount, description in dict_to_list:
-            self.x_labels_code.append(key)
-            self.x_position.append(pos)
+        for label_ind, (label, amount) in enumerate(self.__rollup.get_top(self.__level, self.__nb_top, self.__parent)):
+            self.x_labels_code.append(label)
+            self.x_position.append(label_ind * (self.__width + self.__spacing))
             self.y_amount_code.append(amount)
-            self.descriptions.append(description)
+            # Only a NACRES key has a description
+            self.descriptions.append(self.__descriptions_keys.get(label) if self.__level == len(NacresRollup.levels) - 1 else None)
+        
+        # The labels displayed are the first bars, the others are hidden
+        nb_bars = self.__get_nb_bars()
+        x_bars = numpy.zeros(nb_bars)
+        y_bars = numpy.zeros(nb_bars)
+        visible_bars = numpy.zeros(nb_bars, dtype=bool)
+        x_bars[:len(self.x_position)] = self.x_position
+        y_bars[:len(self.y_amount_code)] = self.y_amount_code
+        visible_bars[:len(self.x_position)] = True
         
         # Draw the bars
-        self.__bars = self.__axes.bar(self.x_position, self.y_amount_code, width=self.__width)
+        self.__bar_artists.begin()
+        self.__bars = self.__bar_artists.bar("amount", x_bars, y_bars, self.__width, visible=visible_bars)
+        self.__bar_artists.end()
         
         # Set labels on x-axis
         self.__axes.set_xticks(self.x_position)
@@ -219,127 +269,63 @@ class KeyAmount(QtWidgets.QWidget):
         if len(self.x_position) > 0:
             self.__axes.set_xlim(0-self.__width, self.x_position[len(self.x_position) - 1]+self.__width)
         
-        # Draw on canvas
-        self.__figCanvas.draw()
+        # Draw on canvas when Qt is idle
+        self.__figCanvas.draw_idle()
 
         
-    def __build_dict_graph(self) -> Dict[str, Dict[str, Union[float, int]]]:
-        """ Create a dictionary for the graph. This dictionary contains the keys
-            accepted by the code (nacres_key_code) with the position on X-axis and his amount.
-
-        Returns:
-            Dict[str, Dict[str, Union[float, int]]]: Dictionary
+    def __build_rollup(self) -> None:
+        """ Sum the amount of each key accepted by the code (nacres_key_code) in the years selected,
+            then the amounts of each level (see NacresRollup)
         """
-        data_for_graph = {}
-        current_position = 0
+        amounts = {}
+        self.__descriptions_keys = {}
         for year, data_year in self.__data_achats.items():
             # If the year is not select, then pass to next year
             if not self.__years_ind[year]["checked"]:
                 continue
             
-            for data in data_year:
-                nacres_key = data[0]
-                amount = data[1]
-                description = None
-                if len(data) == 3:
-                    description = data[2]
+            # The lines are already grouped by key (see AchatsData)
+            for nacres_key, data_key in data_year.items():
                 # If the key is not accepted by the nacres code (user), continue with the next key
-                if not self.__analyse_key_code_list(nacres_key):
+                if not self.__nacres_matcher.match(nacres_key):
                     continue
                 
-                # Else, if the key is already in the dictionary, then add his amount
-                if nacres_key in data_for_graph.keys():
-                    data_for_graph[nacres_key]["amount"] += amount
+                # Else, if the key is already in the dictionary (other year), then add his amount
+                if nacres_key in amounts:
+                    amounts[nacres_key] += data_key["amount"]
                 # Else, add into the dictionary
                 else:
-                    data_for_graph[nacres_key] = {
-                        "position": current_position,
-                        "amount": amount,
-                        "description": description
-                    }
-                    current_position += self.__width + self.__spacing
-
-        return data_for_graph     
-                
+                    amounts[nacres_key] = data_key["amount"]
+                    self.__descriptions_keys[nacres_key] = data_key["description"]
+        
+        self.__rollup = NacresRollup(amounts)
                 
-    def __analyse_key_code_list(self, key: str) -> bool:
-        """ Indicate if the key is accepted by the list of code
-
-        Args:
-            key (str): Key
-
-        Returns:
-            bool: True if the key is accepted by the list of codes, else False
-        """
-        for code in self.__nacres_key_code:
-            if self.__is_key_in_code(key, code):
-                return True
-        return False
-    
-    
-    def __is_key_in_code(self, key: str, code: str) -> bool:
-        """ Indicate if the key is accepted by the code
-
-        Args:
-            key (str): Key
-            code (str): Code
-
-        Returns:
-            bool: True if the key is accepted, else False
-        """
-        # code = '*' -> accept all keys
-        if code == "*":
-            return True
-        
-        if code[0] == '*':
-            # Code = "*Z*" -> Search if the key is in the code
-            if code[len(code) - 1] == '*':
-                search_code = code[1:len(code)-1]
-                return search_code in key
-            # Code = "*Z" -> Compare the end between the key and the coe
-            else:
-                return self.__compare_end(key, code)
-        elif code[len(code) - 1] == '*':
-            return self.__compare_start(key, code)
-        elif '*' in code:
-            split_code = code.split('*')
-            code_start = split_code[0] + '*'
-            code_end = '*' + split_code[1]
-            return self.__compare_start(key, code_start) and self.__compare_end(key, code_end)
-        else:
-            return key == code
                 
-    
-    def __compare_end(self, key: str, code: str) -> bool:
-        """ Compare if key and code has the same end
-
-        Args:
-            key (str): Key
-            code (str): Key
+    def __get_all_keys(self) -> List[str]:
+        """ Get the keys of all the years accepted by the code (nacres_key_code)
 
         Returns:
-            bool: True if the end is the same, else False
+            List[str]: Keys, without duplicates
         """
-        for i in range(1, len(code)):
-            if code[len(code)-i] != key[len(key)-i]:
-                return False
-        return True
+        keys = (key for data_year in self.__data_achats.values() for key in data_year)
+        return self.__nacres_matcher.filter(keys)
     
     
-    def __compare_start(self, key: str, code: str) -> bool:
-        """ Compare if key and code has the same start
-
-        Args:
-            key (str): Key
-            code (str): Code
+    def __get_nb_bars(self) -> int:
+        """ Get the number of bars of the graph, who doesn't change when the user selects another year :
+            the number of labels of the level (in the drill-down) of all the years, or nb_top + 1 with a bar "Autres"
 
         Returns:
-            bool: True if the start is the same, else False
+            int: Number of bars
         """
-        for i in range(len(code)-1):
-            if key[i] != code[i]:
-                return False
-        return True
+        if self.__nb_top is not None:
+            return self.__nb_top + 1
+        all_labels = set()
+        for key in self.__get_all_keys():
+            label = NacresRollup.get_label(key, self.__level)
+            if self.__parent is None or label.startswith(self.__parent):
+                all_labels.add(label)
+        return len(all_labels)
     
 
 #######################################################################################################
@@ -354,30 +340,57 @@ class KeyAmount(QtWidgets.QWidget):
         """
         self.__years_ind[year]["checked"] = state
         if state or len(self.__years_ind.keys()) == 1:
+            self.__rollup = None
             self.__draw()
             
             
     def hover(self, event) -> None:
-        """ When the user move his mouse on the graph, an event is receive and call the functions to execute
+        """ When the user move his mouse on the graph, an event is receive and call the functions to execute.
+            The bar under the mouse is searched by dichotomy on the positions, and only the annotation is drawn
 
         Args:
             event : Event
         """
-        is_visible = self.__annotation.get_visible()
-        if event.inaxes == self.__axes:
-            if self.__bars is None or self.__annotation is None:
-                return
-            
-            for bar in self.__bars:
-                is_contained, ind = bar.contains(event)
-                if is_contained:                        
-                    self.__annotation.set_visible(self.__update_annotation(bar))
-                    self.__fig.canvas.draw()
-                    return
-        
-        if is_visible and self.__annotation is not None:
-            self.__annotation.set_visible(False)
-            self.__fig.canvas.draw()
+        if self.__bars is None or self.__annotation is None:
+            return
+
+        index = -1
+        if event.inaxes == self.__axes and event.xdata is not None and event.ydata is not None:
+            index = self.__get_index_bar(event.xdata, event.ydata)
+
+        # Nothing to draw if the annotation doesn't change
+        if index == self.__annotation_index:
+            return
+        self.__annotation_index = index
+        if index != -1:
+            self.__update_annotation(index)
+        self.__annotation.set_visible(index != -1)
+        self.__blit_annotation()
+
+
+    def __save_background(self, event) -> None:
+        """ Save the pixels of the canvas after each draw of the figure (without the annotation, who is animated),
+            then draw the annotation on them
+
+        Args:
+            event : Event
+        """
+        self.__background = self.__figCanvas.copy_from_bbox(self.__fig.bbox)
+        if self.__annotation is not None and self.__annotation.get_visible():
+            self.__fig.draw_artist(self.__annotation)
+
+
+    def __blit_annotation(self) -> None:
+        """ Draw the annotation alone : restore the background saved, draw the annotation and copy them on the screen
+        """
+        # The figure was never drawn, the annotation will be drawn with it
+        if self.__background is None:
+            self.__figCanvas.draw_idle()
+            return
+        self.__figCanvas.restore_region(self.__background)
+        if self.__annotation.get_visible():
+            self.__fig.draw_artist(self.__annotation)
+        self.__figCanvas.blit(self.__fig.bbox)
             
                         
         
@@ -391,48 +404,117 @@ class KeyAmount(QtWidgets.QWidget):
         if self.change_nacres_code_dialog.exec_():
             new_code = self.change_nacres_code_dialog.selected_code
             self.__nacres_key_code = new_code.split(';')
+            self.__nacres_matcher = self.change_nacres_code_dialog.selected_matcher
             
             # Re-draw the graph due to the update of the code
+            self.__rollup = None
             self.__draw()
+    
+    
+    def __change_level(self, level: int) -> None:
+        """ Display all the labels of the level selected in the combobox
+
+        Args:
+            level (int): Level
+        """
+        self.__level = level
+        self.__parent = None
+        self.__button_back.setEnabled(False)
+        self.__draw()
+    
+    
+    def __change_nb_top(self, nb_top: int) -> None:
+        """ Display only the nb_top highest bars and a bar "Autres" (0 : all the bars)
+
+        Args:
+            nb_top (int): Number of bars
+        """
+        self.__nb_top = None if nb_top == 0 else nb_top
+        self.__draw()
+    
+    
+    def __click_bar(self, event) -> None:
+        """ When the user clicks on a bar, display the labels of the level below inside this bar (drill-down)
+
+        Args:
+            event : Event
+        """
+        # The click is used by the toolbar (zoom, pan) or is not on a bar
+        if event.button != 1 or self.__toolbar.mode or event.inaxes != self.__axes or event.xdata is None or event.ydata is None:
+            return
+        if self.__level == len(NacresRollup.levels) - 1:
+            return
+        index = self.__get_index_bar(event.xdata, event.ydata)
+        if index == -1 or self.x_labels_code[index] == NacresRollup.other_label:
+            return
+        
+        self.__parent = self.x_labels_code[index]
+        self.__set_level(self.__level + 1)
+        self.__draw()
+    
+    
+    def __drill_up(self) -> None:
+        """ Go back to the level above the drill-down
+        """
+        if self.__parent is None:
+            return
+        self.__parent = NacresRollup.get_parent(self.__parent, self.__level - 1)
+        self.__set_level(self.__level - 1)
+        self.__draw()
+    
+    
+    def __set_level(self, level: int) -> None:
+        """ Set the level of the drill-down, without resetting it from the combobox
+
+        Args:
+            level (int): Level
+        """
+        self.__level = level
+        self.__combobox_level.blockSignals(True)
+        self.__combobox_level.setCurrentIndex(level)
+        self.__combobox_level.blockSignals(False)
+        self.__button_back.setEnabled(self.__parent is not None)
 
 
 #######################################################################################################
 #  Method used by hover                                                                               #
 #######################################################################################################
-    def __update_annotation(self, bar) -> bool:
-        """ Update the annotation on the graph
+    def __get_index_bar(self, x: float, y: float) -> int:
+        """ Search the bar under the point (x, y) by dichotomy on x_position (sorted)
 
         Args:
-            bar : Bar
-            
+            x (float): X of the point
+            y (float): Y of the point
+
         Returns:
-            bool: True if the update is valid, else False
+            int: Index of the bar in x_position, -1 if there is no bar under the point
         """
-        x = bar.get_x() + bar.get_width()/2
-        y = bar.get_y() + bar.get_height()
-        
-        # Search the index of x to get the NACRES key and his description
-        # Return False if we don't find the position
-        x_index = self.__get_nacres_key_from_position(x)
-        if x_index == -1:
-            return False
-        key = self.x_labels_code[x_index]
-        desc = self.descriptions[x_index]
-        
-        self.__annotation.xy = (x,y)
+        # Last bar who starts before x
+        index = bisect.bisect_right(self.x_position, x + self.__width/2) - 1
+        if index < 0 or x > self.x_position[index] + self.__width/2:
+            return -1
+
+        # The bar goes from 0 to his amount
+        amount = self.y_amount_code[index]
+        if amount == 0 or not min(0, amount) <= y <= max(0, amount):
+            return -1
+        return index
+
+
+    def __update_annotation(self, index: int) -> None:
+        """ Update the annotation on the graph
+
+        Args:
+            index (int): Index of the bar in x_position
+        """
+        key = self.x_labels_code[index]
+        desc = self.descriptions[index]
+
+        self.__annotation.xy = (self.x_position[index], self.y_amount_code[index])
         text = f"{key}"
         if desc is not None:
             text += f" : {desc}"
         self.__annotation.set_text(text)
-        self.__annotation.get_bbox_patch().set_alpha(0.4)
-        return True
-        
-    
-    def __get_nacres_key_from_position(self, position: Union[float, int]) -> bool:
-        for pos_index, pos in enumerate(self.x_position):
-            if math.isclose(position, pos):
-                return pos_index
-        return -1
 
         
 #######################################################################################################
@@ -458,4 +540,5 @@ class KeyAmount(QtWidgets.QWidget):
         
         self.__update_radiobuttons(self.__years_ind, self.__widget_buttons_years, self.__layout_buttons_years, self.__click_year_radiobutton)
         
+        self.__rollup = None
         self.__draw()
@@ -11,8 +11,11 @@
 #######################################################################################################
 
 
-from typing import Dict, List, Union, Optional
+import numpy
 
+from typing import Any, Dict, List, Tuple, Union, Optional
+
+from GESAnalysis.FC.ColumnarData import ColumnarData
 from GESAnalysis.FC.GESAnalysis import GESAnalysis
 
 
@@ -33,13 +36,14 @@ def check_value(
         str: Unit
     """
     unit = ""
-    for values_ges in model.get_data().values():
+    for file, values_ges in model.get_data().items():
         if values_ges["category"] != "Missions":
             continue
         reader = values_ges["data"]
+        index = model.get_index_from_file(file)
         year = values_ges["year"]          
-        unit_reader = get_unit(reader, column)
-        type_reader = get_type(reader, column)
+        unit_reader = get_unit(reader, column, index)
+        type_reader = get_type(reader, column, index)
         
         if unit == "":
             unit = "/".join(unit_reader)
@@ -54,6 +58,28 @@ def check_value(
     return unit
 
 
+def get_files_category(
+    model: GESAnalysis,
+    category: str
+) -> List[Tuple[str, str, Any, Dict[str, str]]]:
+    """ Get the files of a category with their year, data and index of columns.
+        The data of a file is not modified after the reading : the list can be used in another thread
+
+    Args:
+        model (GESAnalysis): Model
+        category (str): Category
+
+    Returns:
+        List[Tuple[str, str, Any, Dict[str, str]]]: File, year, data and index of the columns of each file
+    """
+    files = []
+    for file, values_ges in model.get_data().items():
+        if values_ges["category"] != category:
+            continue
+        files.append((file, values_ges["year"], values_ges["data"], model.get_index_from_file(file)))
+    return files
+
+
 
 #######################################################################################################
 #  Getters                                                                                            #
@@ -62,39 +88,45 @@ def check_value(
 ######### Name of column #########
 def get_name_column(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    column: str
+    column: str,
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[str]:
     """ Get the full name (name+unit) of a column
 
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]): Dictionary of data
         column (str): a name of column
+        index (Dict[str, str], optional): Index of the columns of the file (see GESAnalysis.get_index_from_file). Defaults to None
 
     Returns:
         Optional[str]: The full name of the column. Else None
     """
-    name_col = list(reader.keys())
-    for c in name_col:
-        if column == " ".join(reader[c]["name"]):
+    if index is not None:
+        return index.get(column)
+    
+    for c, data_column in reader.items():
+        if column == " ".join(data_column["name"]):
             return c
     return None
 
 
 def get_name_from_columns(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    list_column: List[str]
+    list_column: List[str],
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[List[Union[str, int, float, bool]]]:
     """ Returns the name associated of a column in list_columns in the reader
 
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]): Dictionary
         list_column (List[str]): List of columns
+        index (Dict[str, str], optional): Index of the columns of the file. Defaults to None
 
     Returns:
         Optional[List[Union[str, int, float, bool]]]: Name associated to a column from list_column
     """
     for col in list_column:
-        data_col = get_name_column(reader, col)
+        data_col = get_name_column(reader, col, index)
         if data_col is not None:
             return data_col
     return None
@@ -103,80 +135,127 @@ def get_name_from_columns(
 ######### Data of column #########
 def get_data(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    column: str
+    column: str,
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[List[Union[str, int, float, bool]]]:
     """ Returns the data associated to the column 'column' in the dictionary 'reader'
     
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]) : the dictionary
         column (str): the column
+        index (Dict[str, str], optional): Index of the columns of the file. Defaults to None
 
     Returns:
         List[Union[str, int, float, bool]] | None: The data associated to the column if the column exist, else None
     """
-    name_col = list(reader.keys())
-    for c in name_col:
-        if column == " ".join(reader[c]["name"]):
-            return reader[c]["data"]
-    return None
+    name_col = get_name_column(reader, column, index)
+    if name_col is None:
+        return None
+    return reader[name_col]["data"]
 
 
 def get_data_from_columns(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    list_column: List[str]
+    list_column: List[str],
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[List[Union[str, int, float, bool]]]:
     """ Returns the data associated of a column in list_columns in the reader
 
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]): Dictionary
         list_column (List[str]): List of columns
+        index (Dict[str, str], optional): Index of the columns of the file. Defaults to None
 
     Returns:
         Optional[List[Union[str, int, float, bool]]]: Data associated to a column from list_column
     """
     for col in list_column:
-        data_col = get_data(reader, col)
+        data_col = get_data(reader, col, index)
         if data_col is not None:
             return data_col
     return None
     
 
+######### Sum of each row of column #########
+def get_sum_data(
+    reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
+    column: str,
+    index: Optional[Dict[str, str]] = None
+) -> Optional[numpy.ndarray]:
+    """ Returns the sum of the values of each row of the column 'column' in the dictionary 'reader'.
+        With a ColumnarData, the sums are computed on the NumPy arrays
+
+    Args:
+        reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]): the dictionary
+        column (str): the column
+        index (Dict[str, str], optional): Index of the columns of the file. Defaults to None
+
+    Returns:
+        numpy.ndarray | None: Sum of each row if the column exist, else None
+    """
+    name_col = get_name_column(reader, column, index)
+    if name_col is None:
+        return None
+    
+    data = reader[name_col]["data"]
+    if isinstance(reader, ColumnarData) and reader.get_values(name_col).dtype.kind in "biuf":
+        values = reader.get_values(name_col)
+        # Keep integers as integers (the sum of int is an int)
+        if values.dtype.kind != "f":
+            values = values.astype(numpy.int64)
+        offsets = reader.get_offsets(name_col)
+        if offsets is None:
+            return values
+        # reduceat only on the rows with values : the values of a row go until the start of the next row with values.
+        # The empty rows keep a sum of 0
+        sums = numpy.zeros(len(offsets) - 1, dtype=values.dtype)
+        not_empty = offsets[:-1] != offsets[1:]
+        if not_empty.any():
+            sums[not_empty] = numpy.add.reduceat(values, offsets[:-1][not_empty])
+        return sums
+    
+    return numpy.array([sum(row) for row in data])
+    
+
 ######### Type of column #########
 def get_type(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    column: str
+    column: str,
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[Union[str, bool, int, float]]:
     """ Returns the type associated to the column 'column' in the dictionary 'reader'
     
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]) : the dictionary
         column (str): the column
+        index (Dict[str, str], optional): Index of the columns of the file. Defaults to None
 
     Returns:
         Union[str, int, float, bool] | None: The type associated to the column if the column exist, else None
     """
-    name_col = list(reader.keys())
-    for c in name_col:
-        if column == " ".join(reader[c]["name"]):
-            return reader[c]["type"]
-    return None
+    name_col = get_name_column(reader, column, index)
+    if name_col is None:
+        return None
+    return reader[name_col]["type"]
 
 
 def get_type_from_columns(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    list_columns: List[str]
+    list_columns: List[str],
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[Union[str, bool, int, float]]:
     """ Returns the type associated of a column in list_columns in the reader
 
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]): Dictionary
         list_column (List[str]): List of columns
+        index (Dict[str, str], optional): Index of the columns of the file. Defaults to None
 
     Returns:
         Optional[List[Union[str, int, float, bool]]]: Type associated to a column from list_column
     """
     for col in list_columns:
-        type = get_type(reader, col)
+        type = get_type(reader, col, index)
         if type is not None:
             return type
     return None
@@ -185,39 +264,42 @@ def get_type_from_columns(
 ######### Unit of column #########
 def get_unit(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    column: str
+    column: str,
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[List[str]]:
     """ Return the unit associated to the column 'column' in the dictionary 'reader'
 
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]): Dictionnaire de données
         column (str): Nom de colonne
+        index (Dict[str, str], optional): Index des colonnes du fichier. Defaults to None
         
     Returns:
         List[str] | None: List of strings if the column was found, else None
     """
-    name_col = list(reader.keys())
-    for c in name_col:
-        if column == " ".join(reader[c]["name"]):
-            return reader[c]["unit"]
-    return None
+    name_col = get_name_column(reader, column, index)
+    if name_col is None:
+        return None
+    return reader[name_col]["unit"]
 
 
 def get_unit_from_columns(
     reader: Dict[str, Dict[str, List[Union[str, int, float, bool]]]],
-    list_columns: List[str]
+    list_columns: List[str],
+    index: Optional[Dict[str, str]] = None
 ) -> Optional[List[str]]:
     """ Returns the unit of a column from a list of columns in the dictionary 'reader'
 
     Args:
         reader (Dict[str, Dict[str, List[Union[str, int, float, bool]]]]): Dictionary
         list_columns (List[str]): List of columns
+        index (Dict[str, str], optional): Index of the columns of the file. Defaults to None
 
     Returns:
         Optional[List[str]]: Unit
     """
     for col in list_columns:
-        unit = get_unit(reader, col)
+        unit = get_unit(reader, col, index)
         if unit is not None:
             return unit
     return None
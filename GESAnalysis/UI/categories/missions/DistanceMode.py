@@ -10,9 +10,12 @@ import matplotlib
 
 matplotlib.use('Qt5Agg')
 
+import numpy
 import GESAnalysis.UI.categories.common as common
 
 from PyQt5 import QtCore, QtWidgets
+from GESAnalysis.FC.MissionCube import MissionCube
+from GESAnalysis.UI.categories.BarArtists import BarArtists
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
 from matplotlib.figure import Figure
 from typing import Any, Optional, List, Tuple, Dict, Union
@@ -49,13 +52,15 @@ class DistanceMode(QtWidgets.QWidget):
         self.__mode_dict = {}     # Dictionary where the key is the mode of transport and the value his index
         self.__position_dict = {} # Same with position
         self.__years_dict = {}    # Same with year
-        self.__data_dict = {}    # Dictionary where the key is a year and the value a list with distance for all mode
+        self.__data_dict = MissionCube([], [], []) # Cube with the distance for each mode, position and year
         self.__unit = ""
         
         # Create figure
         self.__fig = Figure()
         self.__axes = self.__fig.add_subplot(111)
         self.__figCanvas = FigureCanvasQTAgg(self.__fig)
+        self.__bar_artists = BarArtists(self.__axes)
+        self.__is_bars_drawn = False # The graph has bars (True) or curves (False)
         
         # Initialisation UI
         self.__init_UI()
@@ -184,16 +189,20 @@ class DistanceMode(QtWidgets.QWidget):
 #  Draw the graph in the canvas                                                                       #
 #######################################################################################################  
     def __draw(self):
-        """ Draw the data in the canvas
+        """ Draw the data in the canvas.
+            The bars are updated in place, the curves are drawn again
         """
-        self.__axes.cla() # clear the canvas
-        
-        if self.__is_bars_selected:  
+        if self.__is_bars_selected:
+            # Remove the curves
+            if not self.__is_bars_drawn:
+                self.__bar_artists.reset()
             self.__draw_bars()
         else:
+            self.__bar_artists.reset() # clear the canvas
             self.__draw_curve()
+        self.__is_bars_drawn = self.__is_bars_selected
         self.__axes.set_ylabel(f"Distance ({self.__unit})")
-        self.__figCanvas.draw()
+        self.__figCanvas.draw_idle()
         
     
     def __draw_bars(self):
@@ -206,8 +215,21 @@ class DistanceMode(QtWidgets.QWidget):
         # Get all the data to draw the bars for each mode
         x_bars, bars_labels, x_labels, labels = self.__get_x_val_label()
         y_labels = [year for year, mode in bars_labels]     # Contains the label for each bars
-        sum_y = [0 for i in x_bars]                         # Useful for stacked bars
+        sum_y = numpy.zeros(len(x_bars))                    # Useful for stacked bars
         position_draw = []                                  # Contains the position draw in the graph
+        bars_draw = []                                      # Contains the bars of each position draw
+        
+        # A position has a bar for each mode and year of the cube, the bars not displayed are hidden.
+        # So the bars are kept when the buttons change
+        nb_years = len(self.__data_dict.get_years())
+        nb_cells = len(self.__data_dict.get_modes()) * nb_years
+        cells = [self.__data_dict.get_index_mode(mode) * nb_years + self.__data_dict.get_index_year(year) for year, mode in bars_labels]
+        x_cells = numpy.zeros(nb_cells)
+        x_cells[cells] = x_bars
+        visible_cells = numpy.zeros(nb_cells, dtype=bool)
+        visible_cells[cells] = True
+        
+        self.__bar_artists.begin()
         for position in self.__position_dict.keys():
             if not self.__position_dict[position]["checked"]:
                 continue
@@ -225,21 +247,26 @@ class DistanceMode(QtWidgets.QWidget):
                     raise ValueError(f"has different labels for bars for position '{position}'")
             
             # Draw bars
-            self.__axes.bar(x_bars, y_values, width=self.__width, bottom=sum_y, linewidth=0.5, edgecolor='black')
+            y_cells = numpy.zeros(nb_cells)
+            y_cells[cells] = y_values
+            bottom_cells = numpy.zeros(nb_cells)
+            bottom_cells[cells] = sum_y
+            bars = self.__bar_artists.bar(position, x_cells, y_cells, self.__width, bottom=bottom_cells, visible=visible_cells, linewidth=0.5, edgecolor='black')
             
             # Update values for next bars
-            sum_y = [(lambda x,y: x+y)(sum_y[i], y_values[i]) for i in range(len(sum_y))]
+            sum_y += y_values
             position_draw.append(position)
+            bars_draw.append(bars)
         
         # Add text to precise which year corresponding to the bar
         self.__set_text_bars(x_bars, sum_y, y_labels)
+        self.__bar_artists.end()
 
         # Add labels on x-axis
         self.__axes.set_xticks(x_labels, labels)
         
         # Display legend if there some mode
-        if len(position_draw):
-            self.__axes.legend(position_draw)
+        self.__bar_artists.legend(bars_draw, position_draw)
             
     
     def __set_text_bars(self, bars_pos: List[Union[int, float]], len_bars: List[Union[int, float]], y_labels: List[str]) -> None:
@@ -254,8 +281,15 @@ class DistanceMode(QtWidgets.QWidget):
             return
         size_text = self.__default_size_text -  1.15*len(self.__years_dict.keys())
         max_bars = max(len_bars)
-        for i, label in enumerate(y_labels):
-            self.__axes.text(bars_pos[i], len_bars[i]+ self.__ratio_text*max_bars, label, ha='center', color='black', fontsize=size_text)
+        self.__bar_artists.text(
+            "years",
+            bars_pos,
+            [len_bar + self.__ratio_text*max_bars for len_bar in len_bars],
+            y_labels,
+            ha='center',
+            color='black',
+            fontsize=size_text
+        )
         
     
     def __get_x_val_label(self) -> Tuple[List[Union[int, float]], List[Union[int, float]], List[str]]:
@@ -274,20 +308,20 @@ class DistanceMode(QtWidgets.QWidget):
         x_labels = []
         labels = []
         current_ind = 0
-        for mode, data_mode in self.__data_dict.items():
+        # Distance of each mode and year for all the positions, and for the positions checked
+        distance = self.__data_dict.get_layer("distance")
+        sum_mode_year = distance.sum(axis=MissionCube.axis_position)
+        sum_mode_year_checked = distance[:, self.__get_checked(self.__position_dict), :].sum(axis=MissionCube.axis_position)
+        for mode_ind, mode in enumerate(self.__data_dict.get_modes()):
             if not self.__mode_dict[mode]["checked"]:
                 continue
             
             active_year_mode = 0
-            for year, sum_year in data_mode["sum"].items():
-                if not self.__years_dict[year]["checked"] or sum_year == 0:
+            for year_ind, year in enumerate(self.__data_dict.get_years()):
+                if not self.__years_dict[year]["checked"] or sum_mode_year[mode_ind, year_ind] == 0:
                     continue
                 
-                s = 0
-                for position, data_position in data_mode["data"].items():
-                    if self.__position_dict[position]["checked"]:
-                        s += data_position[year]
-                if s == 0:
+                if sum_mode_year_checked[mode_ind, year_ind] == 0:
                     continue
                 
                 x_bars.append(current_space)
@@ -320,10 +354,12 @@ class DistanceMode(QtWidgets.QWidget):
         Returns:
             Tuple[List[Union[int, float]], List[str]]: Values of distance for each bar of position 'position'
         """
+        distance = self.__data_dict.get_layer("distance")
+        position_ind = self.__data_dict.get_index_position(position)
         y = []
         labels = []
         for year, mode in year_mode:
-            y.append(self.__data_dict[mode]["data"][position][year])
+            y.append(distance[self.__data_dict.get_index_mode(mode), position_ind, self.__data_dict.get_index_year(year)].item())
             labels.append(year)
         return y, labels
     
@@ -340,21 +376,19 @@ class DistanceMode(QtWidgets.QWidget):
             x_labels[mode] = x
             x += self.__spacing
 
-        # Calculate th y value for each year
+        # Calculate th y value for each year : distance of each mode and year for the positions checked
+        distance = self.__data_dict.get_layer("distance")
+        sum_mode_year = distance[:, self.__get_checked(self.__position_dict), :].sum(axis=MissionCube.axis_position)
         has_year = False
         for year in self.__years_dict.keys():
             if not self.__years_dict[year]["checked"]:
                 continue
+            year_ind = self.__data_dict.get_index_year(year)
             
             x_year = []
             y_year = []
             for mode in x_labels.keys():
-                s = 0
-                for position in self.__position_dict.keys():
-                    if not self.__position_dict[position]["checked"]:
-                        continue
-                    
-                    s += self.__data_dict[mode]["data"][position][year]
+                s = sum_mode_year[self.__data_dict.get_index_mode(mode), year_ind].item()
                 
                 # If there are no value, we don't plot the year
                 if s == 0:
@@ -375,6 +409,18 @@ class DistanceMode(QtWidgets.QWidget):
             self.__axes.legend()
 
     
+    def __get_checked(self, data_dict) -> numpy.ndarray:
+        """ Get a mask of the buttons checked (used for modes, years and positions)
+
+        Args:
+            data_dict (dict): dictionary with data (mode, year, position)
+
+        Returns:
+            numpy.ndarray: True if the button is checked, in the order of the dictionary
+        """
+        return numpy.array([data["checked"] for data in data_dict.values()], dtype=bool)
+
+    
 #######################################################################################################
 #  Mouse event to change the graph                                                                    #
 #######################################################################################################
@@ -447,7 +493,7 @@ class DistanceMode(QtWidgets.QWidget):
         self.__position_dict = self.__update_structure(position_dict)
         self.__years_dict = self.__update_structure(year_dict)
 
-        self.__data_dict = self.__rearrange_data_dict(data_dict["data"].copy())
+        self.__data_dict = data_dict["data"]
         self.__unit = data_dict["unit_distance"]
         
         # Repaint the UI
@@ -460,33 +506,6 @@ class DistanceMode(QtWidgets.QWidget):
         self.__draw()
         
         
-    def __rearrange_data_dict(self, data_dict):
-        """ Arrange data for the graph
-
-        Args:
-            data_dict : Data
-
-        Returns:
-            Data for graph
-        """
-        dictionary = {}
-        for mode, data_mode in data_dict.items():
-            dictionary[mode] = {
-                "data": {},
-                "sum": {}
-            }
-            # Fill "data"
-            for position, data_position in data_mode["data"].items():
-                dictionary[mode]["data"][position] = {}
-                for year, data_year in data_position.items():
-                    dictionary[mode]["data"][position][year] = data_year["total_distance"]
-            # Fill "sum"
-            for year, sum_year in data_mode["sum"].items():
-                dictionary[mode]["sum"][year] = sum_year["distance"]
-        
-        return dictionary
-    
-    
     def __update_structure(self, data_dict):
         """ Update the structure for dictionary
 
@@ -6,12 +6,15 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
+import numpy
 import GESAnalysis.UI.categories.common as common
 import matplotlib
 
 matplotlib.use('Qt5Agg')
 
 from PyQt5 import QtWidgets, QtCore
+from GESAnalysis.FC.MissionCube import MissionCube
+from GESAnalysis.UI.categories.BarArtists import BarArtists
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
 from matplotlib.figure import Figure
 from functools import partial
@@ -35,7 +38,7 @@ class EmissionMode(QtWidgets.QWidget):
         
         self.__mode_dict = {}     # Dictionary where the key is the mode of transport and the value his index
         self.__years_dict = {}    # Same with year
-        self.__emission_dict = {}    # Dictionary where the key is a year and the value a list with distance for all mode
+        self.__emission_dict = MissionCube([], [], []) # Cube with the emission of the missions for each mode, position and year
         self.__is_pourcentage = False
         self.__accumulate = False
         self.__with_contrails = False
@@ -47,6 +50,8 @@ class EmissionMode(QtWidgets.QWidget):
         self.__fig = Figure()
         self.__axes = self.__fig.add_subplot(111)
         self.__figCanvas = FigureCanvasQTAgg(self.__fig)
+        self.__bar_artists = BarArtists(self.__axes)
+        self.__is_bars_drawn = False # The graph has bars (True) or curves (False)
         
         # Initialisation UI
         self.__init_UI()
@@ -228,16 +233,20 @@ class EmissionMode(QtWidgets.QWidget):
 #  Draw the graph in the canvas                                                                       #
 #######################################################################################################    
     def __draw(self) -> None:
-        """ Draw the graph into the canvas
+        """ Draw the graph into the canvas.
+            The bars are updated in place, the curves are drawn again
         """
-        # Clear the graph
-        self.__axes.cla()
-        
         # Draw the graph with bars or curves depending on the parameters
         if self.__is_bars_selected:
+            # Remove the curves
+            if not self.__is_bars_drawn:
+                self.__bar_artists.reset()
             self.__draw_bars()
         else:
+            # Clear the graph
+            self.__bar_artists.reset()
             self.__draw_curve()
+        self.__is_bars_drawn = self.__is_bars_selected
         
         # Construct the label for y-axis depending on the parameters
         label_y = "Nombre d'émissions"
@@ -254,8 +263,8 @@ class EmissionMode(QtWidgets.QWidget):
                 label_y += f" ({self.__unit_emission})"
         self.__axes.set_ylabel(label_y)
         
-        # Draw the graph
-        self.__figCanvas.draw()
+        # Draw the graph when Qt is idle
+        self.__figCanvas.draw_idle()
 
     
     def __draw_bars(self) -> None:
@@ -263,6 +272,9 @@ class EmissionMode(QtWidgets.QWidget):
         """
         has_bars = False
         nb_missions = 0
+        bars_draw = []   # Bars of each mode and year draw, for the legend
+        labels_draw = [] # Mode of each bars draw
+        self.__bar_artists.begin()
         for year in self.__years_dict.keys():
             # No need to draw a bar for a year who are not selected by the user
             if not self.__years_dict[year]["checked"]:
@@ -277,17 +289,21 @@ class EmissionMode(QtWidgets.QWidget):
             for mode in emission_mode:
                 if len(emission_mode[mode]["mission"]) == 0:
                     continue
-                self.__axes.bar(emission_mode[mode]["mission"], emission_mode[mode]["value"], width=self.__width, label=mode)
+                bars = self.__bar_artists.bar((year, mode), emission_mode[mode]["mission"], emission_mode[mode]["value"], self.__width)
+                bars_draw.append(bars)
+                labels_draw.append(mode)
                 has_bars = True
                 nb_missions_mode += len(emission_mode[mode]["mission"]) 
         
             if nb_missions < nb_missions_mode:
                 nb_missions = nb_missions_mode
     
+        self.__bar_artists.end()
+    
         # Display legend if there are some bars plot
         if has_bars:
             self.__axes.set_xlim(left=0, right=nb_missions)
-            self.__axes.legend()
+        self.__bar_artists.legend(bars_draw, labels_draw)
     
     
     def __get_x_bars(self, year: str) -> Dict[str, Dict[str, List[Union[int, float]]]]:
@@ -305,26 +321,13 @@ class EmissionMode(QtWidgets.QWidget):
         # - value: a list with the emission due to the mission by the moe
         x_label_value = {}
         
-        # Use the correct dictionary with contrails or not
-        use_dict = self.__emission_dict["normal"]
-        if self.__with_contrails:
-            use_dict = self.__emission_dict["contrails"]
-            
-        for mode in self.__mode_dict.keys():
-            x_label_value[mode] = {"mission" : [], "value": []}
-        
-        data_year = use_dict[year]["data"]
-        data_year_sum = use_dict[year]["sum"]
-        value_accumulate = 0
-        for val_ind, val in enumerate(data_year):
-            emission, mode = val
-            x_label_value[mode]["mission"].append(val_ind + 1)
-            
-            # Depending on the parameters, we calculate the correct value
-            # Pourcentage or value, and if it's accumulate
-            value_modif = 100*emission/data_year_sum if self.__is_pourcentage else emission
-            value_accumulate += value_modif
-            x_label_value[mode]["value"].append(value_accumulate if self.__accumulate else value_modif)
+        # Values of the missions in descending order, with the mode of each mission
+        emission, mode_missions = self.__get_values_year(year)
+        missions = numpy.arange(1, len(emission) + 1)
+        
+        for mode_ind, mode in enumerate(self.__emission_dict.get_modes()):
+            selected = mode_missions == mode_ind
+            x_label_value[mode] = {"mission" : missions[selected].tolist(), "value": emission[selected].tolist()}
 
         return x_label_value
         
@@ -367,28 +370,40 @@ class EmissionMode(QtWidgets.QWidget):
         # Structure is the same as bars
         x_label_value = {"mission": [], "value": []}
         
-        # Use the correct dictionary with contrails or not
-        use_dict = self.__emission_dict["normal"]
-        if self.__with_contrails:
-            use_dict = self.__emission_dict["contrails"]
-        
-        data_year = use_dict[year]["data"]
-        data_year_sum = use_dict[year]["sum"]
-        value_accumulate = 0
+        emission, _ = self.__get_values_year(year)
         if self.__accumulate:
             x_label_value["mission"].append(0)
             x_label_value["value"].append(0)
-        for val_ind, val in enumerate(data_year):
-            value = val[0]
-            x_label_value["mission"].append(val_ind + 1)
-            
-            # Depending on the parameters, we calculate the correct value
-            # Pourcentage or value, and if it's accumulate
-            value_modif = 100*value/data_year_sum if self.__is_pourcentage else value
-            value_accumulate += value_modif
-            x_label_value["value"].append(value_accumulate if self.__accumulate else value_modif)
+        x_label_value["mission"].extend(range(1, len(emission) + 1))
+        x_label_value["value"].extend(emission.tolist())
             
         return x_label_value
+    
+    
+    def __get_values_year(self, year: str) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ Get the values to plot for each mission of a year, in descending order of emission.
+            Depending on the parameters, the values are the emission with contrails or not,
+            in pourcentage of the total of the year or not, and accumulate or not
+
+        Args:
+            year (str): A year
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: Values and index of the mode of each mission
+        """
+        # Use the correct measure with contrails or not
+        measure = "emission_contrails" if self.__with_contrails else "emission"
+        emission, mode_missions = self.__emission_dict.get_missions_year(measure, year)
+        
+        # Pourcentage of the total of the year
+        if self.__is_pourcentage:
+            total_year = self.__emission_dict.get_total(measure, (MissionCube.axis_mode, MissionCube.axis_position))[self.__emission_dict.get_index_year(year)]
+            if total_year != 0:
+                emission = 100*emission/total_year
+        
+        if self.__accumulate:
+            emission = numpy.cumsum(emission)
+        return emission, mode_missions
 
 
 #######################################################################################################
@@ -495,7 +510,7 @@ class EmissionMode(QtWidgets.QWidget):
         
         self.__mode_dict = self.__update_structure(mode_ind)
         self.__years_dict = self.__update_structure(years_ind)
-        self.__emission_dict = self.__rearrange_data(data_dict["data"].copy())
+        self.__emission_dict = data_dict["data"]
         self.__unit_emission = data_dict["unit_emission"]
         self.__unit_emission_contrails = data_dict["unit_emission_contrails"]
         
@@ -510,50 +525,6 @@ class EmissionMode(QtWidgets.QWidget):
         self.__draw()
         
         
-    def __rearrange_data(self, data_dict):
-        """ Arrange data for the graph
-
-        Args:
-            data_dict : Data
-
-        Returns:
-            Data for graph
-        """
-        dictionary = {}
-        dictionary["normal"] = {}
-        dictionary["contrails"] = {}
-        for year in self.__years_dict.keys():
-            dictionary["normal"][year] = {
-                "data" :[],
-                "sum": 0
-            }
-            dictionary["contrails"][year] = {
-                "data" :[],
-                "sum": 0
-            }
-        
-        # Arrange data into the dictionary
-        for mode, data_mode in data_dict.items():
-            for position, position_data in data_mode["data"].items():
-                for year, year_data in position_data.items():
-                    missions = year_data["mission"]
-                    for value in missions:
-                        emis = value[2]
-                        emis_contrails = value[3]
-                        dictionary["normal"][year]["data"].append((emis, mode))
-                        dictionary["normal"][year]["sum"] += emis
-                        dictionary["contrails"][year]["data"].append((emis_contrails, mode))
-                        dictionary["contrails"][year]["sum"] += emis_contrails
-        
-        # Sort value of emission by descending order
-        for d in dictionary.values():
-            for data_year in d.values():
-                data_year["data"].sort(key=lambda a:a[0], reverse=True)
-                data_year["data"].sort(key=lambda a:a[0], reverse=True)
-
-        return dictionary
-    
-
     def __update_structure(self, data_dict):
         """ Update the structure for dictionary
 
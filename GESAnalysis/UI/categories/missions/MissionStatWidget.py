@@ -9,6 +9,7 @@
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtCore import QEvent, QObject
 from PyQt5.QtWidgets import QSizePolicy
+from typing import Union
 from GESAnalysis.FC.Controleur import Controleur
 
 from GESAnalysis.UI.ExportStatDialog import ExportStatDialog
@@ -126,63 +127,53 @@ class MissionStatWidget(QtWidgets.QWidget):
         selected_category = self.__combobox_choice.currentText()
         selected_year = self.__combobox_year.currentText()
         
-        # Depending on the choice, set a variable to corresponding key in the data structure
-        corres_data_dict = ""
+        # Depending on the choice, set a variable to corresponding measure in the cube
+        measure = ""
         if selected_category == "Missions":
-            corres_data_dict = "mission"
+            measure = "mission"
         elif selected_category == "Distance":
-            corres_data_dict = "total_distance"
+            measure = "distance"
         elif selected_category == "Emission":
-            corres_data_dict = "total_emission"
+            measure = "emission"
         else:
-            corres_data_dict = "total_emission_contrails"
+            measure = "emission_contrails"
         
-        # Dictionary of position and calculate the total
-        total_position_dict = {}
-        for position in self.__position_dict.keys():
-            total_position_dict[position] = 0
-
-        # Fill the table for each mode and position
-        data_all_mode = 0
-        for mode_ind, mode in enumerate(self.__mode_stat_list):
-            if mode == "total":
-                continue
-            data_total_mode = 0
-            for pos_ind, position in enumerate(self.__position_stat_list):
-                if position == "total":
-                    data = str(data_total_mode)
-                    data_item = QtWidgets.QTableWidgetItem(data)
-                    data_item.setFlags(QtCore.Qt.ItemIsSelectable |  QtCore.Qt.ItemIsEnabled)
-                    self.__tab_stats.setItem(mode_ind, pos_ind, data_item)
-                    continue
-                
-                data = self.__data_dict["data"][mode]["data"][position][selected_year][corres_data_dict]
-                if selected_category == "Missions":
-                    data = len(data)
-                data_total_mode += data
-                total_position_dict[position] += data
-                data = str(data)
-                data_item = QtWidgets.QTableWidgetItem(data)
-                data_item.setFlags(QtCore.Qt.ItemIsSelectable |  QtCore.Qt.ItemIsEnabled)
-                self.__tab_stats.setItem(mode_ind, pos_ind, data_item)
-            data_all_mode += data_total_mode
+        # Values of each mode and position for the year, and the totals of the rows and the columns
+        cube = self.__data_dict["data"]
+        table = cube.get_layer(measure)[:, :, cube.get_index_year(selected_year)]
+        total_mode = table.sum(axis=1)
+        total_position = table.sum(axis=0)
         
-        # Fill the table for each position and the mode is "total"
+        # The rows and the columns of the table are in the order of the cube
         index_total_mode = self.__mode_stat_list.index("total")
-        data_all_position = 0
-        for pos_ind, position in enumerate(self.__position_dict.keys()):
-            data_pos = total_position_dict[position]
-            data = str(data_pos)
-            data_item = QtWidgets.QTableWidgetItem(data)
-            data_item.setFlags(QtCore.Qt.ItemIsSelectable |  QtCore.Qt.ItemIsEnabled)
-            self.__tab_stats.setItem(index_total_mode, pos_ind, data_item)
-            data_all_position += data_pos
+        index_total_position = self.__position_stat_list.index("total")
+        table = table.tolist()
+        for mode_ind, data_mode in enumerate(table):
+            for pos_ind, data in enumerate(data_mode):
+                self.__set_item(mode_ind, pos_ind, data)
+            self.__set_item(mode_ind, index_total_position, total_mode[mode_ind].item())
+        for pos_ind, data in enumerate(total_position.tolist()):
+            self.__set_item(index_total_mode, pos_ind, data)
         
         # Fill the case of "total", "total"
-        index_total_position = self.__position_stat_list.index("total")
-        total_item = total_item = QtWidgets.QTableWidgetItem("ERROR" if data_all_position != data_all_mode else str(data_all_mode))  
+        data_all_mode = total_mode.sum()
+        data_all_position = total_position.sum()
+        total_item = QtWidgets.QTableWidgetItem("ERROR" if data_all_position != data_all_mode else str(data_all_mode.item()))
         total_item.setFlags(QtCore.Qt.ItemIsSelectable |  QtCore.Qt.ItemIsEnabled)          
         self.__tab_stats.setItem(index_total_mode, index_total_position, total_item)
+        
+        
+    def __set_item(self, row: int, column: int, data: Union[int, float]) -> None:
+        """ Set a value in a cell of the table
+
+        Args:
+            row (int): Row
+            column (int): Column
+            data (Union[int, float]): Value
+        """
+        data_item = QtWidgets.QTableWidgetItem(str(data))
+        data_item.setFlags(QtCore.Qt.ItemIsSelectable |  QtCore.Qt.ItemIsEnabled)
+        self.__tab_stats.setItem(row, column, data_item)
             
 
 #######################################################################################################
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import numpy
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from GESAnalysis.FC.MissionCube import MissionCube
+import GESAnalysis.UI.categories.common as common
+
+
+class MissionsData:
+    """ Compute the data of the category "Missions" from the files.
+        It doesn't use Qt, so the computation can be done in another thread than the UI (see AggregateRunner)
+    """
+    
+    # Column to get the data from the files
+    column_name_mission = ["name"]
+    column_mode = ["mode"]
+    column_position = ["position"]
+    column_distance = ["distance"]
+    column_emission = ["emission"]
+    column_emission_contrails = ["emission withcontrails"]
+    
+    
+    def __init__(self) -> None:
+        """ Initialise the class
+        """
+        self.__aggregates = {}   # Dictionary where the key is a file and the value the data of the file and his aggregates
+        self.__partials = {}     # Dictionary where the key is a file and the value his partial cube added in the cube
+        self.__cube = MissionCube([], [], []) # Sum of the partial cubes of the files
+        self.__lock = threading.Lock()
+        
+        
+    def configure(
+        self,
+        files_category: List[Tuple[str, str, Any, Dict[str, str]]],
+        is_cancelled: Callable[[], bool] = lambda: False
+    ) -> Optional[Dict[str, dict]]:
+        """ Configure the data for the canvas (distance/emission).
+            The aggregates and the partial cube mode x position x year of each file are computed once (see __get_aggregate_file),
+            then only the partial cubes of the files who are opened or closed are added or removed from the cube (see MissionCube)
+
+        Args:
+            files_category (List[Tuple[str, str, Any, Dict[str, str]]]): File, year, data and index of each file (see common.get_files_category)
+            is_cancelled (Callable[[], bool], optional): Returns True if the computation must stop. Defaults to lambda: False.
+
+        Returns:
+            Optional[Dict[str, dict]]: Dictionaries "files", "mode_ind", "position_ind", "years_ind" and "data". None if the computation was cancelled
+        """
+        # The aggregates are shared by the computations : only one at a time
+        with self.__lock:
+            return self.__configure(files_category, is_cancelled)
+        
+        
+    def __configure(
+        self,
+        files_category: List[Tuple[str, str, Any, Dict[str, str]]],
+        is_cancelled: Callable[[], bool]
+    ) -> Optional[Dict[str, dict]]:
+        """ Configure the data (see configure)
+
+        Args:
+            files_category (List[Tuple[str, str, Any, Dict[str, str]]]): File, year, data and index of each file
+            is_cancelled (Callable[[], bool]): Returns True if the computation must stop
+
+        Returns:
+            Optional[Dict[str, dict]]: Dictionaries "files", "mode_ind", "position_ind", "years_ind" and "data". None if the computation was cancelled
+        """
+        files = {}        # Dictionary where the key is the file in the category and a bool if it's read or not
+        mode_ind = {}     # Dictionary where the key is the mode of transport and the value his index
+        years_ind = {}    # Same with year
+        position_ind = {} # Same with position
+        
+        ind_mode = 0
+        ind_year = 0
+        ind_position = 0
+        unit_distance = ""
+        unit_emission = ""
+        unit_emission_contrails = ""
+        # Get all the mode, position and for each file
+        for file, year, data, index in files_category:
+            if is_cancelled():
+                return None
+            
+            aggregate = self.__get_aggregate_file(file, data, index)
+            
+            # Add file to files and set bool
+            files[file] = {"read": aggregate["read"], "warning": list(aggregate["warning"]), "year": year}
+                    
+            # If there are some warnings, we don't calculate
+            if not files[file]["read"]:
+                continue
+            
+            # Check the unit of distance
+            unit = aggregate["unit_distance"]
+            if unit is None:
+                files[file]["warning"].append(f"Colonne 'distance' n'a pas d'unité")
+            else:
+                unit = "/".join(unit)
+                if unit_distance == "":
+                    unit_distance = unit
+                if unit != unit_distance:
+                    files[file]["read"] = False
+                    files[file]["warning"].append(f"Colonne 'distance' a une unité différente")
+            
+            # Same with emission
+            unit = aggregate["unit_emission"]
+            if unit is None:
+                files[file]["warning"].append(f"Colonne 'emission' n'a pas d'unité")
+            else:
+                unit = "/".join(unit)
+                if unit_emission == "":
+                    unit_emission = unit
+                if unit != unit_emission:
+                    files[file]["read"] = False
+                    files[file]["warning"].append(f"Colonne 'emission' a une unité différente")
+                    
+            # Same with emission with contrails
+            unit = aggregate["unit_emission_contrails"]
+            if unit is None:
+                files[file]["warning"].append(f"Colonne 'emission avec trainées' n'a pas d'unité")
+            else:
+                unit = "/".join(unit)
+                if unit_emission_contrails == "":
+                    unit_emission_contrails = unit
+                if unit != unit_emission_contrails:
+                    files[file]["read"] = False
+                    files[file]["warning"].append(f"Colonne 'emission avec trainées' a une unité différente")   
+            
+            # If there are some warnings, we don't calculate
+            if not files[file]["read"]:
+                continue
+            
+            # Add the mode and the position into their dictionary
+            for mode in aggregate["mode"]:
+                mode_val = self.__analyse_mode(mode, mode_ind)
+                if mode_val not in mode_ind.keys():
+                    mode_ind[mode_val] = {"index": ind_mode}
+                    ind_mode += 1
+            for position_val in aggregate["position"]:
+                if position_val not in position_ind.keys():
+                    position_ind[position_val] = {"index": ind_position}
+                    ind_position += 1
+            
+            # Add year to his dictionary   
+            if year not in years_ind.keys():     
+                years_ind[year] = {"index": ind_year}
+                ind_year += 1
+        
+        # Remove the aggregates of the files who are closed or in another category
+        for file in list(self.__aggregates.keys()):
+            if file not in files:
+                del self.__aggregates[file]
+        
+        # Partial cube of each file in the cube
+        partials = {file: self.__get_partial_file(file, data_file["year"]) for file, data_file in files.items() if data_file["read"]}
+        
+        # Remove the partial cube of the files who are closed, changed or not read,
+        # then add the partial cube of the new files. The other files are not computed again
+        for file in list(self.__partials.keys()):
+            if partials.get(file) is not self.__partials[file]:
+                self.__cube.remove_cube(self.__partials.pop(file))
+        if len(self.__partials) == 0:
+            # Remove the labels of the closed files
+            self.__cube = MissionCube([], [], [])
+        for file, partial in partials.items():
+            if file in self.__partials:
+                continue
+            if is_cancelled():
+                return None
+            self.__cube.add_cube(partial)
+            self.__partials[file] = partial
+        
+        # Cube with the modes, positions and years of the files in their order.
+        # A mode and his plural can be the same mode (ex: 'avion' and 'avions')
+        modes_files = set()
+        for file in partials:
+            modes_files.update(self.__aggregates[file]["aggregate"]["mode"])
+        cube = self.__cube.regroup(
+            list(mode_ind.keys()),
+            list(position_ind.keys()),
+            list(years_ind.keys()),
+            [mode_ind[self.__analyse_mode(mode, mode_ind)]["index"] if mode in modes_files else -1 for mode in self.__cube.get_modes()],
+            [position_ind[position]["index"] if position in position_ind else -1 for position in self.__cube.get_positions()],
+            [years_ind[year]["index"] if year in years_ind else -1 for year in self.__cube.get_years()]
+        )
+                
+        return {
+            "files": files,
+            "mode_ind": mode_ind,
+            "position_ind": position_ind,
+            "years_ind": years_ind,
+            "data": {
+                "data": cube,
+                "unit_distance": unit_distance,
+                "unit_emission": unit_emission,
+                "unit_emission_contrails": unit_emission_contrails
+            }
+        }
+        
+        
+    def __get_aggregate_file(self, file: str, data: dict, index: dict) -> dict:
+        """ Get the aggregates of a file. They are computed only when the file is read for the 1st time
+
+        Args:
+            file (str): File
+            data (dict): Data of the file
+            index (dict): Index of the columns of the file
+
+        Returns:
+            dict: Aggregates of the file (see __aggregate_file)
+        """
+        # The aggregates are kept while the data of the file is the same
+        if file not in self.__aggregates or self.__aggregates[file]["data"] is not data:
+            self.__aggregates[file] = {
+                "data": data,
+                "aggregate": self.__aggregate_file(data, index),
+                "year": None,
+                "partial": None
+            }
+        return self.__aggregates[file]["aggregate"]
+    
+    
+    def __get_partial_file(self, file: str, year: str) -> MissionCube:
+        """ Get the partial cube of a file, with the modes (in lower case) and the positions of the file and his year.
+            It is computed only when the file is read for the 1st time or when his year changes
+
+        Args:
+            file (str): File
+            year (str): Year of the file
+
+        Returns:
+            MissionCube: Partial cube of the file
+        """
+        aggregate_file = self.__aggregates[file]
+        if aggregate_file["partial"] is None or aggregate_file["year"] != year:
+            aggregate = aggregate_file["aggregate"]
+            missions = aggregate["missions"]
+            partial = MissionCube(aggregate["mode"], aggregate["position"], [year])
+            partial.add(missions["mode"], missions["position"], 0, missions["distance"], missions["emission"], missions["emission_contrails"])
+            aggregate_file["year"] = year
+            aggregate_file["partial"] = partial
+        return aggregate_file["partial"]
+        
+        
+    def __aggregate_file(self, data: dict, index: dict) -> dict:
+        """ Check the columns of a file and get the distance and the emission of each mission with his mode (in lower case) and position.
+            These aggregates don't depend on the other files, so they are computed once for each file
+
+        Args:
+            data (dict): Data of the file
+            index (dict): Index of the columns of the file
+
+        Returns:
+            dict: Aggregates of the file :
+            {
+                "read": bool, "warning": [warnings],
+                "unit_distance": unit, "unit_emission": unit, "unit_emission_contrails": unit,
+                "mode": [modes in the order of the file], "position": [positions in the order of the file],
+                "missions": {"mode": array, "position": array, "distance": array, "emission": array, "emission_contrails": array}
+            }
+            where "missions" has one value for each mission (name) in the order of the file,
+            and the mode and the position are their index in "mode" and "position"
+        """
+        aggregate = {"read": True, "warning": []}
+        
+        compare_column = True
+        
+        mission = common.get_data_from_columns(data, self.column_name_mission, index)
+        if mission is None:
+            compare_column = False
+            aggregate["read"] = False
+            aggregate["warning"].append(f"Colonne 'name' non-trouvée")
+        
+        # Get the mode
+        mode = common.get_data_from_columns(data, self.column_mode, index)
+        if mode is None:
+            compare_column = False
+            aggregate["read"] = False
+            aggregate["warning"].append(f"Colonne 'mode' non-trouvée")
+        
+        # Get the position
+        position = common.get_data_from_columns(data, self.column_position, index)
+        if position is None:
+            compare_column = False
+            aggregate["read"] = False
+            aggregate["warning"].append(f"Colonne 'position' non-trouvée")
+        
+        # Check if there are the same number of lines between position and mode
+        if compare_column and len(mode) != len(position):
+            aggregate["read"] = False
+            aggregate["warning"].append(f"Colonnes 'mode' et 'position' n'ont pas les mêmes lignes")
+
+        # Check if the column distance exist and there is the same number of lines with mode and position
+        distance = common.get_data_from_columns(data, self.column_distance, index)
+        if distance is None:
+            aggregate["read"] = False
+            aggregate["warning"].append(f"Colonne 'distance' non-trouvée")
+        else:
+            # Check if there is the correct data type (int, float)
+            if common.get_type_from_columns(data, self.column_distance, index) not in [int, float]:
+                compare_column = False
+                aggregate["read"] = False
+                aggregate["warning"].append(f"Colonne 'distance' ne contient pas de chiffres")
+            if compare_column and (len(distance) != len(mode) or len(distance) != len(position)):
+                aggregate["read"] = False
+                aggregate["warning"].append(f"Colonne 'distance' a un nombre de ligne différent")
+                
+        emission = common.get_data_from_columns(data, self.column_emission, index)
+        if distance is None:
+            aggregate["read"] = False
+            aggregate["warning"].append(f"Colonne 'emission' non-trouvée")
+        else:
+            # Check if there is the correct data type (int, float)
+            if common.get_type_from_columns(data, self.column_emission, index) not in [int, float]:
+                compare_column = False
+                aggregate["read"] = False
+                aggregate["warning"].append(f"Colonne 'emission' ne contient pas de chiffres")
+            if compare_column and (len(distance) != len(mode) or len(distance) != len(position)):
+                aggregate["read"] = False
+                aggregate["warning"].append(f"Colonne 'emission' a un nombre de ligne différent")
+                
+        emission_contrails = common.get_data_from_columns(data, self.column_emission_contrails, index)
+        if emission_contrails is None:
+            aggregate["read"] = False
+            aggregate["warning"].append(f"Colonne 'emission avec trainées' non-trouvée")
+        else:
+            # Check if there is the correct data type (int, float)
+            if common.get_type_from_columns(data, self.column_emission_contrails, index) not in [int, float]:
+                compare_column = False
+                aggregate["read"] = False
+                aggregate["warning"].append(f"Colonne 'emission' ne contient pas de chiffres")
+            if compare_column and len(emission_contrails) != len(emission):
+                aggregate["read"] = False
+                aggregate["warning"].append(f"Colonne 'emission avec trainées' a un nombre de ligne différent")
+                
+        # If there are some warnings, we don't calculate
+        if not aggregate["read"]:
+            return aggregate
+        
+        # Units of the file, compared with the other files during the merge
+        aggregate["unit_distance"] = common.get_unit(data, "distance", index)
+        aggregate["unit_emission"] = common.get_unit(data, "emission", index)
+        aggregate["unit_emission_contrails"] = common.get_unit(data, "emission withcontrails", index)
+        
+        mission = common.get_data(data, "name", index)
+        mode = common.get_data(data, "mode", index)
+        position = common.get_data(data, "position", index)
+        
+        # Sum of each row (vectorized with a ColumnarData)
+        nb_rows = len(mission)
+        distance = common.get_sum_data(data, "distance", index)[:nb_rows]
+        emission = common.get_sum_data(data, "emission", index)[:nb_rows]
+        emission_contrails = common.get_sum_data(data, "emission withcontrails", index)[:nb_rows]
+        
+        # Index of the mode (in lower case) and of the position of each row, in the order of the file.
+        # The plural of a mode is found during the merge, with the modes of all the files
+        mode_codes = {}
+        mode_row = numpy.fromiter((mode_codes.setdefault(str(row[0]).lower(), len(mode_codes)) for row in islice(mode, nb_rows)), dtype=numpy.int64, count=nb_rows)
+        position_codes = {}
+        position_row = numpy.fromiter((position_codes.setdefault(str(row[0]), len(position_codes)) for row in islice(position, nb_rows)), dtype=numpy.int64, count=nb_rows)
+        
+        # A row has one mission for each name
+        nb_mission_row = numpy.fromiter((len(names) for names in mission), dtype=numpy.int64, count=nb_rows)
+        
+        # The modes and the positions in the order of the file
+        aggregate["mode"] = list(mode_codes.keys())
+        aggregate["position"] = list(position_codes.keys())
+        aggregate["missions"] = {
+            "mode": numpy.repeat(mode_row, nb_mission_row),
+            "position": numpy.repeat(position_row, nb_mission_row),
+            "distance": numpy.repeat(distance, nb_mission_row),
+            "emission": numpy.repeat(emission, nb_mission_row),
+            "emission_contrails": numpy.repeat(emission_contrails, nb_mission_row)
+        }
+        return aggregate
+        
+        
+    def __analyse_mode(self, mode: str, mode_ind: dict) -> str:
+        """ Test if a 'mode' is in the dictionary of mode
+
+        Args:
+            mode (str): Mode
+            mode_ind (dict): Dictionary of mode
+
+        Returns:
+            str: Mode in dictionary if it's in. Else return 'mode'
+        """
+        mode = mode.lower()
+        if mode in mode_ind.keys():
+            return mode
+        
+        mode_cpy = mode + "s"
+        if mode_cpy in mode_ind.keys():
+            return mode_cpy
+        return mode
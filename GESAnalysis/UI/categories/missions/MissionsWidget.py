@@ -6,14 +6,18 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
+from functools import partial
 from typing import List
 from PyQt5 import QtCore, QtWidgets
 from GESAnalysis.FC.GESAnalysis import GESAnalysis
 from GESAnalysis.FC.Controleur import Controleur
 from GESAnalysis.FC.PATTERNS.Observer import Observer
 from GESAnalysis.UI.FileOpenUI import FileOpenUI
+from GESAnalysis.UI import common as common_ui
+from GESAnalysis.UI.categories.AggregateRunner import AggregateRunner
 from .DistanceMode import DistanceMode
 from .EmissionMode import EmissionMode
+from .MissionsData import MissionsData
 from .MissionStatWidget import MissionStatWidget
 import GESAnalysis.UI.categories.common as common
 
@@ -22,14 +26,6 @@ class MissionsWidget(QtWidgets.QWidget, Observer):
     """ Widget use to regroup the graphs, the files opener and the stats of the category "Missions"
     """
     
-    # Column to get the data from the files
-    column_name_mission = ["name"]
-    column_mode = ["mode"]
-    column_position = ["position"]
-    column_distance = ["distance"]
-    column_emission = ["emission"]
-    column_emission_contrails = ["emission withcontrails"]
-     
     def __init__(
         self,
         model: GESAnalysis,
@@ -60,9 +56,13 @@ class MissionsWidget(QtWidgets.QWidget, Observer):
         self.__mode_ind = {}     # Dictionary where the key is the mode of transport and the value his index
         self.__years_ind = {}    # Same with year
         self.__position_ind = {} # Same with position
-        self.__data = {}         # Dictionary where the key is a year and the value a list with distance for all mode
+        self.__data = {}         # Dictionary with the cube of the distance and the emission (MissionCube) and the units
+        
+        # Compute the data in another thread than the UI
+        self.__missions_data = MissionsData()
+        self.__runner = AggregateRunner(self)
 
-        self.__configure_data()
+        self.__set_data(self.__missions_data.configure(common.get_files_category(self.__gesanalysis, self.__category)))
         
         self.__init_UI()
         
@@ -109,239 +109,22 @@ class MissionsWidget(QtWidgets.QWidget, Observer):
 #######################################################################################################
 #  Configure data                                                                                     #
 #######################################################################################################
-    def __configure_data(self) -> None:
-        """ Configure the data for the canvas inside this widget (distance/emission)
-        """
-        ind_mode = 0
-        ind_year = 0
-        ind_position = 0
-        unit_distance = ""
-        unit_emission = ""
-        unit_emission_contrails = ""
-        # Get all the mode, position and for each file
-        for file, data_file in self.__gesanalysis.get_data().items():
-            if data_file["category"] != self.__category:
-                continue
-            
-            # Add file to self.__files and set bool
-            self.__files[file] = {"read": True, "warning": [], "year": data_file["year"]}
-            
-            compare_column = True
-            
-            data = data_file["data"]
-            
-            mission = common.get_data_from_columns(data, self.column_name_mission)
-            if mission is None:
-                compare_column = False
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'name' non-trouvée")
-            
-            # Get the mode
-            mode = common.get_data_from_columns(data, self.column_mode)
-            if mode is None:
-                compare_column = False
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'mode' non-trouvée")
-            
-            # Get the position
-            position = common.get_data_from_columns(data, self.column_position)
-            if position is None:
-                compare_column = False
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'position' non-trouvée")
-            
-            # Check if there are the same number of lines between position and mode
-            if compare_column and len(mode) != len(position):
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonnes 'mode' et 'position' n'ont pas les mêmes lignes")
-
-            # Check if the column distance exist and there is the same number of lines with mode and position
-            distance = common.get_data_from_columns(data, self.column_distance)
-            if distance is None:
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'distance' non-trouvée")
-            else:
-                # Check if there is the correct data type (int, float)
-                if common.get_type_from_columns(data, self.column_distance) not in [int, float]:
-                    compare_column = False
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'distance' ne contient pas de chiffres")
-                if compare_column and (len(distance) != len(mode) or len(distance) != len(position)):
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'distance' a un nombre de ligne différent")
-                    
-            emission = common.get_data_from_columns(data, self.column_emission)
-            if distance is None:
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'emission' non-trouvée")
-            else:
-                # Check if there is the correct data type (int, float)
-                if common.get_type_from_columns(data, self.column_emission) not in [int, float]:
-                    compare_column = False
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'emission' ne contient pas de chiffres")
-                if compare_column and (len(distance) != len(mode) or len(distance) != len(position)):
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'emission' a un nombre de ligne différent")
-                    
-            emission_contrails = common.get_data_from_columns(data, self.column_emission_contrails)
-            if emission_contrails is None:
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'emission avec trainées' non-trouvée")
-            else:
-                # Check if there is the correct data type (int, float)
-                if common.get_type_from_columns(data, self.column_emission_contrails) not in [int, float]:
-                    compare_column = False
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'emission' ne contient pas de chiffres")
-                if compare_column and len(emission_contrails) != len(emission):
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'emission avec trainées' a un nombre de ligne différent")
-                    
-            # If there are some warnings, we don't calculate
-            if not self.__files[file]["read"]:
-                continue
-            
-            # Check the unit of distance
-            unit = common.get_unit(data, "distance")
-            if unit is None:
-                self.__files[file]["warning"].append(f"Colonne 'distance' n'a pas d'unité")
-            else:
-                unit = "/".join(unit)
-                if unit_distance == "":
-                    unit_distance = unit
-                if unit != unit_distance:
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'distance' a une unité différente")
-            
-            # Same with emission
-            unit = common.get_unit(data, "emission")
-            if unit is None:
-                self.__files[file]["warning"].append(f"Colonne 'emission' n'a pas d'unité")
-            else:
-                unit = "/".join(unit)
-                if unit_emission == "":
-                    unit_emission = unit
-                if unit != unit_emission:
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'emission' a une unité différente")
-                    
-            # Same with emission with contrails
-            unit = common.get_unit(data, "emission withcontrails")
-            if unit is None:
-                self.__files[file]["warning"].append(f"Colonne 'emission avec trainées' n'a pas d'unité")
-            else:
-                unit = "/".join(unit)
-                if unit_emission_contrails == "":
-                    unit_emission_contrails = unit
-                if unit != unit_emission_contrails:
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'emission avec trainées' a une unité différente")   
-            
-            # Get the year
-            year = data_file["year"]
-            
-            # If there are some warnings, we don't calculate
-            if not self.__files[file]["read"]:
-                continue
-            
-            # Add the mode and the position into their dictionary
-            for i in range(len(mode)):
-                mode_val = self.__analyse_mode(str(mode[i][0]))
-                if mode_val not in self.__mode_ind.keys():
-                    self.__mode_ind[mode_val] = {"index": ind_mode}
-                    ind_mode += 1
-                position_val = str(position[i][0])
-                if position_val not in self.__position_ind.keys():
-                    self.__position_ind[position_val] = {"index": ind_position}
-                    ind_position += 1
-            
-            # Add year to his dictionary   
-            if year not in self.__years_ind.keys():     
-                self.__years_ind[year] = {"index": ind_year}
-                ind_year += 1
-         
-        # Create structure to calculate the distance and the emission
-        data_dist = {}
-        for mode in self.__mode_ind.keys():
-            data_dist[mode] = {
-                "data": {},
-                "sum": {}
-            }
-            for position in self.__position_ind.keys():
-                data_dist[mode]["data"][position] = {}
-                for year in self.__years_ind.keys():
-                    data_dist[mode]["data"][position][year] = {
-                        "mission": [],
-                        "total_distance": 0,
-                        "total_emission": 0,
-                        "total_emission_contrails": 0
-                    }
-                    data_dist[mode]["sum"][year] = {
-                        "distance": 0,
-                        "emission": 0,
-                        "emission_contrails": 0
-                    }
-                    
-        # Now calculate the distance and the emission
-        for file, data_file in self.__files.items():
-            if not self.__files[file]["read"]:
-                continue
-            
-            data = self.__gesanalysis.get_data_from_file(file)
-            
-            mission = common.get_data(data, "name")
-            mode = common.get_data(data, "mode")
-            position = common.get_data(data, "position")
-            distance = common.get_data(data, "distance")
-            emission = common.get_data(data, "emission")
-            emission_contrails = common.get_data(data, "emission withcontrails")
-            year = data_file["year"]
-            
-            for i in range(len(mission)):
-                
-                mode_val = self.__analyse_mode(str(mode[i][0]))
-                pos_val = str(position[i][0])
-                
-                # Add the distance
-                sum_distance = sum(distance[i])
-                sum_emission = sum(emission[i])
-                sum_emission_contrails = sum(emission_contrails[i])
-                for mis in mission[i]:
-                    mis = str(mis)
-                    data_dist[mode_val]["data"][pos_val][year]["mission"].append((mis, sum_distance, sum_emission, sum_emission_contrails))
-                    data_dist[mode_val]["data"][pos_val][year]["total_distance"] += sum_distance
-                    data_dist[mode_val]["data"][pos_val][year]["total_emission"] += sum_emission
-                    data_dist[mode_val]["data"][pos_val][year]["total_emission_contrails"] += sum_emission_contrails
-                    data_dist[mode_val]["sum"][year]["distance"] += sum_distance
-                    data_dist[mode_val]["sum"][year]["emission"] += sum_emission
-                    data_dist[mode_val]["sum"][year]["emission"] += sum_emission_contrails
-                
-        self.__data = {
-            "data": data_dist,
-            "unit_distance": unit_distance,
-            "unit_emission": unit_emission,
-            "unit_emission_contrails": unit_emission_contrails
-        }
-        
-        
-    def __analyse_mode(self, mode: str) -> str:
-        """ Test if a 'mode' is in the dictionary of mode
+    def __set_data(self, result: dict) -> None:
+        """ Set the data computed by MissionsData in the dictionaries of this widget
 
         Args:
-            mode (str): Mode
-
-        Returns:
-            str: Mode in dictionary if it's in. Else return 'mode'
+            result (dict): Result of MissionsData.configure
         """
-        mode = mode.lower()
-        if mode in self.__mode_ind.keys():
-            return mode
-        
-        mode_cpy = mode + "s"
-        if mode_cpy in self.__mode_ind.keys():
-            return mode_cpy
-        return mode
+        self.__data.clear()
+        self.__position_ind.clear()
+        self.__years_ind.clear()
+        self.__mode_ind.clear()
+        self.__files.clear()
+        self.__files.update(result["files"])
+        self.__mode_ind.update(result["mode_ind"])
+        self.__position_ind.update(result["position_ind"])
+        self.__years_ind.update(result["years_ind"])
+        self.__data.update(result["data"])
 
 
 #######################################################################################################
@@ -369,28 +152,48 @@ class MissionsWidget(QtWidgets.QWidget, Observer):
 #  Update widgets                                                                                     #
 #######################################################################################################  
     def update(self):
-        """ Update all the widget of this widget when the model change
+        """ Update all the widget of this widget when the model change.
+            The data is configured in another thread, the widgets are updated when it's finished
         """
-        # Remove all data inside the structure
-        self.__data.clear()
-        self.__position_ind.clear()
-        self.__years_ind.clear()
-        self.__mode_ind.clear()
-        self.__files.clear()
-        
-        self.__configure_data()
-        
-        # Update FileOpenUI
-        self.__file_mission_widget.update_widget(self.__files)
-        
-        # Update Stats
-        self.__stat_mission_widget.update_widget(self.__years_ind, self.__mode_ind, self.__position_ind, self.__data)
+        files_category = common.get_files_category(self.__gesanalysis, self.__category)
+        self.__runner.start(
+            partial(self.__missions_data.configure, files_category),
+            self.__update_widgets,
+            self.__show_error
+        )
         
-        # Update the graph for distance
-        self.__distance_canvas.update_canvas(self.__mode_ind, self.__position_ind, self.__years_ind, self.__data)
         
-        # Update the graph for emission
-        self.__emissions_canvas.update_canvas(self.__mode_ind, self.__years_ind, self.__data)
+    def __update_widgets(self, result: dict) -> None:
+        """ Update the widgets with the data configured
+
+        Args:
+            result (dict): Result of MissionsData.configure
+        """
+        try:
+            self.__set_data(result)
+            
+            # Update FileOpenUI
+            self.__file_mission_widget.update_widget(self.__files)
+            
+            # Update Stats
+            self.__stat_mission_widget.update_widget(self.__years_ind, self.__mode_ind, self.__position_ind, self.__data)
+            
+            # Update the graph for distance
+            self.__distance_canvas.update_canvas(self.__mode_ind, self.__position_ind, self.__years_ind, self.__data)
+            
+            # Update the graph for emission
+            self.__emissions_canvas.update_canvas(self.__mode_ind, self.__years_ind, self.__data)
+        except Exception as e:
+            self.__show_error(e)
+            
+            
+    def __show_error(self, error: Exception) -> None:
+        """ Display an error raised during the update
+
+        Args:
+            error (Exception): Error
+        """
+        common_ui.message_error(str(error), self)
         
     
 #######################################################################################################
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from GESAnalysis.UI.categories import common
+
+
+class TotalData:
+    """ Compute the data of the category "Total" from the files.
+        It doesn't use Qt, so the computation can be done in another thread than the UI (see AggregateRunner)
+    """
+
+    # Column to get the data from the files
+    column_name_categories = ["name"]
+    column_intensity_emissions = ["intensity"]
+
+
+    def configure(
+        self,
+        files_category: List[Tuple[str, str, Any, Dict[str, str]]],
+        is_cancelled: Callable[[], bool] = lambda: False
+    ) -> Optional[Dict[str, dict]]:
+        """ Configure the data
+
+        Args:
+            files_category (List[Tuple[str, str, Any, Dict[str, str]]]): File, year, data and index of each file (see common.get_files_category)
+            is_cancelled (Callable[[], bool], optional): Returns True if the computation must stop. Defaults to lambda: False.
+
+        Returns:
+            Optional[Dict[str, dict]]: Dictionaries "files", "years_ind", "name_ind" and "data". None if the computation was cancelled
+        """
+        files = {}     # Dictionary where the key is a file and the value is
+                       # - a boolean to indicate if the file was read
+                       # - a list of warning during the reading
+                       # - Year of the file
+        years_ind = {} # Dictionary containing the year and an index
+        name_ind = {}  # Dictionary with the differents categories inside the the files
+
+        ind_year = 0
+        ind_name = 0
+        unit_intensity = ""
+        for file, year, data, index in files_category:
+            if is_cancelled():
+                return None
+
+            # Add to the dictionary of files
+            files[file] = {"read": True, "warning": [], "year": year}
+
+            compare_columns = True # Use to compare the length of selected column below
+
+            # Get categories for emission
+            name = common.get_data_from_columns(data, self.column_name_categories, index)
+            # If we don't find the column, put a warning
+            if name is None:
+                compare_columns = False
+                files[file]["read"] = False
+                files[file]["warning"].append(f"Colonne 'name' non-trouvée")
+
+            # Get the carbon footprint
+            intensity = common.get_data_from_columns(data, self.column_intensity_emissions, index)
+            # If we don't find the column, put a warning
+            if intensity is None:
+                compare_columns = False
+                files[file]["read"] = False
+                files[file]["warning"].append(f"Colonne 'intensity' non-trouvée")
+            else:
+                # If the column 'intensity' is not of type int or float, then error
+                if common.get_type_from_columns(data, self.column_intensity_emissions, index) not in [int, float]:
+                    compare_columns = False
+                    files[file]["read"] = False
+                    files[file]["warning"].append(f"Colonne 'intensity' ne contient pas de chiffres")
+
+            # Compare the columns if they have the same number of lines
+            if compare_columns and len(name) != len(intensity):
+                files[file]["read"] = False
+                files[file]["warning"].append(f"Colonne 'name' et 'intensity' n'ont pas les mêmes lignes")
+
+            # If there are some warnings, we don't calculate
+            if not files[file]["read"]:
+                continue
+
+            # Get the unit
+            unit = common.get_unit(data, "intensity", index)
+            # If the unit is not found, put a warning
+            if unit is None:
+                files[file]["warning"].append(f"Colonne 'intensity' n'a pas d'unité")
+            else:
+                unit = '/'.join(unit)
+                if unit_intensity == "":
+                    unit_intensity = unit
+                    # If the unit is different, put a warning
+                if unit != unit_intensity:
+                    files[file]["read"] = False
+                    files[file]["warning"].append(f"Colonne 'intensity' a une unité différente")
+
+            # If there are warnings, then we read the next file
+            if not files[file]["read"]:
+                continue
+
+            # Add different categories to our dictionary
+            for i in range(len(name)):
+                for j in range(len(name[i])):
+                    name_val = str(name[i][j])
+                    if name_val not in name_ind.keys():
+                        name_ind[name_val] = {"index": ind_name}
+                        ind_name += 1
+
+            # Same for year
+            if year not in years_ind.keys():
+                years_ind[year] = {"index": ind_year}
+                ind_year += 1
+
+        # Create structure for data
+        data_total = {}
+        for name in name_ind.keys():
+            data_total[name] = {}
+            l = [0 for i in range(len(years_ind))]
+            data_total[name]["data"] = l
+
+        # Fill the structure
+        for file, year, data, index in files_category:
+            if not files[file]["read"]:
+                continue
+            if is_cancelled():
+                return None
+
+            name = common.get_data(data, "name", index)
+            intensity = common.get_data(data, "intensity", index)
+
+            # Add value to their correct place
+            for i in range(len(name)):
+                for j in range(len(name[i])):
+                    name_val = str(name[i][j])
+                    intensity_val = sum(intensity[i])
+
+                    data_total[name_val]["data"][years_ind[year]["index"]] += intensity_val
+
+        return {
+            "files": files,
+            "years_ind": years_ind,
+            "name_ind": name_ind,
+            "data": {"data": data_total, "unit": unit_intensity}
+        }
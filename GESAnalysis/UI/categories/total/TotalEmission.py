@@ -6,6 +6,7 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
+import numpy
 import matplotlib
 from GESAnalysis.FC.Controleur import Controleur
 
@@ -18,6 +19,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationTool
 from matplotlib.figure import Figure
 from typing import Optional, Tuple, List
 from GESAnalysis.UI import common
+from GESAnalysis.UI.categories.BarArtists import BarArtists
 
 
 class TotalEmission(QtWidgets.QWidget):
@@ -53,6 +55,7 @@ class TotalEmission(QtWidgets.QWidget):
         self.__fig = Figure()
         self.__axes = self.__fig.add_subplot(111)
         self.__figCanvas = FigureCanvasQTAgg(self.__fig)
+        self.__bar_artists = BarArtists(self.__axes)
         
         # Initialise the UI
         self.__init_UI()
@@ -110,48 +113,47 @@ class TotalEmission(QtWidgets.QWidget):
 #  Draw the graph in the canvas                                                                       #
 ####################################################################################################### 
     def __draw(self) -> None:
-        """ Draw the graph in the figure canvas
+        """ Draw the graph in the figure canvas. The bars of each category are updated in place
         """
-        # Clear the canvas
-        self.__axes.cla()
-        
         # Get the position for the labels and the labels
         x_bars, x_labels = self.__get_x_label()
         
         y_labels = ["" for i in range(len(self.__name_ind.keys()))]
-        bottom = [0 for i in x_bars] # Useful for stacked bar
-        bar_container = None
+        bottom = numpy.zeros(len(x_bars)) # Useful for stacked bar
+        handles = []                      # Bars of each category for the legend
         
         # Add bar to the graph
+        self.__bar_artists.begin()
         for name, data_name in self.__data_tot.items():
-            data_transform = self.__data_per_agent(data_name["data"])
+            data_transform = numpy.array(self.__data_per_agent(data_name["data"]), dtype=float)
 
-            bar_container = self.__axes.bar(x_bars, data_transform, width=self.__width, bottom=bottom, linewidth=0.5, edgecolor='black')
-            for i in range(len(bottom)):
-                # Add text if we display the emission per agent
-                if self.__agent_checkbutton.isChecked():
-                    color = bar_container[0].get_facecolor()
-                    self.__axes.text(
-                        x_bars[i] + self.__width/2,
-                        bottom[i] + data_transform[i]/2,
-                        str(round(data_transform[i], 2)),
-                        color=color
-                    )
-                bottom[i] += data_transform[i]
+            bar_container = self.__bar_artists.bar(name, x_bars, data_transform, self.__width, bottom=bottom, linewidth=0.5, edgecolor='black')
+            # Add text if we display the emission per agent
+            if self.__agent_checkbutton.isChecked() and len(x_bars) > 0:
+                color = bar_container[0].get_facecolor()
+                self.__bar_artists.text(
+                    name,
+                    numpy.array(x_bars) + self.__width/2,
+                    bottom + data_transform/2,
+                    [str(round(val, 2)) for val in data_transform.tolist()],
+                    color=color
+                )
+            bottom += data_transform
+            handles.append(bar_container)
             y_labels[self.__name_ind[name]["index"]] = name
+        self.__bar_artists.end()
         
         # Set x labels
         self.__axes.set_xticks(x_bars, x_labels)
         
         # Put a legend if there are data display
-        if len(y_labels):
-            self.__axes.legend(y_labels)
+        self.__bar_artists.legend(handles, y_labels)
         
         # Put a label on y-axis
         self.__axes.set_ylabel(f"Empreinte carbonne ({self.__unit})")
         
-        # Draw the canvas
-        self.__figCanvas.draw()
+        # Draw the canvas when Qt is idle
+        self.__figCanvas.draw_idle()
         
         
     def __get_x_label(self) -> Tuple[List[str], List[str]]:
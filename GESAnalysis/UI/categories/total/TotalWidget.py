@@ -6,13 +6,17 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
+from functools import partial
 from typing import List
 from PyQt5 import QtWidgets, QtCore
 from GESAnalysis.FC.GESAnalysis import GESAnalysis
 from GESAnalysis.FC.Controleur import Controleur
 from GESAnalysis.FC.PATTERNS.Observer import Observer
 from GESAnalysis.UI.FileOpenUI import FileOpenUI
+from GESAnalysis.UI import common as common_ui
 from GESAnalysis.UI.categories import common
+from GESAnalysis.UI.categories.AggregateRunner import AggregateRunner
+from GESAnalysis.UI.categories.total.TotalData import TotalData
 from GESAnalysis.UI.categories.total.TotalStatWidget import TotalStatWidget
 from .TotalEmission import TotalEmission
 
@@ -21,10 +25,6 @@ class TotalWidget(QtWidgets.QWidget, Observer):
     """ Widget use to regroup the graphs, the files opener and the stat of the category "Total"
     """
     
-    # Column to get the data from the files
-    column_name_categories = ["name"]
-    column_intensity_emissions = ["intensity"]
-    
     def __init__(
         self,
         model: GESAnalysis,
@@ -59,7 +59,11 @@ class TotalWidget(QtWidgets.QWidget, Observer):
         self.__name_ind = {}  # Dictionary with the differents categories inside the the files
         self.__data = {}      # Dictionary with the data
         
-        self.__configure_data()
+        # Compute the data in another thread than the UI
+        self.__total_data = TotalData()
+        self.__runner = AggregateRunner(self)
+        
+        self.__set_data(self.__total_data.configure(common.get_files_category(self.__gesanalysis, self.__category)))
         
         self.__init_UI()
 
@@ -105,116 +109,20 @@ class TotalWidget(QtWidgets.QWidget, Observer):
 #######################################################################################################
 #  Configure data                                                                                     #
 #######################################################################################################
-    def __configure_data(self) -> None:
-        """ Configure the data
-        """
-        ind_year = 0
-        ind_name = 0
-        unit_intensity = ""
-        for file, data_file in self.__gesanalysis.get_data().items():
-            # If the file is not in the category, we skip it
-            if data_file["category"] != self.__category:
-                continue
-            
-            # Add to the dictionary of files
-            self.__files[file] = {"read": True, "warning": [], "year": data_file["year"]}
-            
-            compare_columns = True # Use to compare the length of selected column below
-            
-            data = data_file["data"]
-            
-            # Get categories for emission
-            name = common.get_data_from_columns(data, self.column_name_categories)
-            # If we don't find the column, put a warning
-            if name is None:
-                compare_columns = False
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'name' non-trouvée")
-            
-            # Get the carbon footprint
-            intensity = common.get_data_from_columns(data, self.column_intensity_emissions)
-            # If we don't find the column, put a warning
-            if intensity is None:
-                compare_columns = False
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'intensity' non-trouvée")
-            else:
-                # If the column 'intensity' is not of type int or float, then error
-                if common.get_type_from_columns(data, self.column_intensity_emissions) not in [int, float]:
-                    compare_columns = False
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'intensity' ne contient pas de chiffres")
-            
-            # Compare the columns if they have the same number of lines
-            if compare_columns and len(name) != len(intensity):
-                self.__files[file]["read"] = False
-                self.__files[file]["warning"].append(f"Colonne 'name' et 'intensity' n'ont pas les mêmes lignes")
-                
-            # If there are some warnings, we don't calculate
-            if not self.__files[file]["read"]:
-                continue
+    def __set_data(self, result: dict) -> None:
+        """ Set the data computed by TotalData in the dictionaries of this widget
 
-            # Get the unit
-            unit = common.get_unit(data, "intensity")
-            # If the unit is not found, put a warning
-            if unit is None:
-                self.__files[file]["warning"].append(f"Colonne 'intensity' n'a pas d'unité")
-            else:
-                unit = '/'.join(unit)
-                if unit_intensity == "":
-                    unit_intensity = unit
-                    # If the unit is different, put a warning
-                if unit != unit_intensity:
-                    self.__files[file]["read"] = False
-                    self.__files[file]["warning"].append(f"Colonne 'intensity' a une unité différente")
-            
-            year = data_file["year"]
-            
-            # If there are warnings, then we read the next file
-            if not self.__files[file]["read"]:
-                continue
-            
-            # Add different categories to our dictionary
-            for i in range(len(name)):
-                for j in range(len(name[i])):
-                    name_val = str(name[i][j])
-                    if name_val not in self.__name_ind.keys():
-                        self.__name_ind[name_val] = {"index": ind_name}
-                        ind_name += 1
-            
-            # Same for year
-            if year not in self.__years_ind.keys():
-                self.__years_ind[year] = {"index": ind_year}
-                ind_year += 1
-            
-        # Create structure for data
-        data_total = {}
-        for name in self.__name_ind.keys():
-            data_total[name] = {}
-            l = [0 for i in range(len(self.__years_ind))]
-            data_total[name]["data"] = l
-            
-        # Fill the structure
-        for file, data_file in self.__files.items():
-            if not data_file["read"]:
-                continue
-            
-            data = self.__gesanalysis.get_data_from_file(file)
-            
-            name = common.get_data(data, "name")
-            intensity = common.get_data(data, "intensity")
-            year = data_file["year"]
-            
-            # Add value to their correct place
-            for i in range(len(name)):
-                for j in range(len(name[i])):
-                    name_val = str(name[i][j])
-                    intensity_val = sum(intensity[i])
-                    
-                    data_total[name_val]["data"][self.__years_ind[year]["index"]] += intensity_val
-        
-        self.__data["data"] = data_total    
-        self.__data["unit"] = unit_intensity
+        Args:
+            result (dict): Result of TotalData.configure
+        """
+        self.__files.clear()
+        self.__years_ind.clear()
+        self.__name_ind.clear()
+        self.__data.clear()
+        self.__files.update(result["files"])
+        self.__years_ind.update(result["years_ind"])
+        self.__name_ind.update(result["name_ind"])
+        self.__data.update(result["data"])
         
 
 #######################################################################################################
@@ -242,21 +150,39 @@ class TotalWidget(QtWidgets.QWidget, Observer):
 #  Update widgets                                                                                     #
 #######################################################################################################        
     def update(self) -> None:
-        """ Update widget (from observers)
+        """ Update widget (from observers).
+            The data is configured in another thread, the widgets are updated when it's finished
         """
-        # Clear all dictionaries
-        self.__data.clear()
-        self.__years_ind.clear()
-        self.__name_ind.clear()
-        self.__files.clear()
+        files_category = common.get_files_category(self.__gesanalysis, self.__category)
+        self.__runner.start(
+            partial(self.__total_data.configure, files_category),
+            self.__update_widgets,
+            self.__show_error
+        )
         
-        # Read and configure the data
-        self.__configure_data()
         
-        # update the widget (File opener, stat and graphs)
-        self.__file_total_widget.update_widget(self.__files)
-        self.__stat_total_widget.update_widget(self.__years_ind, self.__name_ind, self.__data)
-        self.__total_emission.update_canvas(self.__name_ind, self.__years_ind, self.__data)
+    def __update_widgets(self, result: dict) -> None:
+        """ Update the widgets with the data configured (File opener, stat and graphs)
+
+        Args:
+            result (dict): Result of TotalData.configure
+        """
+        try:
+            self.__set_data(result)
+            self.__file_total_widget.update_widget(self.__files)
+            self.__stat_total_widget.update_widget(self.__years_ind, self.__name_ind, self.__data)
+            self.__total_emission.update_canvas(self.__name_ind, self.__years_ind, self.__data)
+        except Exception as e:
+            self.__show_error(e)
+            
+            
+    def __show_error(self, error: Exception) -> None:
+        """ Display an error raised during the update
+
+        Args:
+            error (Exception): Error
+        """
+        common_ui.message_error(str(error), self)
 
 
 #######################################################################################################
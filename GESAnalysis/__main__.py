@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+#######################################################################################################
+#  Command line of GESAnalysis, without the interface :                                               #
+#      python -m GESAnalysis report --config job.toml [--workers N]                                   #
+#######################################################################################################
+import argparse
+import sys
+
+from typing import List, Optional
+from GESAnalysis.FC.ReportEngine import ReportEngine
+
+
+def report(args: argparse.Namespace) -> int:
+    """ Make the reports of the labs of a job (see ReportEngine)
+
+    Args:
+        args (argparse.Namespace): Arguments of the command 'report'
+
+    Returns:
+        int: 0 if all the reports were made, else 1
+    """
+    engine = ReportEngine(args.workers)
+    try:
+        results = engine.run(args.config)
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 1
+
+    status = 0
+    for lab, result in results.items():
+        for warning in result["warning"]:
+            print(f"[{lab}] Avertissement : {warning}", file=sys.stderr)
+        if result["error"] is not None:
+            print(f"[{lab}] Erreur : {result['error']}", file=sys.stderr)
+            status = 1
+            continue
+        print(f"[{lab}] {len(result['files'])} fichier(s) écrit(s)")
+        for file in result["files"]:
+            print(f"    {file}")
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Parse the command line and execute the command
+
+    Args:
+        argv (List[str], optional): Arguments. Defaults to None (sys.argv).
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m GESAnalysis", description="GESAnalysis sans interface graphique")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_report = subparsers.add_parser("report", help="Produire les statistiques et les graphiques de laboratoires")
+    parser_report.add_argument("--config", required=True, help="Fichier TOML décrivant les laboratoires et leurs fichiers")
+    parser_report.add_argument("--workers", type=int, default=None, help="Nombre maximum de processus")
+    parser_report.set_defaults(func=report)
+
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers doit être un entier positif")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@
 # E-Mail : pierre.marjolin@gmail.com
 # Github : Pierre-Mar
 #---------------------------------------------------------------------------------
+from GESAnalysis.FC.CacheData import CacheData
 from GESAnalysis.FC.GESAnalysis import GESAnalysis
 from GESAnalysis.FC.Controleur import Controleur
 from GESAnalysis.UI.Application import Application
@@ -14,7 +15,7 @@ from GESAnalysis.UI.Application import Application
 def run() -> None:
     """ Create all the instance and run the application
     """
-    gesanalysis = GESAnalysis()
+    gesanalysis = GESAnalysis(columnar=True, cache=CacheData())
 
     controleur = Controleur(gesanalysis)
     application = Application(gesanalysis, controleur)
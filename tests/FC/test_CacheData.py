@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import os
+import shutil
+import platform
+from GESAnalysis.FC.CacheData import CacheData
+from GESAnalysis.FC.ColumnarData import ColumnarData
+from GESAnalysis.FC.ReaderData import ReaderData
+
+
+tmp_cache = "tmp_cache"
+tmp_file = "tmp_cache_file.csv"
+
+# Definition of paths of files depending on the OS
+os_name = platform.system()
+path = "tests/resources/"
+if os_name == "Windows":
+    path = "tests\\resources\\"
+people = path + "people.csv"
+hw_5 = path + "hw_5.tsv"
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get(filename, options) and put(filename, data, options)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_cache_read_file():
+    """ Check the 2nd reading of a file gives the data saved in the cache
+    """
+    cache = CacheData(tmp_cache)
+    reader = ReaderData(cache)
+    assert cache.get(people, sep=None, engine="pandas", columnar=False, sheet=None) is None
+    d = reader.read_file(people)
+    assert cache.get(people, sep=None, engine="pandas", columnar=False, sheet=None) == d
+    assert reader.read_file(people) == d
+
+    c = reader.read_file(people, columnar=True)
+    assert isinstance(reader.read_file(people, columnar=True), ColumnarData)
+    assert reader.read_file(people, columnar=True) == c
+    shutil.rmtree(tmp_cache)
+
+
+def test_cache_file_modified():
+    """ Check a modified file is read again
+    """
+    cache = CacheData(tmp_cache)
+    reader = ReaderData(cache)
+    with open(tmp_file, "w") as f:
+        f.write("A\n1\n")
+    assert reader.read_file(tmp_file, sep=",")["A"]["data"] == [[1]]
+    with open(tmp_file, "w") as f:
+        f.write("A\n1\n2\n")
+    assert reader.read_file(tmp_file, sep=",")["A"]["data"] == [[1], [2]]
+    os.remove(tmp_file)
+    shutil.rmtree(tmp_cache)
+
+
+def test_cache_file_not_exist():
+    """ Check a file who doesn't exist is not in the cache
+    """
+    cache = CacheData(tmp_cache)
+    cache.put("not_exist.csv", {})
+    assert cache.get("not_exist.csv") is None
+    assert cache.get_size() == 0
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : size of the cache
+# ------------------------------------------------------------------------------------------------------------------------
+def test_cache_evict_least_recent():
+    """ Check the least recently used file is removed when the cache is full
+    """
+    cache = CacheData(tmp_cache)
+    reader = ReaderData(cache)
+    reader.read_file(people)
+    size_people = cache.get_size()
+
+    small_cache = CacheData(tmp_cache, max_size=size_people)
+    small_cache.put(hw_5, ReaderData().read_file(hw_5))
+    assert small_cache.get(people, sep=None, engine="pandas", columnar=False, sheet=None) is None
+    assert small_cache.get(hw_5) is not None
+
+    small_cache.clear()
+    assert small_cache.get_size() == 0
+    shutil.rmtree(tmp_cache)
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+import platform
+import numpy
+from GESAnalysis.FC.ColumnarData import ColumnarData
+from GESAnalysis.FC.ReaderData import ReaderData
+import GESAnalysis.UI.categories.common as common
+
+
+reader = ReaderData()
+
+
+# Definition of paths of files depending on the OS
+os_name = platform.system()
+path = "tests/resources/"
+if os_name == "Windows":
+    path = "tests\\resources\\"
+people = path + "people.csv"
+hw_5 = path + "hw_5.tsv"
+username = path + "username.txt"
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : read_file(filename, columnar=True)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_columnar_csv_file():
+    """ Check the columnar reading gives the same data as the dictionary
+    """
+    d = reader.read_file(people, sep=",")
+    c = reader.read_file(people, sep=",", columnar=True)
+    assert isinstance(c, ColumnarData)
+    assert d == c
+    assert c.to_dict() == d
+
+
+def test_columnar_typed_arrays():
+    """ Check each column is stored in a typed NumPy array
+    """
+    c = reader.read_file(hw_5, columnar=True)
+    assert c.get_values("Index").dtype == numpy.int64
+    assert c.get_values("height.cm").dtype == numpy.float64
+    assert c.get_offsets("height.cm") is None
+    assert c["height.cm"]["unit"] == ["cm"]
+    assert c["height.cm"]["type"] == float
+
+
+def test_columnar_multiple_values():
+    """ Check the rows with several values use the offsets
+    """
+    c = reader.read_file(username, columnar=True)
+    assert c.get_offsets("Username").tolist() == [0, 2, 4, 6, 8, 10]
+    assert c["Username"]["data"][1] == ["grey07", "0503"]
+    assert c.get_values("Registered").dtype == numpy.bool_
+    assert len(c["Username"]["data"]) == 5
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : ColumnView
+# ------------------------------------------------------------------------------------------------------------------------
+def test_column_view_rows():
+    """ Check the rows of a view are lists, like the dictionary
+    """
+    c = ColumnarData()
+    c.add_column("a", ["a"], [], int, [1, 2, 3, 4], [0, 1, 3, 4])
+    view = c["a"]["data"]
+    assert view[0] == [1]
+    assert view[-1] == [4]
+    assert view[1] == [2, 3]
+    assert sum(view[1]) == 5
+    assert list(view) == [[1], [2, 3], [4]]
+    with pytest.raises(IndexError):
+        view[3]
+
+
+def test_column_view_missing_values():
+    """ Check a column with missing values is stored in an array of objects
+    """
+    c = ColumnarData()
+    c.add_column("a", ["a"], [], int, [1, None, 3])
+    assert c.get_values("a").dtype == object
+    assert c["a"]["data"][1] == [None]
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : concat(blocks), get_rows(start, stop)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_concat_blocks():
+    """ Check the blocks of a file put together give the data of the file
+    """
+    for filename in [people, hw_5, username]:
+        c = reader.read_file(filename, columnar=True)
+        assert ColumnarData.concat(reader.iter_chunks(filename, chunk_rows=2, columnar=True)) == c
+
+
+def test_concat_offsets():
+    """ Check the offsets are shifted when only some blocks have rows with several values
+    """
+    first = ColumnarData()
+    first.add_column("a", ["a"], [], int, [1, 2])
+    second = ColumnarData()
+    second.add_column("a", ["a"], [], int, [3, 4, 5], [0, 2, 3])
+    c = ColumnarData.concat([first, second])
+    assert c.get_offsets("a").tolist() == [0, 1, 2, 4, 5]
+    assert list(c["a"]["data"]) == [[1], [2], [3, 4], [5]]
+    with pytest.raises(ValueError, match="Les colonnes d'un bloc sont différentes : b au lieu de a"):
+        other = ColumnarData()
+        other.add_column("b", ["b"], [], int, [1])
+        ColumnarData.concat([first, other])
+
+
+def test_get_rows():
+    """ Check the rows of a part of the structure
+    """
+    c = reader.read_file(username, columnar=True)
+    rows = c.get_rows(1, 3)
+    for column in c:
+        assert list(rows[column]["data"]) == list(c[column]["data"])[1:3]
+        assert rows[column]["type"] == c[column]["type"]
+    assert rows.get_offsets("Username").tolist() == [0, 2, 4]
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : common.get_sum_data(reader, column)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_sum_rows():
+    """ Check the sum of each row is the same with a dictionary and with a ColumnarData
+    """
+    c = ColumnarData()
+    c.add_column("distance.km", ["distance"], ["km"], int, [1, 2, 3, 4], [0, 2, 3, 4])
+    d = c.to_dict()
+    assert common.get_sum_data(c, "distance").tolist() == [3, 3, 4]
+    assert common.get_sum_data(c, "distance").tolist() == common.get_sum_data(d, "distance").tolist()
+    assert common.get_sum_data(c, "distance").dtype == numpy.int64
+    assert common.get_sum_data(c, "not_exist") is None
+
+
+def test_sum_empty_rows():
+    """ Check the sums when some rows have no value, at the start, inside and at the end of the column
+    """
+    c = ColumnarData()
+    c.add_column("distance.km", ["distance"], ["km"], int, [1, 2], [0, 2, 2])
+    assert common.get_sum_data(c, "distance").tolist() == [3, 0]
+
+    c = ColumnarData()
+    c.add_column("distance.km", ["distance"], ["km"], float, [1.5, 2.0, 4.0], [0, 0, 2, 2, 3, 3])
+    assert common.get_sum_data(c, "distance").tolist() == [0, 3.5, 0, 4.0, 0]
+    assert common.get_sum_data(c, "distance").tolist() == common.get_sum_data(c.to_dict(), "distance").tolist()
+
+    c = ColumnarData()
+    c.add_column("distance.km", ["distance"], ["km"], int, [], [0, 0, 0])
+    assert common.get_sum_data(c, "distance").tolist() == [0, 0]
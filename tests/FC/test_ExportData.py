@@ -11,6 +11,7 @@ import platform
 import os
 from GESAnalysis.FC.ExportData import ExportData
 from GESAnalysis.FC.ReaderData import ReaderData
+from GESAnalysis.FC.ColumnarData import ColumnarData
 
 
 export = ExportData()
@@ -89,6 +90,80 @@ def test_export_xlsx_to_txt():
     assert True == export.export_data(d, tmp_file+".txt")
     assert d == reader.read_file(tmp_file+".txt")
     os.remove(tmp_file+".txt")
+
+
+def test_export_npz_file():
+    """ Check that the exportation to a NPZ file keeps the data, the name, unit and type of each column
+    """
+    for filename in [people, hw_5, username, excel]:
+        d = reader.read_file(filename)
+        assert True == export.export_data(d, tmp_file+".npz")
+        assert d == reader.read_file(tmp_file+".npz")
+        assert d == reader.read_file(tmp_file+".npz", columnar=True).to_dict()
+    os.remove(tmp_file+".npz")
+
+
+def test_export_npz_missing_values():
+    """ Check the columns with missing values and without rows are kept in a NPZ file
+    """
+    data = {"distance.km": {"name": ["distance"], "unit": ["km"], "data": [[1.5], [None], [2.0, 3.0]], "type": float}}
+    export.export_data(data, tmp_file+".npz")
+    assert data == reader.read_file(tmp_file+".npz")
+    data = {"vide": {"name": ["vide"], "unit": [], "data": []}}
+    export.export_data(data, tmp_file+".npz")
+    assert data == reader.read_file(tmp_file+".npz")
+    os.remove(tmp_file+".npz")
+
+
+def test_export_chunks_npz():
+    """ Check the exportation of blocks to a NPZ file gives the whole file
+    """
+    d = reader.read_file(username)
+    assert True == export.export_chunks(reader.iter_chunks(username, chunk_rows=2), tmp_file+".npz")
+    assert d == reader.read_file(tmp_file+".npz")
+    os.remove(tmp_file+".npz")
+
+
+def test_export_compressed():
+    """ Check that the exportation to a compressed file gives the data once decompressed
+    """
+    d = reader.read_file(username)
+    for extension in [".csv.gz", ".tsv.bz2", ".txt.xz"]:
+        assert True == export.export_data(d, tmp_file+extension)
+        assert d == reader.read_file(tmp_file+extension)
+        os.remove(tmp_file+extension)
+
+
+def test_export_columnar():
+    """ Check the exportation of a ColumnarData gives the same file as his dictionary
+    """
+    d = reader.read_file(people)
+    export.export_data(d, tmp_file+".csv")
+    export.export_data(ColumnarData.from_dict(d), tmp_file+".txt")
+    with open(tmp_file+".csv") as file_dict, open(tmp_file+".txt") as file_columnar:
+        assert file_dict.read() == file_columnar.read()
+    os.remove(tmp_file+".csv")
+    os.remove(tmp_file+".txt")
+
+
+def test_export_blocks():
+    """ Check the rows are written correctly when they are cut in several blocks
+    """
+    d = reader.read_file(people)
+    export_blocks = ExportData()
+    export_blocks.block_rows = 3
+    export_blocks.export_data(d, tmp_file+".csv")
+    assert d == reader.read_file(tmp_file+".csv")
+    os.remove(tmp_file+".csv")
+
+
+def test_export_chunks():
+    """ Check the exportation of the blocks read by ReaderData.iter_chunks gives the whole file
+    """
+    d = reader.read_file(people)
+    assert True == export.export_chunks(reader.iter_chunks(people, chunk_rows=2, columnar=True), tmp_file+".csv")
+    assert d == reader.read_file(tmp_file+".csv")
+    os.remove(tmp_file+".csv")
 # ------------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------------------------------------------------
 
@@ -114,10 +189,17 @@ def test_invalid_file_export():
             "type": str
         }
     }
-    with pytest.raises(Exception, match="Exportation impossible de 'export_invalid.py'. Le fichier doit être de type CSV, TSV ou TX"):
+    with pytest.raises(Exception, match="Exportation impossible de 'export_invalid.py'. Le fichier doit être de type CSV, TSV, TXT ou NPZ"):
         export.export_data(data, export_invalid)
 
 
+def test_invalid_compressed_npz():
+    """ Check a NPZ file can't be compressed
+    """
+    with pytest.raises(Exception, match="Exportation impossible de 'tmp.npz.gz'. Seul un fichier CSV, TSV ou TXT peut être compressé"):
+        export.export_data(reader.read_file(people), tmp_file+".npz.gz")
+
+
 def test_invalid_data():
     """ Check if a dictionary of data is None, then we catch the error
     """
@@ -144,6 +226,33 @@ def test_nb_elem_col_diff_data():
     }
     with pytest.raises(ValueError, match="La ligne 2 a 1 éléments au lieu de 2 éléments"):
         export.export_data(data, tmp_file+".txt")
+    assert not os.path.exists(tmp_file+".txt")
+
+
+def test_export_chunks_other_columns():
+    """ Check the blocks must have the same columns
+    """
+    data = {"Langage": {"name": ["Langage"], "unit": [], "data": [["Français"]], "type": str}}
+    other = {"Mot": {"name": ["Mot"], "unit": [], "data": [["Bonjour"]], "type": str}}
+    with pytest.raises(ValueError, match="Les colonnes d'un bloc sont différentes : Mot au lieu de Langage"):
+        export.export_chunks([data, other], tmp_file+".txt")
+    assert not os.path.exists(tmp_file+".txt")
+
+
+def test_export_error_keep_file():
+    """ Check a failed exportation keeps the previous file and removes the temporary file
+    """
+    d = reader.read_file(people)
+    export.export_data(d, tmp_file+".csv")
+    data = {
+        "Langage": {"name": ["Langage"], "unit": [], "data": [["Français"], ["Anglais"]], "type": str},
+        "Mot": {"name": ["Mot"], "unit": [], "data": [["Bonjour"]], "type": str}
+    }
+    with pytest.raises(ValueError):
+        export.export_data(data, tmp_file+".csv")
+    assert d == reader.read_file(tmp_file+".csv")
+    assert [file for file in os.listdir('.') if file.startswith("."+tmp_file)] == []
+    os.remove(tmp_file+".csv")
 # ------------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------------------------------------------------
 
@@ -266,6 +375,31 @@ def test_export_stat_valid_txt():
     export.export_stat(data, header_columns, header_rows, tmp_file+".txt")
     assert data_dict == reader.read_file(tmp_file + ".txt")
     os.remove(tmp_file + ".txt")
+
+
+def test_export_stat_valid_npz():
+    """ Check the stats in a NPZ file are read like in a CSV file
+    """
+    data = [["10", "1.5", "a"],
+            ["20", "2", "b"]]
+    header_columns = ["Zero", "Un.km", "Deux"]
+    header_rows = ["Dix", "Vingt"]
+    export.export_stat(data, header_columns, header_rows, tmp_file+".csv")
+    export.export_stat(data, header_columns, header_rows, tmp_file+".npz")
+    assert reader.read_file(tmp_file+".csv") == reader.read_file(tmp_file+".npz")
+    os.remove(tmp_file+".csv")
+    os.remove(tmp_file+".npz")
+
+
+def test_export_stat_replace_file():
+    """ Check the exportation of stats replaces the previous file without leaving a temporary file
+    """
+    export.export_stat([["1"]], ["Zero"], ["Dix"], tmp_file+".csv")
+    export.export_stat([["2"]], ["Un"], ["Vingt"], tmp_file+".csv")
+    with open(tmp_file+".csv") as file:
+        assert file.read() == "header_row;Un\nVingt;2\n"
+    assert [file for file in os.listdir('.') if file.startswith("."+tmp_file)] == []
+    os.remove(tmp_file+".csv")
 # ------------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------------------------------------------------
 
@@ -21,6 +21,7 @@ if os_name == "Windows":
     path_file = "tests\\resources\\"
 people = path_file + "people.csv"
 hw = path_file + "hw_5.tsv"
+username = path_file + "username.txt"
 export_invalid = path_file + "export_invalid.py"
 not_exist = path_file + "not_exist"
 
@@ -72,7 +73,7 @@ def test_read_file():
 def test_read_file_incorrect():
     """ Test to read file when the file is not supported
     """
-    with pytest.raises(Exception, match="Exportation impossible de 'export_invalid.py'. Le fichier doit être de type CSV, TSV, TXT ou XLSX"):
+    with pytest.raises(Exception, match="Exportation impossible de 'export_invalid.py'. Le fichier doit être de type CSV, TSV, TXT, XLSX ou NPZ"):
         m.read_file(export_invalid, '2020', 'hello')
 
 
@@ -93,6 +94,98 @@ def test_read_file_year_incorrect():
 
 
 
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : load_file(filename, year) and add_file(filename, year, category, data)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_load_file():
+    """ Test the file read is opened only by add_file
+    """
+    m_load = GESAnalysis()
+    data = m_load.load_file(people, '2019')
+    assert m_load.get_file_open() == []
+    m_load.add_file(people, '2019', 'people', data)
+    assert m_load.get_file_open() == ["people.csv"]
+    assert m_load.get_data_from_file(people) == ReaderData().read_file(people)
+    assert m_load.get_category(people) == 'people'
+
+
+def test_load_file_cancelled():
+    """ Test a reading cancelled gives None
+    """
+    m_load = GESAnalysis()
+    assert m_load.load_file(people, '2019', is_cancelled=lambda: True) is None
+    assert m_load.get_file_open() == []
+    
+    with pytest.raises(Exception, match="'Wrong' n'est pas une année"):
+        m_load.load_file(people, 'Wrong')
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : read_files(files)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_read_files():
+    """ Test to read several files at once
+    """
+    m_files = GESAnalysis()
+    categories = m_files.read_files([(hw, '2020', 'hw'), (people, '2019', 'people'), (username, '2018', 'hw')])
+    assert categories == ['hw', 'people']
+    assert m_files.get_file_open() == ["username.txt", "people.csv", "hw_5.tsv"]
+    assert m_files.get_data_from_file(people) == ReaderData().read_file(people)
+    assert m_files.get_year(hw) == '2020'
+
+
+def test_read_files_incorrect():
+    """ Test no file is added when the reading of one file fails
+    """
+    m_files = GESAnalysis()
+    with pytest.raises(Exception, match="Exportation impossible de 'export_invalid.py'. Le fichier doit être de type CSV, TSV, TXT, XLSX ou NPZ"):
+        m_files.read_files([(people, '2019', 'people'), (export_invalid, '2020', 'hello')])
+    assert m_files.get_file_open() == []
+    
+    with pytest.raises(Exception, match="'Wrong' n'est pas une année"):
+        m_files.read_files([(people, '2019', 'people'), (hw, 'Wrong', 'hw')])
+    assert m_files.get_file_open() == []
+
+
+
+def test_read_files_processes():
+    """ Test to read several files in a pool of processes, and the errors in the order of the files
+    """
+    m_files = GESAnalysis(columnar=True)
+    m_files.read_files([(hw, '2020', 'hw'), (people, '2019', 'people')], max_workers=2)
+    assert m_files.get_data_from_file(people).to_dict() == ReaderData().read_file(people)
+    with pytest.raises(Exception, match="Exportation impossible de 'export_invalid.py'"):
+        m_files.read_files([(username, '2018', 'hw'), (export_invalid, '2020', 'hello'), (not_exist, '2020', 'hello')], max_workers=2)
+    assert m_files.get_file_open() == ["people.csv", "hw_5.tsv"]
+
+
+def test_load_add_files():
+    """ Test the files read by load_files are added by add_files, and the progress is given for each file
+    """
+    m_files = GESAnalysis()
+    files = [(hw, '2020', 'hw'), (people, '2019', 'people')]
+    progress = []
+    data_files = m_files.load_files(files, progress=lambda done, total: progress.append((done, total)))
+    assert progress == [(1, 2), (2, 2)]
+    assert m_files.get_file_open() == []
+    assert m_files.add_files(files, data_files) == ['hw', 'people']
+    assert m_files.get_file_open() == ["people.csv", "hw_5.tsv"]
+
+
+def test_load_files_cancelled():
+    """ Test load_files returns None when the reading is cancelled
+    """
+    m_files = GESAnalysis()
+    assert m_files.load_files([(hw, '2020', 'hw'), (people, '2019', 'people')], is_cancelled=lambda: True) is None
+    assert m_files.load_files([(hw, '2020', 'hw'), (people, '2019', 'people')], max_workers=2, is_cancelled=lambda: True) is None
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
 # ------------------------------------------------------------------------------------------------------------------------
 # Tests : export(filein, fileout)
 # ------------------------------------------------------------------------------------------------------------------------
@@ -119,7 +212,7 @@ def test_export_close():
 def test_export_invalid():
     """ Test an invalid export
     """
-    with pytest.raises(Exception, match="Exportation impossible de 'invalid'. Le fichier doit être de type CSV, TSV ou TXT"):
+    with pytest.raises(Exception, match="Exportation impossible de 'invalid'. Le fichier doit être de type CSV, TSV, TXT ou NPZ"):
         m.export(people, "invalid")
 # ------------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------------------------------------------------
@@ -353,6 +446,21 @@ def test_get_data_file_not_open():
 
 
 
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get_index_from_file(filename)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_get_index_from_file():
+    m_index = GESAnalysis()
+    m_index.read_file(hw, '2019', 'hw')
+    assert m_index.get_index_from_file(hw) == {"Index": "Index", "height": "height.cm", "weight": "weight.kg"}
+    m_index.close_file(hw)
+    with pytest.raises(Exception, match="Le fichier 'hw_5.tsv' n'est pas ouvert"):
+        m_index.get_index_from_file(hw)
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
 # ------------------------------------------------------------------------------------------------------------------------
 # Tests : get_filename(filename)
 # ------------------------------------------------------------------------------------------------------------------------
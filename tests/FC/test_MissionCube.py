@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+import numpy
+from GESAnalysis.FC.MissionCube import MissionCube
+
+
+# Cube with 2 modes, 2 positions and 2 years
+cube = MissionCube(["avions", "train"], ["ITA", "Doctorant"], ["2019", "2020"])
+cube.add([0, 1, 0], [0, 0, 1], 0, [100, 20, 300], [10, 2, 30], [20, 2, 60])
+cube.add([0, 0], [0, 0], 1, [50, 50], [5, 5], [10, 10])
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get_layer(measure)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_cube_layer():
+    """ Check the values of each cell is the sum of the missions
+    """
+    distance = cube.get_layer("distance")
+    assert distance.shape == (2, 2, 2)
+    assert distance.dtype == numpy.int64
+    assert distance[:, :, 0].tolist() == [[100, 300], [20, 0]]
+    assert distance[:, :, 1].tolist() == [[100, 0], [0, 0]]
+    assert cube.get_layer("mission")[:, :, 1].tolist() == [[2, 0], [0, 0]]
+    assert cube.get_layer("emission_contrails")[0, 1, 0] == 60
+
+
+def test_cube_float():
+    """ Check the layer is a float when the values are float
+    """
+    c = MissionCube(["avions"], ["ITA"], ["2019"])
+    c.add([0], [0], 0, [1.5], [1], [2])
+    c.add([0], [0], 0, [1], [1], [2])
+    assert c.get_layer("distance").tolist() == [[[2.5]]]
+    assert c.get_layer("emission").dtype == numpy.int64
+
+
+def test_cube_measure_not_exist():
+    """ Check a measure who doesn't exist raise an error
+    """
+    with pytest.raises(KeyError):
+        cube.get_layer("co2")
+
+
+def test_cube_add_incorrect():
+    """ Check the missions must have a value for each measure
+    """
+    c = MissionCube(["avions"], ["ITA"], ["2019"])
+    with pytest.raises(ValueError):
+        c.add([0, 0], [0], 0, [1, 2], [1, 2], [1, 2])
+
+
+def test_cube_empty():
+    """ Check a cube without missions
+    """
+    c = MissionCube([], [], [])
+    assert c.get_layer("distance").shape == (0, 0, 0)
+    c = MissionCube(["avions"], ["ITA"], ["2019"])
+    assert c.get_layer("mission").tolist() == [[[0]]]
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get_total(measure, axis) and get_percentage(measure, axis)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_cube_total():
+    """ Check the totals along the axes
+    """
+    assert cube.get_total("distance", MissionCube.axis_position)[:, 0].tolist() == [400, 20]
+    assert cube.get_total("distance", MissionCube.axis_mode)[:, 0].tolist() == [120, 300]
+    assert cube.get_total("emission", (MissionCube.axis_mode, MissionCube.axis_position)).tolist() == [42, 10]
+
+
+def test_cube_percentage():
+    """ Check the percentage of each cell, and a total of 0 gives 0
+    """
+    percentage = cube.get_percentage("emission", (MissionCube.axis_mode, MissionCube.axis_position))
+    assert percentage[:, :, 1].tolist() == [[100.0, 0.0], [0.0, 0.0]]
+    assert numpy.isclose(percentage[:, :, 0].sum(), 100)
+    percentage = cube.get_percentage("distance", MissionCube.axis_year)
+    assert percentage[1, 1, :].tolist() == [0.0, 0.0]
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get_missions_year(measure, year) and indexes
+# ------------------------------------------------------------------------------------------------------------------------
+def test_cube_missions_year():
+    """ Check the missions of a year are in descending order, the equal values by mode and position
+    """
+    values, modes = cube.get_missions_year("emission", "2019")
+    assert values.tolist() == [30, 10, 2]
+    assert modes.tolist() == [0, 0, 1]
+
+    c = MissionCube(["avions", "train"], ["ITA", "Doctorant"], ["2019"])
+    c.add([1, 0, 0], [0, 1, 0], 0, [1, 1, 1], [5, 5, 5], [1, 2, 3])
+    values, modes = c.get_missions_year("emission_contrails", "2019")
+    assert values.tolist() == [3, 2, 1]
+    values, modes = c.get_missions_year("emission", "2019")
+    assert modes.tolist() == [0, 0, 1]
+    assert c.get_missions_year("distance", "2019")[0].tolist() == [1, 1, 1]
+
+
+def test_cube_index():
+    """ Check the labels and their index
+    """
+    assert cube.get_modes() == ["avions", "train"]
+    assert cube.get_index_position("Doctorant") == 1
+    assert cube.get_index_year("2020") == 1
+    with pytest.raises(KeyError):
+        cube.get_index_mode("bus")
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : add_cube(cube), remove_cube(cube) and regroup(...)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_cube_add_cube():
+    """ Check the layers and the missions of the cubes added are the same as the missions added in one cube,
+        and the new labels are at the end of the axes
+    """
+    first = MissionCube(["avions", "train"], ["ITA"], ["2019"])
+    first.add([0, 1, 0], [0, 0, 0], 0, [100, 20, 300], [10, 2, 30], [20, 2, 60])
+    second = MissionCube(["bus", "avions"], ["Doctorant", "ITA"], ["2020"])
+    second.add([1, 0], [1, 0], 0, [50, 8], [5, 1], [10, 1])
+
+    c = MissionCube([], [], [])
+    c.add_cube(first)
+    c.add_cube(second)
+    assert c.get_modes() == ["avions", "train", "bus"]
+    assert c.get_positions() == ["ITA", "Doctorant"]
+    assert c.get_years() == ["2019", "2020"]
+
+    expected = MissionCube(["avions", "train", "bus"], ["ITA", "Doctorant"], ["2019", "2020"])
+    expected.add([0, 1, 0], [0, 0, 0], 0, [100, 20, 300], [10, 2, 30], [20, 2, 60])
+    expected.add([0, 2], [0, 1], 1, [50, 8], [5, 1], [10, 1])
+    for measure in MissionCube.measures:
+        assert c.get_layer(measure).tolist() == expected.get_layer(measure).tolist()
+        assert c.get_layer(measure).dtype == expected.get_layer(measure).dtype
+    values, modes = c.get_missions_year("emission", "2020")
+    assert values.tolist() == [5, 1]
+    assert modes.tolist() == [0, 2]
+
+
+def test_cube_remove_cube():
+    """ Check a cube removed gives the layers without its missions, and an integer layer after the float values are removed
+    """
+    first = MissionCube(["avions"], ["ITA"], ["2019"])
+    first.add([0, 0], [0, 0], 0, [100, 20], [10, 2], [20, 2])
+    second = MissionCube(["train"], ["ITA"], ["2019"])
+    second.add([0], [0], 0, [0.1], [5], [10])
+
+    c = MissionCube([], [], [])
+    c.add_cube(first)
+    c.add_cube(second)
+    assert c.get_layer("distance").dtype == numpy.float64
+    c.remove_cube(second)
+    assert c.get_modes() == ["avions", "train"]
+    assert c.get_layer("distance").tolist() == [[[120]], [[0]]]
+    assert c.get_layer("distance").dtype == numpy.int64
+    assert c.get_layer("mission").tolist() == [[[2]], [[0]]]
+    assert c.get_missions_year("distance", "2019")[0].tolist() == [100, 20]
+    with pytest.raises(KeyError):
+        c.remove_cube(second)
+
+
+def test_cube_regroup():
+    """ Check the labels grouped in one label are summed, and the labels removed are removed with their missions
+    """
+    c = MissionCube(["avion", "train", "avions"], ["ITA", "Autre"], ["2019"])
+    c.add([0, 1, 2], [0, 0, 0], 0, [100, 20, 300], [10, 2, 30], [20, 2, 60])
+    new = c.regroup(["avions", "train"], ["ITA"], ["2019"], [0, 1, 0], [0, -1], [0])
+    assert new.get_layer("distance").tolist() == [[[400]], [[20]]]
+    assert new.get_layer("mission").tolist() == [[[2]], [[1]]]
+    values, modes = new.get_missions_year("emission", "2019")
+    assert values.tolist() == [30, 10, 2]
+    assert modes.tolist() == [0, 0, 1]
+    # The cube is not changed
+    assert c.get_layer("distance").shape == (3, 2, 1)
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+from GESAnalysis.FC.NacresMatcher import NacresMatcher
+
+
+keys = ["AB12", "AB13", "AC12", "ZB23", "XA02", "AA12"]
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : match(key)
+# ------------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("code, accepted", [
+    ("*", keys),
+    ("AB*", ["AB12", "AB13"]),
+    ("*12", ["AB12", "AC12", "AA12"]),
+    ("*B*", ["AB12", "AB13", "ZB23"]),
+    ("A*2", ["AB12", "AC12", "AA12"]),
+    ("AB12", ["AB12"]),
+    ("AB1", []),
+])
+def test_match_code(code, accepted):
+    """ Check the keys accepted by each form of code
+    """
+    matcher = NacresMatcher([code])
+    assert [key for key in keys if matcher.match(key)] == accepted
+
+
+def test_match_codes():
+    """ Check a key is accepted if one of the codes accepts it
+    """
+    matcher = NacresMatcher(["ZB*", "*02", "AB12"])
+    assert [key for key in keys if matcher.match(key)] == ["AB12", "ZB23", "XA02"]
+
+
+def test_match_start_end():
+    """ Check the start and the end of a code "Y*Z" are compared separately
+    """
+    matcher = NacresMatcher(["AB*B1"])
+    assert matcher.match("AB1")
+    assert not matcher.match("AB12")
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : filter(keys)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_filter():
+    """ Check the keys accepted are in the same order, without duplicates
+    """
+    matcher = NacresMatcher(["A*"])
+    assert matcher.filter(["AC12", "ZB23", "AB12", "AC12"]) == ["AC12", "AB12"]
+    assert matcher.filter([]) == []
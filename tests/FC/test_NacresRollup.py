@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+from GESAnalysis.FC.NacresRollup import NacresRollup
+
+
+rollup = NacresRollup({"AB12": 10, "AB13": 5, "AB21": 1, "AC12": 20, "XA02": 3})
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get_label(key, level), get_parent(label, level)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_label():
+    """ Check the label of a key at each level
+    """
+    assert [NacresRollup.get_label("AB12", level) for level in range(3)] == ["AB", "AB1", "AB12"]
+    assert NacresRollup.get_parent("AB12", 2) == "AB1"
+    assert NacresRollup.get_parent("AB1", 1) == "AB"
+    assert NacresRollup.get_parent("AB", 0) is None
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get_sums(level, parent)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_sums_levels():
+    """ Check the sums of each level are in the order of the keys
+    """
+    assert rollup.get_sums(0) == {"AB": 16, "AC": 20, "XA": 3}
+    assert list(rollup.get_sums(0).keys()) == ["AB", "AC", "XA"]
+    assert rollup.get_sums(1) == {"AB1": 15, "AB2": 1, "AC1": 20, "XA0": 3}
+    assert rollup.get_sums(2) == {"AB12": 10, "AB13": 5, "AB21": 1, "AC12": 20, "XA02": 3}
+
+
+def test_sums_parent():
+    """ Check the drill-down keeps only the labels of the parent
+    """
+    assert rollup.get_sums(1, "AB") == {"AB1": 15, "AB2": 1}
+    assert rollup.get_sums(2, "AB1") == {"AB12": 10, "AB13": 5}
+    assert rollup.get_sums(2, "ZZ") == {}
+
+
+def test_sums_empty():
+    """ Check the sums without keys
+    """
+    assert NacresRollup({}).get_sums(0) == {}
+    assert NacresRollup({}).get_top(0, 2) == []
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : get_top(level, nb_top, parent)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_top_all():
+    """ Check all the labels are in the order of the keys without nb_top, or if there are not enough labels
+    """
+    assert rollup.get_top(0) == [("AB", 16), ("AC", 20), ("XA", 3)]
+    assert rollup.get_top(0, 3) == [("AB", 16), ("AC", 20), ("XA", 3)]
+
+
+def test_top_other():
+    """ Check the highest sums are first and the others are grouped
+    """
+    assert rollup.get_top(2, 2) == [("AC12", 20), ("AB12", 10), (NacresRollup.other_label, 9)]
+    assert rollup.get_top(2, 1, "AB") == [("AB12", 10), (NacresRollup.other_label, 6)]
+    assert rollup.get_top(0, 0) == [(NacresRollup.other_label, 39)]
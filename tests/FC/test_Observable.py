@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+from GESAnalysis.FC.PATTERNS.Observable import Observable
+from GESAnalysis.FC.PATTERNS.Observer import Observer
+
+
+class CountObserver(Observer):
+    """ Observer who counts his updates
+    """
+    def __init__(self) -> None:
+        self.count = 0
+
+    def update(self) -> None:
+        self.count += 1
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : update(c) and batch()
+# ------------------------------------------------------------------------------------------------------------------------
+def test_update_category():
+    """ Check only the observers of the category are updated
+    """
+    observable = Observable()
+    missions, achats = CountObserver(), CountObserver()
+    observable.add_observer(missions, "Missions")
+    observable.add_observer(achats, "Achats")
+    observable.update("Missions")
+    assert (missions.count, achats.count) == (1, 0)
+
+
+def test_batch_update_once():
+    """ Check each category is updated once at the end of a batch
+    """
+    observable = Observable()
+    missions, achats = CountObserver(), CountObserver()
+    observable.add_observer(missions, "Missions")
+    observable.add_observer(achats, "Achats")
+    with observable.batch():
+        observable.update("Missions")
+        with observable.batch():
+            observable.update("Achats")
+            observable.update("Missions")
+        assert (missions.count, achats.count) == (0, 0)
+    assert (missions.count, achats.count) == (1, 1)
+
+
+def test_batch_error():
+    """ Check the categories are updated when there is an error in the batch
+    """
+    observable = Observable()
+    missions = CountObserver()
+    observable.add_observer(missions, "Missions")
+    with pytest.raises(ValueError):
+        with observable.batch():
+            observable.update("Missions")
+            raise ValueError()
+    assert missions.count == 1
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : set_scheduler(scheduler)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_scheduler():
+    """ Check the scheduler is called once and the update is done when the scheduler calls flush
+    """
+    observable = Observable()
+    missions = CountObserver()
+    observable.add_observer(missions, "Missions")
+    pending = []
+    observable.set_scheduler(pending.append)
+    observable.update("Missions")
+    observable.update("Missions")
+    assert len(pending) == 1 and missions.count == 0
+    pending.pop()()
+    assert missions.count == 1
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
@@ -8,7 +8,15 @@
 #---------------------------------------------------------------------------------
 import pytest
 import platform
+import os
+import gzip
+import bz2
+import lzma
+import zipfile
+import gc
+import numpy
 from GESAnalysis.FC.ReaderData import ReaderData
+from GESAnalysis.FC.ExportData import ExportData
 
 
 reader = ReaderData()
@@ -290,8 +298,17 @@ def test_xlsx_file_not_exist():
 def test_unsupported_file():
     """ Check if we catch the corresponding error when a file are not supported by the application
     """
-    with pytest.raises(TypeError, match="Exportation impossible de 'cant_read.py'. Le fichier doit être de type CSV, TSV, TXT ou XLSX"):
+    with pytest.raises(TypeError, match="Exportation impossible de 'cant_read.py'. Le fichier doit être de type CSV, TSV, TXT, XLSX ou NPZ"):
         reader.read_file(cant_read)
+
+
+def test_npz_not_exported():
+    """ Check a NPZ file not written by ExportData gives an error
+    """
+    numpy.savez("tmp_other.npz", values=numpy.arange(3))
+    with pytest.raises(ValueError, match="Le fichier 'tmp_other.npz' n'a pas été exporté par GESAnalysis"):
+        reader.read_file("tmp_other.npz")
+    os.remove("tmp_other.npz")
 # ------------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------------------------------------------------
 
@@ -312,6 +329,214 @@ def test_type_diff():
     """
     with pytest.raises(TypeError, match="L'élément à la ligne 3 et colonne Word est du type int au lieu du type str"):
         reader.read_file(type_diff)
+
+
+def test_first_error_in_file():
+    """ Check the error given is the 1st one of the file, even if the columns are converted one by one
+    """
+    tmp_file = "tmp_first_error.csv"
+    with open(tmp_file, "w") as f:
+        f.write("A;B\n1;x\n2;y\n3;4\nz;w\n")
+    with pytest.raises(TypeError, match="L'élément à la ligne 4 et colonne B est du type int au lieu du type str"):
+        reader.read_file(tmp_file, sep=";")
+    os.remove(tmp_file)
+
+
+def test_int_and_float_in_column():
+    """ Check the int and the float are accepted in the same column
+    """
+    tmp_file = "tmp_int_float.csv"
+    with open(tmp_file, "w") as f:
+        f.write("A;B\n1;1.5\n2.5;2\n")
+    d = reader.read_file(tmp_file, sep=";")
+    os.remove(tmp_file)
+    assert d["A"]["data"] == [[1], [2.5]]
+    assert d["A"]["type"] == float
+    assert d["B"]["data"] == [[1.5], [2.0]]
+    assert d["B"]["type"] == float
+
+
+def test_int_before_float_in_column():
+    """ Check the int before the 1st float of a column stay int, and the int after it are converted to float
+    """
+    tmp_file = "tmp_int_float.csv"
+    with open(tmp_file, "w") as f:
+        f.write("A;B\n1;1\n2;2.5\n3;3\n")
+    d = reader.read_file(tmp_file, sep=";")
+    os.remove(tmp_file)
+    assert [type(row[0]) for row in d["A"]["data"]] == [int, int, int]
+    assert d["B"]["data"] == [[1], [2.5], [3.0]]
+    assert [type(row[0]) for row in d["B"]["data"]] == [int, float, float]
+    assert d["B"]["type"] == float
+
+
+def test_gc_paused_readings():
+    """ Check the garbage collector is enabled at the end of the last reading who runs at the same time,
+        and stays disabled if it was disabled before the readings
+    """
+    for enabled in [True, False]:
+        if not enabled:
+            gc.disable()
+        first = reader._ReaderData__gc_paused()
+        second = ReaderData()._ReaderData__gc_paused()
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        assert not gc.isenabled()
+        second.__exit__(None, None, None)
+        assert gc.isenabled() == enabled
+        gc.enable()
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : iter_chunks(filename, chunk_rows, sep)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_chunks_same_data():
+    """ Check the blocks put together give the data of read_file
+    """
+    for filename in [people, hw_5, username, excel]:
+        d = reader.read_file(filename)
+        chunks = list(reader.iter_chunks(filename, chunk_rows=2))
+        assert len(chunks) == (len(d[list(d.keys())[0]]["data"]) + 1) // 2
+        for column in d:
+            assert chunks[0][column]["name"] == d[column]["name"]
+            assert chunks[0][column]["unit"] == d[column]["unit"]
+            assert sum([chunk[column]["data"] for chunk in chunks], []) == d[column]["data"]
+
+
+def test_chunks_xlsx_openpyxl():
+    """ Check the blocks of a XLSX file read row by row with openpyxl give the data of read_file
+    """
+    d = reader.read_file(excel, engine='openpyxl')
+    chunks = list(reader.iter_chunks(excel, chunk_rows=4, engine='openpyxl'))
+    assert len(chunks) == 3
+    for column in d:
+        assert chunks[2][column]["type"] == d[column]["type"]
+        assert sum([chunk[column]["data"] for chunk in chunks], []) == d[column]["data"]
+
+
+def test_chunks_type_between_blocks():
+    """ Check the type of a column is kept between the blocks
+    """
+    tmp_file = "tmp_chunks.csv"
+    with open(tmp_file, "w") as f:
+        f.write("A;B\n1;x\n2;y\n2.5;z\n3;w\n4;5\n")
+    chunks = reader.iter_chunks(tmp_file, chunk_rows=2, sep=";")
+    first = next(chunks)
+    assert first["A"]["type"] == int
+    second = next(chunks)
+    assert second["A"]["data"] == [[2.5], [3.0]]
+    assert second["A"]["type"] == float
+    with pytest.raises(TypeError, match="L'élément à la ligne 6 et colonne B est du type int au lieu du type str"):
+        next(chunks)
+    os.remove(tmp_file)
+
+
+def test_chunks_npz():
+    """ Check the blocks of a NPZ file give the data of read_file
+    """
+    d = reader.read_file(username)
+    ExportData().export_data(d, "tmp_chunks.npz")
+    chunks = list(reader.iter_chunks("tmp_chunks.npz", chunk_rows=2))
+    assert len(chunks) == 3
+    for column in d:
+        assert chunks[2][column]["type"] == d[column]["type"]
+        assert sum([chunk[column]["data"] for chunk in chunks], []) == d[column]["data"]
+    os.remove("tmp_chunks.npz")
+
+
+def test_chunks_invalid_size():
+    """ Check a block without rows gives an error
+    """
+    with pytest.raises(ValueError, match="Le nombre de lignes d'un bloc doit être positif. Il est de 0"):
+        reader.iter_chunks(people, chunk_rows=0)
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : read_file(filename, progress, is_cancelled)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_progress_csv():
+    """ Check the progress of a CSV file is given in bytes split, then converted, until twice the size of the file
+    """
+    reader_progress = ReaderData()
+    reader_progress.progress_step = 10
+    reports = []
+    d = reader_progress.read_file(people, progress=lambda done, total: reports.append((done, total)))
+    size = os.path.getsize(people)
+    assert d == reader.read_file(people)
+    assert len(reports) > 2
+    assert reports[-1] == (2 * size, 2 * size)
+    assert [done for done, _ in reports] == sorted(done for done, _ in reports)
+
+
+def test_progress_xlsx():
+    """ Check the progress of a XLSX file is given in rows
+    """
+    for engine in ['pandas', 'openpyxl']:
+        reports = []
+        d = reader.read_file(excel, engine=engine, progress=lambda done, total: reports.append((done, total)))
+        nb_rows = len(d[list(d.keys())[0]]["data"])
+        assert reports[0][0] == 0
+        assert reports[-1] == (nb_rows, nb_rows)
+
+
+def test_progress_cancelled():
+    """ Check a reading cancelled gives None
+    """
+    for filename in [people, hw_5, excel]:
+        assert reader.read_file(filename, is_cancelled=lambda: True) is None
+    
+    # Cancelled during the reading
+    reader_progress = ReaderData()
+    reader_progress.progress_step = 10
+    reports = []
+    d = reader_progress.read_file(people, progress=lambda done, total: reports.append(done), is_cancelled=lambda: len(reports) == 2)
+    assert d is None
+    assert len(reports) == 2
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : read_file(filename, engine, sheet)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_xlsx_sheet():
+    """ Check the sheet can be given by his index
+    """
+    assert reader.read_file(excel, engine='openpyxl', sheet=0) == reader.read_file(excel, engine='openpyxl')
+    assert reader.read_file(excel, sheet=0) == reader.read_file(excel)
+
+
+def test_xlsx_type_whole_column():
+    """ Check the type of a column read with pandas doesn't depend on his 1st value
+    """
+    import openpyxl
+    tmp_file = "tmp_type.xlsx"
+    wb = openpyxl.Workbook()
+    wb.active.append(["Mot", "Nombre"])
+    wb.active.append([None, 1])
+    wb.active.append(["Bonjour", 2.5])
+    wb.save(tmp_file)
+    d = reader.read_file(tmp_file)
+    os.remove(tmp_file)
+    assert d["Mot"]["type"] == str
+    assert d["Mot"]["data"][1] == ["Bonjour"]
+    assert d["Nombre"]["type"] == float
+    assert d["Nombre"]["data"] == [[1.0], [2.5]]
+
+
+def test_xlsx_sheet_not_exist():
+    """ Check a sheet who doesn't exist gives an error
+    """
+    with pytest.raises(IOError, match="Lecture impossible avec 'pandas'"):
+        reader.read_file(excel, engine='openpyxl', sheet="not_exist")
 # ------------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------------------------------------------------
 
@@ -327,3 +552,74 @@ def test_probleme_read_pandas():
         reader.read_file(excel, engine='no_engine')
 # ------------------------------------------------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------------------------------------------------
+
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : read_file(filename) with a compressed file or a file in a ZIP archive
+# ------------------------------------------------------------------------------------------------------------------------
+def test_compressed_files():
+    """ Check a compressed file gives the same data as the file
+    """
+    d = reader.read_file(people)
+    with open(people, "rb") as f:
+        content = f.read()
+    for extension, module in [(".gz", gzip), (".bz2", bz2), (".xz", lzma)]:
+        with module.open("tmp_people.csv" + extension, "wb") as f:
+            f.write(content)
+        assert d == reader.read_file("tmp_people.csv" + extension)
+        assert sum([chunk["SR"]["data"] for chunk in reader.iter_chunks("tmp_people.csv" + extension, chunk_rows=3)], []) == d["SR"]["data"]
+        os.remove("tmp_people.csv" + extension)
+
+
+def test_progress_gzip():
+    """ Check the progress of a gzip file is given with the size of the file once decompressed
+    """
+    with open(people, "rb") as f:
+        content = f.read()
+    with gzip.open("tmp_people.csv.gz", "wb") as f:
+        f.write(content)
+    progress = []
+    reader.read_file("tmp_people.csv.gz", progress=lambda done, total: progress.append((done, total)))
+    assert progress[-1] == (2 * len(content), 2 * len(content))
+    os.remove("tmp_people.csv.gz")
+
+
+def test_archive_files():
+    """ Check the files of a ZIP archive are read with the path 'archive.zip/fichier'
+    """
+    with zipfile.ZipFile("tmp_archive.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(people, "2019/people.csv")
+        archive.write(hw_5, "hw_5.tsv")
+        archive.writestr("notes.md", "Notes")
+    assert reader.list_archive("tmp_archive.zip") == ["2019/people.csv", "hw_5.tsv"]
+    assert reader.read_file(people) == reader.read_file("tmp_archive.zip/2019/people.csv")
+    assert reader.read_file(hw_5) == reader.read_file("tmp_archive.zip/hw_5.tsv", columnar=True)
+    with pytest.raises(ValueError, match="L'archive 'tmp_archive.zip' contient plusieurs fichiers"):
+        reader.read_file("tmp_archive.zip")
+    with pytest.raises(FileNotFoundError, match="Le fichier '2020/people.csv' n'existe pas dans l'archive 'tmp_archive.zip'"):
+        reader.read_file("tmp_archive.zip/2020/people.csv")
+    os.remove("tmp_archive.zip")
+
+
+def test_archive_one_file():
+    """ Check an archive with only one CSV, TSV or TXT file gives this file
+    """
+    with zipfile.ZipFile("tmp_archive.zip", "w") as archive:
+        archive.write(username, "username.txt")
+    assert reader.read_file(username) == reader.read_file("tmp_archive.zip")
+    os.remove("tmp_archive.zip")
+
+
+def test_compressed_xlsx():
+    """ Check only a CSV, TSV or TXT file can be compressed
+    """
+    with open(excel, "rb") as f:
+        content = f.read()
+    with gzip.open("tmp_excel.xlsx.gz", "wb") as f:
+        f.write(content)
+    with pytest.raises(TypeError, match="Lecture impossible de 'tmp_excel.xlsx.gz'. Seul un fichier CSV, TSV ou TXT peut être compressé ou dans une archive"):
+        reader.read_file("tmp_excel.xlsx.gz")
+    os.remove("tmp_excel.xlsx.gz")
+# ------------------------------------------------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+import os
+import shutil
+import subprocess
+import sys
+from GESAnalysis.FC.ReportEngine import ReportEngine
+
+
+tmp_job = "tmp_job"
+
+missions = """name;mode;position;distance.km;emission.kg eCO2;emission.withcontrails.kg eCO2
+m1;avion;Chercheur;1000;200;400
+m2;train;ITA;300;10;10
+m3;avion;ITA;500;100;200
+"""
+
+achats = """Code NACRES;Montant.euro;description
+AB12;100.5;desc AB12
+AB13;20;desc AB13
+XA02;30.25;desc XA02
+"""
+
+total = """name,intensity.kg eCO2
+achats,1000
+missions,500
+"""
+
+job = """output = "out"
+workers = 2
+
+[[lab]]
+name = "LabA"
+
+[[lab.files]]
+path = "missions.csv"
+year = 2019
+category = "Missions"
+
+[[lab.files]]
+path = "achats.csv"
+year = 2019
+category = "Achats"
+
+[[lab.files]]
+path = "total.csv"
+year = "2019"
+category = "Total"
+
+[[lab]]
+name = "LabB"
+output = "lab_b"
+
+[[lab.files]]
+path = "total.csv"
+year = 2020
+category = "Total"
+
+[[lab]]
+name = "LabC"
+
+[[lab.files]]
+path = "not_exist.csv"
+year = 2020
+category = "Total"
+"""
+
+
+def create_job(config: str = job) -> str:
+    """ Create the folder of a job with the files and the TOML file
+
+    Args:
+        config (str, optional): Content of the TOML file. Defaults to job.
+
+    Returns:
+        str: Path to the TOML file
+    """
+    os.makedirs(tmp_job, exist_ok=True)
+    for filename, content in [("missions.csv", missions), ("achats.csv", achats), ("total.csv", total), ("job.toml", config)]:
+        with open(os.path.join(tmp_job, filename), "w") as f:
+            f.write(content)
+    return os.path.join(tmp_job, "job.toml")
+
+
+def read_stat(filename: str) -> str:
+    with open(filename) as f:
+        return f.read()
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : load_config(filename)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_load_config():
+    """ Check the paths are relative to the TOML file and the years are strings
+    """
+    config = ReportEngine().load_config(create_job())
+    directory = os.path.abspath(tmp_job)
+    assert config["output"] == os.path.join(directory, "out")
+    assert config["workers"] == 2
+    assert [lab["name"] for lab in config["lab"]] == ["LabA", "LabB", "LabC"]
+    assert config["lab"][0]["output"] == os.path.join(directory, "out", "LabA")
+    assert config["lab"][1]["output"] == os.path.join(directory, "out", "lab_b")
+    assert config["lab"][0]["files"][0] == {
+        "path": os.path.join(directory, "missions.csv"),
+        "year": "2019",
+        "category": "Missions",
+        "sep": None
+    }
+    shutil.rmtree(tmp_job)
+
+
+def test_load_config_incorrect():
+    """ Check the errors of a TOML file
+    """
+    with pytest.raises(FileNotFoundError):
+        ReportEngine().load_config(os.path.join(tmp_job, "not_exist.toml"))
+    with pytest.raises(ValueError):
+        ReportEngine().load_config(create_job("output = "))
+    with pytest.raises(ValueError):
+        ReportEngine().load_config(create_job("output = 'out'"))
+    with pytest.raises(ValueError):
+        ReportEngine().load_config(create_job("[[lab]]\nname = 'A'\n[[lab.files]]\npath = 'total.csv'\nyear = 2019\ncategory = 'Fluide'"))
+    with pytest.raises(ValueError):
+        ReportEngine().load_config(create_job("[[lab]]\nname = 'A'\n[[lab.files]]\npath = 'total.csv'\ncategory = 'Total'"))
+    with pytest.raises(ValueError):
+        ReportEngine().load_config(create_job("workers = 0\n[[lab]]\nname = 'A'\n[[lab.files]]\npath = 'total.csv'\nyear = 2019\ncategory = 'Total'"))
+    shutil.rmtree(tmp_job)
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : run(filename)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_run():
+    """ Check the stats and the graphs of each lab. An error in a lab doesn't stop the other labs
+    """
+    results = ReportEngine().run(create_job())
+    out = os.path.join(tmp_job, "out")
+
+    assert results["LabA"]["error"] is None
+    assert results["LabA"]["warning"] == []
+    assert sorted(os.path.basename(file) for file in results["LabA"]["files"]) == [
+        "achats.png", "achats_2019.csv",
+        "missions_distance.png", "missions_distance_2019.csv", "missions_emission.png",
+        "missions_emission_2019.csv", "missions_emission_contrails_2019.csv", "missions_mission_2019.csv",
+        "total.png", "total_2019.csv"
+    ]
+    for file in results["LabA"]["files"]:
+        assert os.path.isfile(file)
+
+    assert read_stat(os.path.join(out, "LabA", "missions_distance_2019.csv")) == (
+        "header_row;Chercheur;ITA;total\n"
+        "avion;1000;500;1500\n"
+        "train;0;300;300\n"
+        "total;1000;800;1800\n"
+    )
+    assert read_stat(os.path.join(out, "LabA", "achats_2019.csv")) == (
+        "header_row;Montant\n"
+        "AB12;100.5\n"
+        "AB13;20.0\n"
+        "XA02;30.25\n"
+        "total;150.75\n"
+    )
+    assert read_stat(os.path.join(out, "lab_b", "total_2020.csv")) == (
+        "header_row;Empreinte carbone\n"
+        "achats;1000\n"
+        "missions;500\n"
+        "total;1500\n"
+    )
+    with open(os.path.join(out, "LabA", "total.png"), "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    assert results["LabC"]["files"] == []
+    assert results["LabC"]["error"] is not None
+    shutil.rmtree(tmp_job)
+
+
+def test_run_without_qt():
+    """ Check the command line makes the reports without importing PyQt5
+    """
+    config = create_job()
+    code = (
+        "import sys\n"
+        "from GESAnalysis.__main__ import main\n"
+        f"status = main(['report', '--config', {config!r}, '--workers', '1'])\n"
+        "assert not any(module.startswith('PyQt5') for module in sys.modules)\n"
+        "sys.exit(status)\n"
+    )
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    # LabC has a file who doesn't exist
+    assert process.returncode == 1
+    assert "[LabA] 10 fichier(s) écrit(s)" in process.stdout
+    assert "[LabC] Erreur" in process.stderr
+    assert os.path.isfile(os.path.join(tmp_job, "out", "LabA", "missions_emission.png"))
+    shutil.rmtree(tmp_job)
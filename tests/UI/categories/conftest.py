@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+from typing import Callable
+
+
+@pytest.fixture
+def files_category() -> Callable[..., list]:
+    """ Function who creates the list of files (see common.get_files_category) from (file, year, data)
+    """
+    def create(*files) -> list:
+        return [(file, year, data, {" ".join(data_column["name"]): column for column, data_column in data.items()}) for file, year, data in files]
+    return create
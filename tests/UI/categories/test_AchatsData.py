@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+from GESAnalysis.FC.ColumnarData import ColumnarData
+from GESAnalysis.UI.categories.achats.AchatsData import AchatsData
+
+
+def achats(keys, amounts, descriptions=None, unit=["euro"]) -> dict:
+    """ Create the data of a file of the category "Achats" (one list of values for each row)
+    """
+    data = {
+        "Code NACRES": {"name": ["Code NACRES"], "unit": [], "data": keys, "type": str},
+        "Montant.euro": {"name": ["Montant"], "unit": unit, "data": amounts, "type": float}
+    }
+    if descriptions is not None:
+        data["description"] = {"name": ["description"], "unit": [], "data": descriptions, "type": str}
+    return data
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : configure(files_category) : lines grouped by year and NACRES key
+# ------------------------------------------------------------------------------------------------------------------------
+def test_group_amount_count(files_category):
+    """ Check the amounts are summed and the lines are counted for each key
+    """
+    data = achats([["AB12"], ["CD34"], ["AB12"]], [[10.0], [5.0], [2.5]])
+    result = AchatsData().configure(files_category(("a.csv", "2019", data)))
+    assert result["data"]["unit"] == "euro"
+    assert result["data"]["data"] == {
+        "2019": {
+            "AB12": {"amount": 12.5, "count": 2, "description": None},
+            "CD34": {"amount": 5.0, "count": 1, "description": None}
+        }
+    }
+
+
+def test_group_description_order(files_category):
+    """ Check the description is the one of the 1st line and the keys are in the order of their 1st line
+    """
+    data = achats([["CD34"], ["AB12"], ["CD34"], ["EF56"]], [[1.0], [2.0], [3.0], [4.0]], [["first"], ["ab"], ["second"], ["ef"]])
+    result = AchatsData().configure(files_category(("a.csv", "2019", data)))
+    data_year = result["data"]["data"]["2019"]
+    assert list(data_year.keys()) == ["CD34", "AB12", "EF56"]
+    assert data_year["CD34"] == {"amount": 4.0, "count": 2, "description": "first"}
+
+
+def test_group_point(files_category):
+    """ Check a key with a '.' is the same key than without
+    """
+    data = achats([["AB.12"], ["CD34"], ["AB12"]], [[1.0], [2.0], [3.0]], [["ab"], ["cd"], ["other"]])
+    result = AchatsData().configure(files_category(("a.csv", "2019", data)))
+    assert result["data"]["data"]["2019"] == {
+        "AB12": {"amount": 4.0, "count": 2, "description": "ab"},
+        "CD34": {"amount": 2.0, "count": 1, "description": "cd"}
+    }
+
+
+def test_group_several_keys(files_category):
+    """ Check a line with several keys counts for each key with the amount of the line, with a dictionary and with a ColumnarData
+    """
+    data = achats([["AB12", "CD34"], ["AB12"], ["EF56"]], [[10.0], [1.0], [2.0, 3.0]], [["dab", "dcd"], ["x"], ["def"]])
+    expected = {
+        "AB12": {"amount": 11.0, "count": 2, "description": "dab"},
+        "CD34": {"amount": 10.0, "count": 1, "description": "dcd"},
+        "EF56": {"amount": 5.0, "count": 1, "description": "def"}
+    }
+    for data_file in [data, ColumnarData.from_dict(data)]:
+        result = AchatsData().configure(files_category(("a.csv", "2019", data_file)))
+        assert result["data"]["data"]["2019"] == expected
+
+
+def test_group_dict_columnar(files_category):
+    """ Check a dictionary and a ColumnarData give the same result, with several files and years
+    """
+    first = achats([["AB12"], ["CD.34"], ["AB12", "XA02"]], [[10.5], [20.0], [1.25, 1.0]], [["a"], ["c"], ["a2", "x"]])
+    second = achats([["XA02"], ["AB12"]], [[3.0], [4.0]], [["x2"], ["a3"]])
+    third = achats([["GH78"]], [[7.0]], [["g"]])
+    result_dict = AchatsData().configure(files_category(("a.csv", "2019", first), ("b.csv", "2019", second), ("c.csv", "2020", third)))
+    result_columnar = AchatsData().configure(files_category(
+        ("a.csv", "2019", ColumnarData.from_dict(first)),
+        ("b.csv", "2019", ColumnarData.from_dict(second)),
+        ("c.csv", "2020", ColumnarData.from_dict(third))
+    ))
+    assert result_dict == result_columnar
+    assert list(result_dict["data"]["data"]["2019"].keys()) == ["AB12", "CD34", "XA02"]
+    assert result_dict["data"]["data"]["2019"]["AB12"] == {"amount": 16.75, "count": 3, "description": "a"}
+    assert result_dict["data"]["data"]["2019"]["XA02"] == {"amount": 5.25, "count": 2, "description": "x"}
+    assert result_dict["data"]["data"]["2020"] == {"GH78": {"amount": 7.0, "count": 1, "description": "g"}}
+
+
+
+def test_group_cache(files_category):
+    """ Check the groups of the files already open are kept when a file is added or closed,
+        the merge doesn't change them, and the result is the same as the result computed from the start
+    """
+    first = achats([["AB12"], ["CD34"]], [[1.0], [2.0]], [["a"], ["c"]])
+    second = achats([["AB12"], ["EF56"]], [[3.0], [4.0]], [["a2"], ["e"]])
+    achats_data = AchatsData()
+    achats_data.configure(files_category(("a.csv", "2019", first)))
+    groups_first = achats_data._AchatsData__groups["a.csv"]["groups"]
+
+    files = files_category(("a.csv", "2019", first), ("b.csv", "2019", second))
+    result = achats_data.configure(files)
+    assert achats_data._AchatsData__groups["a.csv"]["groups"] is groups_first
+    assert groups_first["AB12"] == {"amount": 1.0, "count": 1, "description": "a"}
+    assert result == AchatsData().configure(files)
+    assert result["data"]["data"]["2019"]["AB12"] == {"amount": 4.0, "count": 2, "description": "a"}
+
+    # The same files again give the same result
+    assert achats_data.configure(files) == result
+
+    files = files_category(("b.csv", "2019", second))
+    result = achats_data.configure(files)
+    assert list(achats_data._AchatsData__groups.keys()) == ["b.csv"]
+    assert result == AchatsData().configure(files)
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : configure(files_category) : check of the NACRES keys
+# ------------------------------------------------------------------------------------------------------------------------
+def test_regex_nacres_key():
+    """ Check the regular expression accepts the same keys as the grammar of the NACRES keys
+        (2 letters, then '.' and 2 digits, or 2 digits and maybe any character)
+    """
+    for key in ["AB12", "AB.12", "AB12X", "AB12.", "ZZ00"]:
+        assert AchatsData.regex_nacres_key.fullmatch(key) is not None
+    for key in ["AB.1", "A12", "AB123X", "AB1", "AB1.2", "1B12", "AB.12X", ""]:
+        assert AchatsData.regex_nacres_key.fullmatch(key) is None
+
+
+def test_check_lower_case(files_category):
+    """ Check the keys in lower case are correct
+    """
+    data = achats([["ab12"], ["ab.12"], ["cd34x"]], [[1.0], [2.0], [3.0]])
+    result = AchatsData().configure(files_category(("a.csv", "2019", data)))
+    assert result["files"]["a.csv"] == {"read": True, "warning": [], "year": "2019"}
+    assert list(result["data"]["data"]["2019"].keys()) == ["ab12", "cd34x"]
+
+
+def test_check_invalid_rows(files_category):
+    """ Check the rows with an incorrect key when the rows have several keys, with a dictionary (lists) and a ColumnarData (offsets)
+    """
+    data = achats([["AB12", "AB.1"], ["CD34"], ["A12"], ["EF56", "GH78", "AB123X"], ["XA02"]], [[1.0]] * 5)
+    for data_file in [data, ColumnarData.from_dict(data)]:
+        result = AchatsData().configure(files_category(("a.csv", "2019", data_file)))
+        assert result["files"]["a.csv"]["read"] == False
+        assert result["files"]["a.csv"]["warning"] == ["Des codes NACRES sont incorrectes (3 ligne(s) : 1, 3, 4)"]
+        assert result["years_ind"] == {"2019": {"index": 0}}
+        assert result["data"]["data"] == {"2019": {}}
+
+    # One key per row : the ColumnarData has no offsets
+    data = ColumnarData.from_dict(achats([["AB12"], ["A12"], ["CD34"], ["AB.1"]], [[1.0]] * 4))
+    assert data.get_offsets("Code NACRES") is None
+    result = AchatsData().configure(files_category(("a.csv", "2019", data)))
+    assert result["files"]["a.csv"]["warning"] == ["Des codes NACRES sont incorrectes (2 ligne(s) : 2, 4)"]
+
+
+def test_check_warning_truncated(files_category):
+    """ Check the warning gives only the first invalid rows (nb_invalid_rows_warning)
+    """
+    nb_rows = AchatsData.nb_invalid_rows_warning + 2
+    data = achats([["AB1"]] * nb_rows, [[1.0]] * nb_rows)
+    result = AchatsData().configure(files_category(("a.csv", "2019", data)))
+    rows = ", ".join(str(row) for row in range(1, AchatsData.nb_invalid_rows_warning + 1))
+    assert result["files"]["a.csv"]["warning"] == [f"Des codes NACRES sont incorrectes ({nb_rows} ligne(s) : {rows}, ...)"]
+    assert result["files"]["a.csv"]["warning"][0].endswith(", ...)")
+
+    # No '...' when all the rows are written
+    data = achats([["AB1"]] * AchatsData.nb_invalid_rows_warning, [[1.0]] * AchatsData.nb_invalid_rows_warning)
+    result = AchatsData().configure(files_category(("a.csv", "2019", data)))
+    assert result["files"]["a.csv"]["warning"] == [f"Des codes NACRES sont incorrectes ({AchatsData.nb_invalid_rows_warning} ligne(s) : {rows})"]
+
+
+def test_check_cache_data_changed(files_category):
+    """ Check the keys are checked again when the data of a file changes (the file is read again)
+    """
+    achats_data = AchatsData()
+    invalid = achats([["AB12"], ["A12"]], [[1.0], [2.0]])
+    result = achats_data.configure(files_category(("a.csv", "2019", invalid)))
+    assert result["files"]["a.csv"]["read"] == False
+
+    # Same data : the invalid rows are not checked again
+    invalid_rows = achats_data._AchatsData__invalid_rows["a.csv"]["invalid_rows"]
+    result = achats_data.configure(files_category(("a.csv", "2019", invalid)))
+    assert achats_data._AchatsData__invalid_rows["a.csv"]["invalid_rows"] is invalid_rows
+    assert result["files"]["a.csv"]["warning"] == ["Des codes NACRES sont incorrectes (1 ligne(s) : 2)"]
+
+    valid = achats([["AB12"], ["CD34"]], [[1.0], [2.0]])
+    result = achats_data.configure(files_category(("a.csv", "2019", valid)))
+    assert result["files"]["a.csv"] == {"read": True, "warning": [], "year": "2019"}
+    assert achats_data._AchatsData__invalid_rows["a.csv"]["data"] is valid
+    assert result["data"]["data"]["2019"] == {
+        "AB12": {"amount": 1.0, "count": 1, "description": None},
+        "CD34": {"amount": 2.0, "count": 1, "description": None}
+    }
+
+    # Invalid again with a new object
+    result = achats_data.configure(files_category(("a.csv", "2019", achats([["AB12"], ["A12"]], [[1.0], [2.0]]))))
+    assert result["files"]["a.csv"]["read"] == False
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : configure(files_category) : warnings of the files
+# ------------------------------------------------------------------------------------------------------------------------
+def test_configure_warning(files_category):
+    """ Check the files with a missing column, a column without numbers, a different unit or different lines are not read
+    """
+    valid = achats([["AB12"], ["CD34"]], [[1.0], [2.0]])
+    no_key = {"Montant.euro": valid["Montant.euro"]}
+    text_amount = achats([["AB12"]], [["cher"]])
+    text_amount["Montant.euro"]["type"] = str
+    other_unit = achats([["AB12"]], [[1.0]], unit=["dollar"])
+    no_unit = achats([["AB12"]], [[3.0]], unit=[])
+    other_lines = achats([["AB12"], ["CD34"]], [[1.0]])
+    result = AchatsData().configure(files_category(
+        ("a.csv", "2019", valid),
+        ("b.csv", "2020", no_key),
+        ("c.csv", "2021", text_amount),
+        ("d.csv", "2022", other_unit),
+        ("e.csv", "2019", no_unit),
+        ("f.csv", "2023", other_lines)
+    ))
+    assert result["files"]["a.csv"] == {"read": True, "warning": [], "year": "2019"}
+    assert result["files"]["b.csv"] == {"read": False, "warning": ["Colonne pour le code NACRES non-trouvée"], "year": "2020"}
+    assert result["files"]["c.csv"] == {"read": False, "warning": ["Colonne pour le montant n'a pas de chiffres"], "year": "2021"}
+    assert result["files"]["d.csv"] == {"read": False, "warning": ["Colonne 'Montant' a une unité différente"], "year": "2022"}
+    assert result["files"]["e.csv"] == {"read": True, "warning": ["Colonne 'Montant' n'a pas d'unité"], "year": "2019"}
+    assert result["files"]["f.csv"] == {"read": False, "warning": ["Nombre de lignes différent entre le code NACRES et le montant"], "year": "2023"}
+    assert result["years_ind"] == {"2019": {"index": 0}}
+    assert result["data"]["data"] == {
+        "2019": {
+            "AB12": {"amount": 4.0, "count": 2, "description": None},
+            "CD34": {"amount": 2.0, "count": 1, "description": None}
+        }
+    }
+
+
+def test_configure_cancelled(files_category):
+    """ Check the computation returns None when it's cancelled
+    """
+    assert AchatsData().configure(files_category(("a.csv", "2019", achats([["AB12"]], [[1.0]]))), lambda: True) is None
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+from GESAnalysis.FC.ColumnarData import ColumnarData
+from GESAnalysis.UI.categories.missions.MissionsData import MissionsData
+
+
+def missions(names, modes, positions, distances, emissions, emissions_contrails, unit_distance=["km"], type_distance=int) -> dict:
+    """ Create the data of a file of the category "Missions" (one list of values for each row)
+    """
+    return {
+        "name": {"name": ["name"], "unit": [], "data": names, "type": str},
+        "mode": {"name": ["mode"], "unit": [], "data": modes, "type": str},
+        "position": {"name": ["position"], "unit": [], "data": positions, "type": str},
+        "distance.km": {"name": ["distance"], "unit": unit_distance, "data": distances, "type": type_distance},
+        "emission.kg eCO2": {"name": ["emission"], "unit": ["kg eCO2"], "data": emissions, "type": int},
+        "emission.withcontrails.kg eCO2": {"name": ["emission", "withcontrails"], "unit": ["kg eCO2"], "data": emissions_contrails, "type": int}
+    }
+
+
+def layers(result) -> dict:
+    """ Get the layers of the cube in lists
+    """
+    cube = result["data"]["data"]
+    return {measure: cube.get_layer(measure).tolist() for measure in ["mission", "distance", "emission", "emission_contrails"]}
+
+
+first = missions(
+    [["m1"], ["m2", "m3"], ["m4"]],
+    [["avion"], ["train"], ["Avion"]],
+    [["Chercheur"], ["ITA"], ["ITA"]],
+    [[100], [50, 25], [10]],
+    [[20], [1], [3]],
+    [[40], [1], [6]]
+)
+second = missions(
+    [["m5"], ["m6"]],
+    [["avions"], ["voiture"]],
+    [["Chercheur"], ["Autre"]],
+    [[200], [30]],
+    [[50], [6]],
+    [[90], [6]]
+)
+third = missions(
+    [["m7"], ["m8"]],
+    [["train"], ["bus"]],
+    [["ITA"], ["Chercheur"]],
+    [[70], [8]],
+    [[2], [1]],
+    [[2], [1]]
+)
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : configure(files_category)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_configure(files_category):
+    """ Check the cube of a file : a row has one mission for each name, with the sum of the values of the row
+    """
+    result = MissionsData().configure(files_category(("a.csv", "2019", first)))
+    assert result["files"] == {"a.csv": {"read": True, "warning": [], "year": "2019"}}
+    assert result["mode_ind"] == {"avion": {"index": 0}, "train": {"index": 1}}
+    assert result["position_ind"] == {"Chercheur": {"index": 0}, "ITA": {"index": 1}}
+    assert result["years_ind"] == {"2019": {"index": 0}}
+    assert result["data"]["unit_distance"] == "km"
+    assert result["data"]["unit_emission"] == "kg eCO2"
+    assert layers(result) == {
+        "mission": [[[1], [1]], [[0], [2]]],
+        "distance": [[[100], [10]], [[0], [150]]],
+        "emission": [[[20], [3]], [[0], [2]]],
+        "emission_contrails": [[[40], [6]], [[0], [2]]]
+    }
+
+
+def test_configure_several_files(files_category):
+    """ Check the modes, positions and years of several files. The plural of a mode is the same mode
+    """
+    result = MissionsData().configure(files_category(("b.csv", "2020", second), ("a.csv", "2019", first)))
+    assert list(result["mode_ind"].keys()) == ["avions", "voiture", "train"]
+    assert list(result["position_ind"].keys()) == ["Chercheur", "Autre", "ITA"]
+    assert list(result["years_ind"].keys()) == ["2020", "2019"]
+    cube = result["data"]["data"]
+    distance = cube.get_layer("distance")
+    assert distance[cube.get_index_mode("avions"), cube.get_index_position("Chercheur"), cube.get_index_year("2019")] == 100
+    assert distance[cube.get_index_mode("avions"), cube.get_index_position("Chercheur"), cube.get_index_year("2020")] == 200
+    assert distance.sum() == 100 + 150 + 10 + 200 + 30
+
+
+def test_configure_dict_columnar(files_category):
+    """ Check a dictionary and a ColumnarData give the same cube
+    """
+    result_dict = MissionsData().configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second)))
+    result_columnar = MissionsData().configure(files_category(("a.csv", "2019", ColumnarData.from_dict(first)), ("b.csv", "2020", ColumnarData.from_dict(second))))
+    assert result_dict["files"] == result_columnar["files"]
+    assert result_dict["mode_ind"] == result_columnar["mode_ind"]
+    assert result_dict["position_ind"] == result_columnar["position_ind"]
+    assert result_dict["years_ind"] == result_columnar["years_ind"]
+    assert layers(result_dict) == layers(result_columnar)
+
+
+def test_configure_warning(files_category):
+    """ Check the files with a missing column, a column without numbers or a different unit are not in the cube
+    """
+    no_position = dict(first)
+    del no_position["position"]
+    text_distance = missions([["m1"]], [["avion"]], [["ITA"]], [["loin"]], [[1]], [[1]], type_distance=str)
+    other_unit = missions([["m1"]], [["train"]], [["ITA"]], [[1]], [[1]], [[1]], unit_distance=["m"])
+    result = MissionsData().configure(files_category(
+        ("a.csv", "2019", first),
+        ("b.csv", "2020", no_position),
+        ("c.csv", "2021", text_distance),
+        ("d.csv", "2022", other_unit)
+    ))
+    assert result["files"]["a.csv"] == {"read": True, "warning": [], "year": "2019"}
+    assert result["files"]["b.csv"] == {"read": False, "warning": ["Colonne 'position' non-trouvée"], "year": "2020"}
+    assert result["files"]["c.csv"] == {"read": False, "warning": ["Colonne 'distance' ne contient pas de chiffres"], "year": "2021"}
+    assert result["files"]["d.csv"] == {"read": False, "warning": ["Colonne 'distance' a une unité différente"], "year": "2022"}
+    assert result["years_ind"] == {"2019": {"index": 0}}
+    assert layers(result) == layers(MissionsData().configure(files_category(("a.csv", "2019", first))))
+
+
+def test_configure_cancelled(files_category):
+    """ Check the computation returns None when it's cancelled
+    """
+    assert MissionsData().configure(files_category(("a.csv", "2019", first)), lambda: True) is None
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : configure(files_category) : aggregates of each file kept between the updates
+# ------------------------------------------------------------------------------------------------------------------------
+def aggregates(missions_data: MissionsData) -> dict:
+    """ Get the aggregate of each file kept by MissionsData
+    """
+    return {file: aggregate["aggregate"] for file, aggregate in missions_data._MissionsData__aggregates.items()}
+
+
+def assert_same_result(result, expected) -> None:
+    """ Check 2 results of configure are the same
+    """
+    for key in ["files", "mode_ind", "position_ind", "years_ind"]:
+        assert result[key] == expected[key]
+    assert layers(result) == layers(expected)
+
+
+def test_add_file(files_category):
+    """ Check the aggregates of the files already open are not computed again when a file is added,
+        and the cube is the same as the cube computed from the start
+    """
+    for data_first, data_second, data_third in [(first, second, third), tuple(ColumnarData.from_dict(data) for data in (first, second, third))]:
+        missions_data = MissionsData()
+        missions_data.configure(files_category(("a.csv", "2019", data_first), ("b.csv", "2020", data_second)))
+        before = aggregates(missions_data)
+
+        files = files_category(("a.csv", "2019", data_first), ("b.csv", "2020", data_second), ("c.csv", "2019", data_third))
+        result = missions_data.configure(files)
+        after = aggregates(missions_data)
+        assert after["a.csv"] is before["a.csv"]
+        assert after["b.csv"] is before["b.csv"]
+        assert "c.csv" in after
+        assert_same_result(result, MissionsData().configure(files))
+
+
+def test_add_file_partial(files_category):
+    """ Check only the partial cube of the file opened is added to the cube of the files, the cube is not computed again
+    """
+    missions_data = MissionsData()
+    missions_data.configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second)))
+    cube = missions_data._MissionsData__cube
+    partials = dict(missions_data._MissionsData__partials)
+
+    added = []
+    add_cube = cube.add_cube
+    cube.add_cube = lambda partial: added.append(partial) or add_cube(partial)
+    missions_data.configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second), ("c.csv", "2019", third)))
+    assert missions_data._MissionsData__cube is cube
+    assert added == [missions_data._MissionsData__partials["c.csv"]]
+    assert missions_data._MissionsData__partials["a.csv"] is partials["a.csv"]
+
+
+def test_change_year_file(files_category):
+    """ Check the partial cube of a file is computed again when his year changes
+    """
+    missions_data = MissionsData()
+    missions_data.configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second)))
+    files = files_category(("a.csv", "2021", first), ("b.csv", "2020", second))
+    result = missions_data.configure(files)
+    assert list(result["years_ind"].keys()) == ["2021", "2020"]
+    assert_same_result(result, MissionsData().configure(files))
+
+
+def test_close_file(files_category):
+    """ Check the aggregate of a closed file is removed, the others are kept, and the cube is the same as the cube computed from the start
+    """
+    missions_data = MissionsData()
+    missions_data.configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second), ("c.csv", "2019", third)))
+    before = aggregates(missions_data)
+
+    files = files_category(("a.csv", "2019", first), ("c.csv", "2019", third))
+    result = missions_data.configure(files)
+    after = aggregates(missions_data)
+    assert list(after.keys()) == ["a.csv", "c.csv"]
+    assert after["a.csv"] is before["a.csv"]
+    assert after["c.csv"] is before["c.csv"]
+    assert_same_result(result, MissionsData().configure(files))
+    # The modes and positions of the closed file are not in the cube anymore
+    assert "voiture" not in result["mode_ind"]
+    assert "Autre" not in result["position_ind"]
+
+
+def test_change_data_file(files_category):
+    """ Check the aggregate of a file is computed again when his data changes (the file is read again)
+    """
+    missions_data = MissionsData()
+    missions_data.configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second)))
+    before = aggregates(missions_data)
+
+    files = files_category(("a.csv", "2019", third), ("b.csv", "2020", second))
+    result = missions_data.configure(files)
+    after = aggregates(missions_data)
+    assert after["a.csv"] is not before["a.csv"]
+    assert after["b.csv"] is before["b.csv"]
+    assert_same_result(result, MissionsData().configure(files))
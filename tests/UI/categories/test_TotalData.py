@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import pytest
+from GESAnalysis.FC.ColumnarData import ColumnarData
+from GESAnalysis.UI.categories.total.TotalData import TotalData
+
+
+def total(names, intensities, unit=["kg eCO2"], type_intensity=int) -> dict:
+    """ Create the data of a file of the category "Total" (one list of values for each row)
+    """
+    return {
+        "name": {"name": ["name"], "unit": [], "data": names, "type": str},
+        "intensity.kg eCO2": {"name": ["intensity"], "unit": unit, "data": intensities, "type": type_intensity}
+    }
+
+
+first = total([["achats"], ["missions"], ["achats"]], [[100], [50], [25]])
+second = total([["missions"], ["fluide"]], [[10], [5, 1]])
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : configure(files_category)
+# ------------------------------------------------------------------------------------------------------------------------
+def test_configure(files_category):
+    """ Check the carbon footprint of each category is summed for each year
+    """
+    result = TotalData().configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second)))
+    assert result["files"] == {
+        "a.csv": {"read": True, "warning": [], "year": "2019"},
+        "b.csv": {"read": True, "warning": [], "year": "2020"}
+    }
+    assert result["years_ind"] == {"2019": {"index": 0}, "2020": {"index": 1}}
+    assert result["name_ind"] == {"achats": {"index": 0}, "missions": {"index": 1}, "fluide": {"index": 2}}
+    assert result["data"] == {
+        "data": {
+            "achats": {"data": [125, 0]},
+            "missions": {"data": [50, 10]},
+            "fluide": {"data": [0, 6]}
+        },
+        "unit": "kg eCO2"
+    }
+
+
+def test_configure_dict_columnar(files_category):
+    """ Check a dictionary and a ColumnarData give the same result
+    """
+    result_dict = TotalData().configure(files_category(("a.csv", "2019", first), ("b.csv", "2020", second)))
+    result_columnar = TotalData().configure(files_category(("a.csv", "2019", ColumnarData.from_dict(first)), ("b.csv", "2020", ColumnarData.from_dict(second))))
+    assert result_dict == result_columnar
+
+
+def test_configure_warning(files_category):
+    """ Check the files with a missing column, a column without numbers, a different unit or different lines are not read
+    """
+    no_intensity = {"name": first["name"]}
+    text_intensity = total([["achats"]], [["beaucoup"]], type_intensity=str)
+    other_unit = total([["achats"]], [[1]], unit=["t eCO2"])
+    other_lines = total([["achats"], ["missions"]], [[1]])
+    result = TotalData().configure(files_category(
+        ("a.csv", "2019", first),
+        ("b.csv", "2020", no_intensity),
+        ("c.csv", "2021", text_intensity),
+        ("d.csv", "2022", other_unit),
+        ("e.csv", "2023", other_lines)
+    ))
+    assert result["files"]["b.csv"] == {"read": False, "warning": ["Colonne 'intensity' non-trouvée"], "year": "2020"}
+    assert result["files"]["c.csv"] == {"read": False, "warning": ["Colonne 'intensity' ne contient pas de chiffres"], "year": "2021"}
+    assert result["files"]["d.csv"] == {"read": False, "warning": ["Colonne 'intensity' a une unité différente"], "year": "2022"}
+    assert result["files"]["e.csv"] == {"read": False, "warning": ["Colonne 'name' et 'intensity' n'ont pas les mêmes lignes"], "year": "2023"}
+    assert result["years_ind"] == {"2019": {"index": 0}}
+    assert result["data"] == TotalData().configure(files_category(("a.csv", "2019", first)))["data"]
+
+
+def test_configure_cancelled(files_category):
+    """ Check the computation returns None when it's cancelled
+    """
+    assert TotalData().configure(files_category(("a.csv", "2019", first)), lambda: True) is None
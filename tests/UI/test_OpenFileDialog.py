@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#---------------------------------------------------------------------------------
+# Created By :
+# Name : Marjolin Pierre
+# E-Mail : pierre.marjolin@gmail.com
+# Github : Pierre-Mar
+#---------------------------------------------------------------------------------
+import os
+import threading
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtCore, QtWidgets
+from GESAnalysis.UI.OpenFileDialog import OpenFileDialog
+
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class Controller:
+    """ Controller who reads a file when the test allows it, and saves the files added
+    """
+
+    def __init__(self) -> None:
+        self.release = threading.Event()   # Set by the test to end the reading
+        self.started = threading.Event()   # Set when the reading starts
+        self.added = []
+
+    def load_file(self, file, year, progress=None, is_cancelled=None):
+        self.started.set()
+        self.release.wait(5)
+        return {"file": file}
+
+    def add_file(self, file, year, category, data):
+        self.added.append((file, year, category))
+
+    def load_files(self, files, progress=None, is_cancelled=None):
+        self.started.set()
+        self.release.wait(5)
+        return [{"file": file} for file, _, _ in files]
+
+    def add_files(self, files, data_files):
+        self.added.extend(files)
+
+
+def read(dialog: OpenFileDialog, controller: Controller, files: str = "missions.csv") -> None:
+    """ Fill the dialog, click on 'OK' and wait for the start of the reading
+    """
+    dialog.choose_file.setText(files)
+    dialog.choose_year.setText("2019")
+    dialog.accept()
+    assert controller.started.wait(5)
+
+
+def wait_reading(controller: Controller) -> None:
+    """ End the reading and give the result to the thread of the UI
+    """
+    controller.release.set()
+    QtCore.QThreadPool.globalInstance().waitForDone(5000)
+    app.processEvents()
+
+
+# ------------------------------------------------------------------------------------------------------------------------
+# Tests : accept() and reject()
+# ------------------------------------------------------------------------------------------------------------------------
+def test_accept():
+    """ Check the file is added at the end of the reading and the dialog is accepted
+    """
+    controller = Controller()
+    dialog = OpenFileDialog(controller, None)
+    read(dialog, controller)
+    wait_reading(controller)
+    assert controller.added == [("missions.csv", "2019", dialog.selected_category)]
+    assert dialog.result() == QtWidgets.QDialog.Accepted
+
+
+def test_accept_twice():
+    """ Check a 2nd click on 'OK' during the reading doesn't read the file again
+    """
+    controller = Controller()
+    dialog = OpenFileDialog(controller, None)
+    read(dialog, controller)
+    dialog.accept()
+    wait_reading(controller)
+    assert len(controller.added) == 1
+
+
+def test_reject_during_reading():
+    """ Check the file is not added when the user click on 'Cancel' during the reading
+    """
+    controller = Controller()
+    dialog = OpenFileDialog(controller, None)
+    read(dialog, controller)
+    dialog.reject()
+    wait_reading(controller)
+    assert controller.added == []
+    assert dialog.result() == QtWidgets.QDialog.Rejected
+
+
+def test_accept_several_files():
+    """ Check the files between quotes are read at once with the same year and category
+    """
+    controller = Controller()
+    dialog = OpenFileDialog(controller, None)
+    read(dialog, controller, '"missions.csv" "achats.csv"')
+    wait_reading(controller)
+    category = dialog.selected_category
+    assert controller.added == [("missions.csv", "2019", category), ("achats.csv", "2019", category)]
+    assert dialog.result() == QtWidgets.QDialog.Accepted
+
+
+def test_reject_during_reading_several_files():
+    """ Check the files are not added when the user click on 'Cancel' during the reading
+    """
+    controller = Controller()
+    dialog = OpenFileDialog(controller, None)
+    read(dialog, controller, '"missions.csv" "achats.csv"')
+    dialog.reject()
+    wait_reading(controller)
+    assert controller.added == []